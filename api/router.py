@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from app.api.routes import auth, public, admin_roles, admin_users, admin_audit, admin_settings, admin_venues, admin_rules, admin_blocks, admin_reservations, admin_prints, admin_menu, admin_layout
+from app.api.routes import auth, public, admin_roles, admin_users, admin_audit, admin_settings, admin_venues, admin_rules, admin_blocks, admin_reservations, admin_prints, admin_menu, admin_layout, admin_metrics
 
 api_router = APIRouter()
 
@@ -22,3 +22,4 @@ api_router.include_router(admin_prints.router, prefix="/admin/prints", tags=["ad
 
 api_router.include_router(admin_menu.router, prefix="/admin/menu", tags=["admin-menu"])
 api_router.include_router(admin_layout.router, prefix="/admin/layout", tags=["admin-layout"])
+api_router.include_router(admin_metrics.router, prefix="/admin/metrics", tags=["admin-metrics"])
@@ -10,6 +10,7 @@ from app.core.deps import get_db, require_permissions
 from app.models.audit_log import AuditLog
 from app.models.auth_event import AuthEvent
 from app.models.permission import Permission
+from app.schemas._ids import Id
 from app.schemas.audit import AuditLogOut
 
 router = APIRouter()
@@ -19,7 +20,7 @@ router = APIRouter()
 def list_audit_logs(
     from_: datetime | None = Query(default=None, alias="from"),
     to: datetime | None = None,
-    actor_user_id: str | None = None,
+    actor_user_id: Id | None = None,
     action_type: str | None = None,
     target_type: str | None = None,
     target_id: str | None = None,
@@ -48,7 +49,7 @@ def list_audit_logs(
 def list_auth_events(
     from_: datetime | None = Query(default=None, alias="from"),
     to: datetime | None = None,
-    user_id: str | None = None,
+    user_id: Id | None = None,
     event_type: str | None = None,
     db: Session = Depends(get_db),
     user=Depends(require_permissions(["AUDIT_VIEW"])),
@@ -11,14 +11,16 @@ from sqlalchemy.orm import Session
 from app.core.config import get_settings
 from app.core.deps import get_db, require_permissions
 from app.models.calendar_block import CalendarBlock
+from app.schemas._ids import Id
 from app.schemas.calendar_block import CalendarBlockCreate, CalendarBlockOut
 from app.services.audit_service import write_audit_log
+from app.services.availability_events import interval_changed
 
 router = APIRouter()
 
 
 class BulkBlockCreate(BaseModel):
-    venue_ids: list[str] = Field(min_items=1)
+    venue_ids: list[Id] = Field(min_items=1)
     date_from: date
     date_to: date
     start_time: time
@@ -30,7 +32,7 @@ class BulkBlockCreate(BaseModel):
 def list_blocks(
     from_: datetime | None = Query(default=None, alias="from"),
     to: datetime | None = None,
-    venue_id: str | None = None,
+    venue_id: Id | None = None,
     db: Session = Depends(get_db),
     user=Depends(require_permissions(["RULES_VIEW"])),
 ):
@@ -53,6 +55,7 @@ def create_block(payload: CalendarBlockCreate, request: Request, db: Session = D
     db.add(b)
     db.commit()
     db.refresh(b)
+    interval_changed(db, b.venue_id, b.start_at, b.end_at)
 
     write_audit_log(db, actor_user_id=user.id, action_type="CALENDAR_BLOCK_SINGLE", target_type="block", target_id=b.id, summary="Created calendar block", request=request)
     return b
@@ -82,6 +85,11 @@ def create_blocks_bulk(payload: BulkBlockCreate, request: Request, db: Session =
 
     db.commit()
 
+    bulk_start = datetime.combine(payload.date_from, payload.start_time).replace(tzinfo=tz).astimezone(ZoneInfo("UTC"))
+    bulk_end = datetime.combine(payload.date_to, payload.end_time).replace(tzinfo=tz).astimezone(ZoneInfo("UTC"))
+    for vid in payload.venue_ids:
+        interval_changed(db, vid, bulk_start, bulk_end)
+
     write_audit_log(
         db,
         actor_user_id=user.id,
@@ -97,12 +105,13 @@ def create_blocks_bulk(payload: BulkBlockCreate, request: Request, db: Session =
 
 
 @router.delete("/{block_id}")
-def delete_block(block_id: str, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["CALENDAR_BLOCK_SINGLE"]))):
+def delete_block(block_id: Id, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["CALENDAR_BLOCK_SINGLE"]))):
     b = db.get(CalendarBlock, block_id)
     if not b:
         raise HTTPException(status_code=404, detail="Not found")
     db.delete(b)
     db.commit()
+    interval_changed(db, b.venue_id, b.start_at, b.end_at)
 
     write_audit_log(db, actor_user_id=user.id, action_type="CALENDAR_BLOCK_DELETE", target_type="block", target_id=block_id, summary="Deleted calendar block", request=request)
     return {"ok": True}
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from app.core.deps import get_db, require_permissions
 from app.models.layout import LayoutAsset, ReservationLayout, VenueLayoutTemplate
 from app.models.reservation import Reservation
+from app.schemas._ids import Id
 from app.schemas.layout import (
     LayoutAssetCreate,
     LayoutAssetOut,
@@ -48,7 +49,7 @@ def create_template(payload: VenueLayoutTemplateCreate, request: Request, db: Se
 
 
 @router.patch("/templates/{template_id}", response_model=VenueLayoutTemplateOut)
-def update_template(template_id: str, payload: VenueLayoutTemplateUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["LAYOUT_MANAGE"]))):
+def update_template(template_id: Id, payload: VenueLayoutTemplateUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["LAYOUT_MANAGE"]))):
     t = db.get(VenueLayoutTemplate, template_id)
     if not t:
         raise HTTPException(status_code=404, detail="Not found")
@@ -62,7 +63,7 @@ def update_template(template_id: str, payload: VenueLayoutTemplateUpdate, reques
 
 
 @router.delete("/templates/{template_id}")
-def delete_template(template_id: str, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["LAYOUT_MANAGE"]))):
+def delete_template(template_id: Id, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["LAYOUT_MANAGE"]))):
     t = db.get(VenueLayoutTemplate, template_id)
     if not t:
         raise HTTPException(status_code=404, detail="Not found")
@@ -73,7 +74,7 @@ def delete_template(template_id: str, request: Request, db: Session = Depends(ge
 
 
 @router.get("/assets", response_model=list[LayoutAssetOut])
-def list_assets(venue_id: str | None = None, db: Session = Depends(get_db), user=Depends(require_permissions(["LAYOUT_MANAGE"]))):
+def list_assets(venue_id: Id | None = None, db: Session = Depends(get_db), user=Depends(require_permissions(["LAYOUT_MANAGE"]))):
     q = select(LayoutAsset).order_by(LayoutAsset.created_at.desc())
     if venue_id:
         q = q.where((LayoutAsset.venue_id == None) | (LayoutAsset.venue_id == venue_id))
@@ -101,7 +102,7 @@ def create_asset(payload: LayoutAssetCreate, request: Request, db: Session = Dep
 
 
 @router.patch("/assets/{asset_id}", response_model=LayoutAssetOut)
-def update_asset(asset_id: str, payload: LayoutAssetUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["LAYOUT_MANAGE"]))):
+def update_asset(asset_id: Id, payload: LayoutAssetUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["LAYOUT_MANAGE"]))):
     a = db.get(LayoutAsset, asset_id)
     if not a:
         raise HTTPException(status_code=404, detail="Not found")
@@ -115,7 +116,7 @@ def update_asset(asset_id: str, payload: LayoutAssetUpdate, request: Request, db
 
 
 @router.delete("/assets/{asset_id}")
-def delete_asset(asset_id: str, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["LAYOUT_MANAGE"]))):
+def delete_asset(asset_id: Id, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["LAYOUT_MANAGE"]))):
     a = db.get(LayoutAsset, asset_id)
     if not a:
         raise HTTPException(status_code=404, detail="Not found")
@@ -127,7 +128,7 @@ def delete_asset(asset_id: str, request: Request, db: Session = Depends(get_db),
 
 @router.put("/reservations/{reservation_id}/layout")
 def upsert_reservation_layout(
-    reservation_id: str,
+    reservation_id: Id,
     payload: ReservationLayoutUpsert,
     request: Request,
     db: Session = Depends(get_db),
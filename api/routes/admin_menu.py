@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, require_permissions
 from app.models.menu import MenuCategory, MenuItem, MenuItemPhoto
+from app.schemas._ids import Id
 from app.schemas.menu import (
     MenuCategoryCreate,
     MenuCategoryOut,
@@ -36,7 +37,7 @@ def create_category(payload: MenuCategoryCreate, request: Request, db: Session =
 
 
 @router.patch("/categories/{category_id}", response_model=MenuCategoryOut)
-def update_category(category_id: str, payload: MenuCategoryCreate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
+def update_category(category_id: Id, payload: MenuCategoryCreate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
     c = db.get(MenuCategory, category_id)
     if not c:
         raise HTTPException(status_code=404, detail="Not found")
@@ -50,7 +51,7 @@ def update_category(category_id: str, payload: MenuCategoryCreate, request: Requ
 
 
 @router.delete("/categories/{category_id}")
-def delete_category(category_id: str, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
+def delete_category(category_id: Id, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
     c = db.get(MenuCategory, category_id)
     if not c:
         raise HTTPException(status_code=404, detail="Not found")
@@ -61,7 +62,7 @@ def delete_category(category_id: str, request: Request, db: Session = Depends(ge
 
 
 @router.get("/items", response_model=list[MenuItemOut])
-def list_items(category_id: str | None = None, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
+def list_items(category_id: Id | None = None, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
     q = select(MenuItem).order_by(MenuItem.created_at.desc())
     if category_id:
         q = q.where(MenuItem.category_id == category_id)
@@ -81,7 +82,7 @@ def create_item(payload: MenuItemCreate, request: Request, db: Session = Depends
 
 
 @router.patch("/items/{item_id}", response_model=MenuItemOut)
-def update_item(item_id: str, payload: MenuItemUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
+def update_item(item_id: Id, payload: MenuItemUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
     it = db.get(MenuItem, item_id)
     if not it:
         raise HTTPException(status_code=404, detail="Not found")
@@ -95,7 +96,7 @@ def update_item(item_id: str, payload: MenuItemUpdate, request: Request, db: Ses
 
 
 @router.delete("/items/{item_id}")
-def delete_item(item_id: str, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
+def delete_item(item_id: Id, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
     it = db.get(MenuItem, item_id)
     if not it:
         raise HTTPException(status_code=404, detail="Not found")
@@ -106,7 +107,7 @@ def delete_item(item_id: str, request: Request, db: Session = Depends(get_db), u
 
 
 @router.post("/items/{item_id}/photos", response_model=MenuPhotoOut)
-def add_photo(item_id: str, payload: MenuPhotoCreate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
+def add_photo(item_id: Id, payload: MenuPhotoCreate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
     it = db.get(MenuItem, item_id)
     if not it:
         raise HTTPException(status_code=404, detail="Not found")
@@ -119,7 +120,7 @@ def add_photo(item_id: str, payload: MenuPhotoCreate, request: Request, db: Sess
 
 
 @router.delete("/photos/{photo_id}")
-def delete_photo(photo_id: str, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
+def delete_photo(photo_id: Id, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["MENU_MANAGE"]))):
     ph = db.get(MenuItemPhoto, photo_id)
     if not ph:
         raise HTTPException(status_code=404, detail="Not found")
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db, require_root_admin
+from app.core.rate_limit import rate_limiter
+from app.services.availability_cache import availability_cache
+from app.services.email_outbox import outbox_stats
+from app.services.password_hashing import password_hasher
+from app.services.permissions import permission_cache
+from app.services.reservation_links import revoked_links
+from app.services.smtp_pool import smtp_pool
+from app.services.token_views import token_view_buffer
+
+router = APIRouter()
+
+
+@router.get("")
+def get_metrics(db: Session = Depends(get_db), user=Depends(require_root_admin)):
+    # Counters are per process; each worker reports its own.
+    return {
+        "availability_cache": availability_cache.stats(),
+        "smtp_pool": smtp_pool.stats(),
+        "permission_cache": permission_cache.stats(),
+        "password_hashing": password_hasher.stats(),
+        "rate_limit": rate_limiter.stats(),
+        "token_views": token_view_buffer.stats(),
+        "revoked_links": revoked_links.stats(),
+        # Shared: read from the database
+        "email_outbox": outbox_stats(db),
+    }
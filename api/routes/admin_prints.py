@@ -12,7 +12,6 @@ from sqlalchemy.orm import Session
 from app.core.config import get_settings
 from app.core.deps import get_db, require_permissions
 from app.models.customer import Customer
-from app.models.menu import MenuItem
 from app.models.reservation import Reservation, ReservationMenuSelection
 from app.models.venue import Venue
 from app.services.audit_service import write_audit_log
@@ -37,9 +36,6 @@ def print_daily(
 
     venues = db.execute(select(Venue).where(Venue.active == True).order_by(Venue.sort_order, Venue.name)).scalars().all()
 
-    # Preload menu prices
-    menu_map = {m.id: {"name": m.name, "price": int(m.price)} for m in db.execute(select(MenuItem)).scalars().all()}
-
     # Preload reservations
     reservations = db.execute(
         select(Reservation).where(
@@ -77,17 +73,9 @@ def print_daily(
             cust = customers.get(r.customer_id)
             phone = cust.phone_normalized if cust else ""
 
+            # Names and totals were snapshotted at booking time
             sels = sel_by_res.get(r.id, [])
-            total = 0
-            parts = []
-            for s in sels:
-                mi = menu_map.get(s.menu_item_id) or {}
-                price = int(mi.get("price", 0))
-                qty = int(s.quantity)
-                total += price * qty
-                parts.append(f"{mi.get('name', s.menu_item_id)} x{qty}")
-
-            menu_summary = ", ".join(parts)
+            menu_summary = ", ".join(f"{s.name or s.menu_item_id} x{s.quantity}" for s in sels)
             rows.append(
                 {
                     "banquet_name": r.banquet_name or "(未入力)",
@@ -95,7 +83,7 @@ def print_daily(
                     "people_count": r.people_count,
                     "phone": phone,
                     "menu_summary": menu_summary,
-                    "total_price": total,
+                    "total_price": r.total_price,
                     "note": r.desired_time_text or "",
                 }
             )
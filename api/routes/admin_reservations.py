@@ -12,8 +12,11 @@ from app.core.deps import get_db, require_permissions
 from app.models.customer import Customer
 from app.models.reservation import Reservation
 from app.models.venue import Venue
+from app.schemas._ids import Id
 from app.schemas.reservation import AdminReservationOut, AdminReservationUpdate
 from app.services.audit_service import write_audit_log
+from app.services.availability_events import interval_changed
+from app.services.reservation_links import revoke_reservation_links
 from app.services.reservation_service import validate_reservation_time, cancel_reservation
 
 router = APIRouter()
@@ -23,7 +26,7 @@ router = APIRouter()
 def list_reservations(
     from_date: date | None = Query(default=None),
     to_date: date | None = Query(default=None),
-    venue_id: str | None = None,
+    venue_id: Id | None = None,
     status: str | None = None,
     db: Session = Depends(get_db),
     user=Depends(require_permissions(["RESERVATION_VIEW"])),
@@ -51,7 +54,7 @@ def list_reservations(
 
 
 @router.get("/{reservation_id}", response_model=AdminReservationOut)
-def get_reservation(reservation_id: str, db: Session = Depends(get_db), user=Depends(require_permissions(["RESERVATION_VIEW"]))):
+def get_reservation(reservation_id: Id, db: Session = Depends(get_db), user=Depends(require_permissions(["RESERVATION_VIEW"]))):
     r = db.get(Reservation, reservation_id)
     if not r:
         raise HTTPException(status_code=404, detail="Not found")
@@ -59,7 +62,7 @@ def get_reservation(reservation_id: str, db: Session = Depends(get_db), user=Dep
 
 
 @router.patch("/{reservation_id}", response_model=AdminReservationOut)
-def update_reservation(reservation_id: str, payload: AdminReservationUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["RESERVATION_EDIT"]))):
+def update_reservation(reservation_id: Id, payload: AdminReservationUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["RESERVATION_EDIT"]))):
     r = db.get(Reservation, reservation_id)
     if not r:
         raise HTTPException(status_code=404, detail="Not found")
@@ -69,11 +72,14 @@ def update_reservation(reservation_id: str, payload: AdminReservationUpdate, req
 
     validate_reservation_time(db, venue_id=r.venue_id, start_at=new_start, end_at=new_end, exclude_reservation_id=r.id)
 
+    old_start, old_end = r.start_at, r.end_at
     data = payload.dict(exclude_unset=True)
     for k, v in data.items():
         setattr(r, k, v)
     db.commit()
     db.refresh(r)
+    interval_changed(db, r.venue_id, old_start, old_end)
+    interval_changed(db, r.venue_id, r.start_at, r.end_at)
 
     write_audit_log(
         db,
@@ -90,7 +96,7 @@ def update_reservation(reservation_id: str, payload: AdminReservationUpdate, req
 
 
 @router.post("/{reservation_id}/cancel")
-def cancel_admin(reservation_id: str, request: Request, reason: str = "", db: Session = Depends(get_db), user=Depends(require_permissions(["RESERVATION_CANCEL"]))):
+def cancel_admin(reservation_id: Id, request: Request, reason: str = "", db: Session = Depends(get_db), user=Depends(require_permissions(["RESERVATION_CANCEL"]))):
     r = db.get(Reservation, reservation_id)
     if not r:
         raise HTTPException(status_code=404, detail="Not found")
@@ -106,3 +112,22 @@ def cancel_admin(reservation_id: str, request: Request, reason: str = "", db: Se
         request=request,
     )
     return {"ok": True}
+
+
+@router.post("/{reservation_id}/revoke-links")
+def revoke_links(reservation_id: Id, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["RESERVATION_EDIT"]))):
+    r = db.get(Reservation, reservation_id)
+    if not r:
+        raise HTTPException(status_code=404, detail="Not found")
+    revoked = revoke_reservation_links(db, reservation_id=r.id)
+    write_audit_log(
+        db,
+        actor_user_id=user.id,
+        action_type="RESERVATION_LINKS_REVOKE",
+        target_type="reservation",
+        target_id=r.public_id,
+        summary="Revoked reservation links",
+        diff_json={"revoked": revoked},
+        request=request,
+    )
+    return {"ok": True, "revoked": revoked}
@@ -8,8 +8,10 @@ from app.core.deps import get_db, require_root_admin
 from app.models.permission import Permission
 from app.models.role import Role, RolePermission
 from app.models.user import UserRole
+from app.schemas._ids import Id
 from app.schemas.role import RoleCreate, RoleOut, RoleUpdate
 from app.services.audit_service import write_audit_log
+from app.services.permissions import bump_permissions_version
 
 router = APIRouter()
 
@@ -59,7 +61,7 @@ def create_role(payload: RoleCreate, request: Request, db: Session = Depends(get
 
 
 @router.get("/{role_id}", response_model=RoleOut)
-def get_role(role_id: str, db: Session = Depends(get_db), user=Depends(require_root_admin)):
+def get_role(role_id: Id, db: Session = Depends(get_db), user=Depends(require_root_admin)):
     role = db.get(Role, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Not found")
@@ -68,7 +70,7 @@ def get_role(role_id: str, db: Session = Depends(get_db), user=Depends(require_r
 
 
 @router.patch("/{role_id}", response_model=RoleOut)
-def update_role(role_id: str, payload: RoleUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_root_admin)):
+def update_role(role_id: Id, payload: RoleUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_root_admin)):
     role = db.get(Role, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Not found")
@@ -94,6 +96,8 @@ def update_role(role_id: str, payload: RoleUpdate, request: Request, db: Session
             db.query(RolePermission).filter(RolePermission.role_id == role.id, RolePermission.permission_code.in_(list(to_remove))).delete(synchronize_session=False)
         for code in to_add:
             db.add(RolePermission(role_id=role.id, permission_code=code))
+        if to_add or to_remove:
+            bump_permissions_version(db, role_id=role.id)
 
     db.commit()
     db.refresh(role)
@@ -114,7 +118,7 @@ def update_role(role_id: str, payload: RoleUpdate, request: Request, db: Session
 
 
 @router.delete("/{role_id}")
-def delete_role(role_id: str, request: Request, db: Session = Depends(get_db), user=Depends(require_root_admin)):
+def delete_role(role_id: Id, request: Request, db: Session = Depends(get_db), user=Depends(require_root_admin)):
     role = db.get(Role, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Not found")
@@ -6,6 +6,8 @@ from sqlalchemy.orm import Session
 from app.core.deps import get_db, require_permissions
 from app.schemas.settings import SettingsOut, SettingsUpdate
 from app.services.audit_service import write_audit_log
+from app.services.availability_events import everything_changed
+from app.services.rule_compiler import bump_rules_version
 from app.services.settings_service import get_or_create_settings
 
 router = APIRouter()
@@ -22,8 +24,11 @@ def update_settings(payload: SettingsUpdate, request: Request, db: Session = Dep
     data = payload.dict(exclude_unset=True)
     for k, v in data.items():
         setattr(s, k, v)
+    # Bumping the version also drops availability caches in other workers
+    bump_rules_version(db)
     db.commit()
     db.refresh(s)
+    everything_changed(db)
 
     write_audit_log(
         db,
@@ -5,12 +5,14 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, require_root_admin
-from app.core.security import hash_password
 from app.models.role import Role
 from app.models.user import User, UserRole
+from app.schemas._ids import Id
 from app.schemas.user import UserCreate, UserOut, UserUpdate
 from app.services.audit_service import write_audit_log
 from app.services.auth_service import normalize_email
+from app.services.password_hashing import password_hasher
+from app.services.permissions import bump_permissions_version
 
 router = APIRouter()
 
@@ -39,7 +41,7 @@ def create_user(payload: UserCreate, request: Request, db: Session = Depends(get
         if missing:
             raise HTTPException(status_code=400, detail=f"Unknown roles: {sorted(missing)}")
 
-    u = User(email=email, name=payload.name, hashed_password=hash_password(payload.password), is_active=True, is_root_admin=False)
+    u = User(email=email, name=payload.name, hashed_password=password_hasher.hash(payload.password), is_active=True, is_root_admin=False)
     db.add(u)
     db.commit()
     db.refresh(u)
@@ -65,7 +67,7 @@ def create_user(payload: UserCreate, request: Request, db: Session = Depends(get
 
 
 @router.get("/{user_id}", response_model=UserOut)
-def get_user(user_id: str, db: Session = Depends(get_db), user=Depends(require_root_admin)):
+def get_user(user_id: Id, db: Session = Depends(get_db), user=Depends(require_root_admin)):
     u = db.get(User, user_id)
     if not u:
         raise HTTPException(status_code=404, detail="Not found")
@@ -74,7 +76,7 @@ def get_user(user_id: str, db: Session = Depends(get_db), user=Depends(require_r
 
 
 @router.patch("/{user_id}", response_model=UserOut)
-def update_user(user_id: str, payload: UserUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_root_admin)):
+def update_user(user_id: Id, payload: UserUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_root_admin)):
     u = db.get(User, user_id)
     if not u:
         raise HTTPException(status_code=404, detail="Not found")
@@ -108,7 +110,7 @@ def update_user(user_id: str, payload: UserUpdate, request: Request, db: Session
 
 
 @router.put("/{user_id}/roles", response_model=UserOut)
-def replace_user_roles(user_id: str, role_ids: list[str], request: Request, db: Session = Depends(get_db), user=Depends(require_root_admin)):
+def replace_user_roles(user_id: Id, role_ids: list[Id], request: Request, db: Session = Depends(get_db), user=Depends(require_root_admin)):
     u = db.get(User, user_id)
     if not u:
         raise HTTPException(status_code=404, detail="Not found")
@@ -123,6 +125,7 @@ def replace_user_roles(user_id: str, role_ids: list[str], request: Request, db:
     db.query(UserRole).filter(UserRole.user_id == u.id).delete(synchronize_session=False)
     for rid in set(role_ids or []):
         db.add(UserRole(user_id=u.id, role_id=rid))
+    bump_permissions_version(db, user_ids=[u.id])
     db.commit()
     db.refresh(u)
 
@@ -142,7 +145,7 @@ def replace_user_roles(user_id: str, role_ids: list[str], request: Request, db:
 
 
 @router.post("/{user_id}/root-admin/grant")
-def grant_root_admin(user_id: str, request: Request, db: Session = Depends(get_db), user=Depends(require_root_admin)):
+def grant_root_admin(user_id: Id, request: Request, db: Session = Depends(get_db), user=Depends(require_root_admin)):
     u = db.get(User, user_id)
     if not u:
         raise HTTPException(status_code=404, detail="Not found")
@@ -154,7 +157,7 @@ def grant_root_admin(user_id: str, request: Request, db: Session = Depends(get_d
 
 
 @router.post("/{user_id}/root-admin/revoke")
-def revoke_root_admin(user_id: str, request: Request, db: Session = Depends(get_db), user=Depends(require_root_admin)):
+def revoke_root_admin(user_id: Id, request: Request, db: Session = Depends(get_db), user=Depends(require_root_admin)):
     u = db.get(User, user_id)
     if not u:
         raise HTTPException(status_code=404, detail="Not found")
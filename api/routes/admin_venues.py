@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, require_permissions
 from app.models.venue import Venue
+from app.schemas._ids import Id
 from app.schemas.venue import VenueCreate, VenueOut, VenueUpdate
 from app.services.audit_service import write_audit_log
 
@@ -30,7 +31,7 @@ def create_venue(payload: VenueCreate, request: Request, db: Session = Depends(g
 
 
 @router.patch("/{venue_id}", response_model=VenueOut)
-def update_venue(venue_id: str, payload: VenueUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["VENUE_MANAGE"]))):
+def update_venue(venue_id: Id, payload: VenueUpdate, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["VENUE_MANAGE"]))):
     v = db.get(Venue, venue_id)
     if not v:
         raise HTTPException(status_code=404, detail="Not found")
@@ -45,7 +46,7 @@ def update_venue(venue_id: str, payload: VenueUpdate, request: Request, db: Sess
 
 
 @router.delete("/{venue_id}")
-def delete_venue(venue_id: str, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["VENUE_MANAGE"]))):
+def delete_venue(venue_id: Id, request: Request, db: Session = Depends(get_db), user=Depends(require_permissions(["VENUE_MANAGE"]))):
     v = db.get(Venue, venue_id)
     if not v:
         raise HTTPException(status_code=404, detail="Not found")
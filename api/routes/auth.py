@@ -4,15 +4,17 @@ from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, get_current_user
+from app.core.rate_limit import rate_limit
 from app.core.security import create_access_token
 from app.models.user import User
 from app.schemas.auth import LoginRequest, LoginChallengeResponse, Verify2FARequest, TokenResponse, MeResponse
-from app.services.auth_service import create_login_challenge, verify_login_challenge, get_user_permissions
+from app.services.auth_service import create_login_challenge, verify_login_challenge
+from app.services.permissions import get_permission_snapshot, permission_claims
 
 router = APIRouter()
 
 
-@router.post("/login", response_model=LoginChallengeResponse)
+@router.post("/login", response_model=LoginChallengeResponse, dependencies=[Depends(rate_limit("login", identity="email"))])
 def login(payload: LoginRequest, request: Request, db: Session = Depends(get_db)):
     ip = request.client.host if request.client else ""
     ua = request.headers.get("user-agent", "")
@@ -20,16 +22,16 @@ def login(payload: LoginRequest, request: Request, db: Session = Depends(get_db)
     return LoginChallengeResponse(challenge_id=challenge_id)
 
 
-@router.post("/verify", response_model=TokenResponse)
+@router.post("/verify", response_model=TokenResponse, dependencies=[Depends(rate_limit("verify", identity="challenge_id"))])
 def verify_2fa(payload: Verify2FARequest, request: Request, db: Session = Depends(get_db)):
     ip = request.client.host if request.client else ""
     ua = request.headers.get("user-agent", "")
     user = verify_login_challenge(db, challenge_id=payload.challenge_id, code=payload.code, ip=ip, user_agent=ua)
-    token = create_access_token(user.id)
+    token = create_access_token(user.id, extra_claims=permission_claims(db, user))
     return TokenResponse(access_token=token)
 
 
 @router.get("/me", response_model=MeResponse)
 def me(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    perms = get_user_permissions(db, user.id) if not user.is_root_admin else ["*"]
+    perms = sorted(get_permission_snapshot(db, user)) if not user.is_root_admin else ["*"]
     return MeResponse(user_id=user.id, email=user.email, name=user.name, is_root_admin=user.is_root_admin, permissions=perms)
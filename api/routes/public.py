@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi import APIRouter, Depends, Header, Query, Request, HTTPException
 from sqlalchemy import select
 
 from app.models.menu import MenuCategory, MenuItem, MenuItemPhoto
@@ -10,10 +11,20 @@ from app.models.venue import Venue
 from app.models.layout import VenueLayoutTemplate, LayoutAsset, ReservationLayout
 
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_db
-from app.schemas.availability import AvailabilityResponse, AvailabilityBlock
+from app.core.config import get_settings
+from app.core.deps import get_async_db
+from app.core.rate_limit import rate_limit
+from app.schemas._ids import Id
+from app.schemas.availability import (
+    AvailabilityBlock,
+    AvailabilityResponse,
+    AvailabilitySlot,
+    AvailabilitySlotsResponse,
+    FreeSlot,
+    FreeSlotSearchResponse,
+)
 from app.schemas.reservation import (
     PublicReservationCreate,
     PublicReservationCreated,
@@ -21,34 +32,42 @@ from app.schemas.reservation import (
     PublicReservationCancelRequest,
     ReservationOut,
 )
+from app.schemas.hold import SlotHoldCreate, SlotHoldCreated
 from app.schemas.layout import ReservationLayoutUpsert
 
-from app.services.audit_service import write_audit_log
-from app.services.availability_service import compute_public_availability
+from app.services.audit_service import write_audit_log_async
+from app.services.availability_service import (
+    compute_public_availability_async,
+    compute_slot_availability_async,
+    search_free_slots_async,
+)
 from app.services.reservation_service import (
-    create_reservation_public,
-    lookup_reservation_by_public_id_and_phone,
-    get_reservation_by_token,
-    cancel_reservation,
+    create_reservation_public_async,
+    lookup_reservation_by_public_id_and_phone_async,
+    get_reservation_by_token_async,
+    cancel_reservation_async,
 )
 from app.services.captcha import verify_captcha
+from app.services.hold_service import create_hold_async, release_hold_async
+from app.services.idempotency import begin_async, release_async, request_fingerprint
 
 router = APIRouter()
 
+RESERVATION_CREATED_MESSAGE = "仮予約を受け付けました。メールをご確認ください。"
 
 
 @router.get('/venues')
-def list_public_venues(db: Session = Depends(get_db)):
-    venues = db.execute(select(Venue).where(Venue.active == True).order_by(Venue.sort_order, Venue.name)).scalars().all()
+async def list_public_venues(db: AsyncSession = Depends(get_async_db)):
+    venues = (await db.execute(select(Venue).where(Venue.active == True).order_by(Venue.sort_order, Venue.name))).scalars().all()
     return [{"id": v.id, "name": v.name} for v in venues]
 
 
 @router.get('/menu')
-def list_public_menu(db: Session = Depends(get_db)):
+async def list_public_menu(db: AsyncSession = Depends(get_async_db)):
     # Returns active categories with active items and photos
-    cats = db.execute(select(MenuCategory).where(MenuCategory.active == True).order_by(MenuCategory.sort_order, MenuCategory.name)).scalars().all()
-    items = db.execute(select(MenuItem).where(MenuItem.active == True)).scalars().all()
-    photos = db.execute(select(MenuItemPhoto)).scalars().all()
+    cats = (await db.execute(select(MenuCategory).where(MenuCategory.active == True).order_by(MenuCategory.sort_order, MenuCategory.name))).scalars().all()
+    items = (await db.execute(select(MenuItem).where(MenuItem.active == True))).scalars().all()
+    photos = (await db.execute(select(MenuItemPhoto))).scalars().all()
 
     photo_by_item: dict[str, list[dict]] = {}
     for ph in photos:
@@ -77,12 +96,14 @@ def list_public_menu(db: Session = Depends(get_db)):
 
 
 @router.get('/venues/{venue_id}/layout')
-def get_public_layout(venue_id: str, db: Session = Depends(get_db)):
-    template = db.execute(select(VenueLayoutTemplate).where(VenueLayoutTemplate.venue_id == venue_id)).scalar_one_or_none()
-    assets = db.execute(
-        select(LayoutAsset).where(
-            LayoutAsset.active == True,
-            (LayoutAsset.venue_id == None) | (LayoutAsset.venue_id == venue_id),
+async def get_public_layout(venue_id: Id, db: AsyncSession = Depends(get_async_db)):
+    template = (await db.execute(select(VenueLayoutTemplate).where(VenueLayoutTemplate.venue_id == venue_id))).scalar_one_or_none()
+    assets = (
+        await db.execute(
+            select(LayoutAsset).where(
+                LayoutAsset.active == True,
+                (LayoutAsset.venue_id == None) | (LayoutAsset.venue_id == venue_id),
+            )
         )
     ).scalars().all()
 
@@ -113,17 +134,17 @@ def get_public_layout(venue_id: str, db: Session = Depends(get_db)):
 
 
 @router.put('/r/{token}/layout')
-def update_layout_by_token(token: str, payload: ReservationLayoutUpsert, request: Request, db: Session = Depends(get_db)):
-    r = get_reservation_by_token(db, token_raw=token)
-    existing = db.execute(select(ReservationLayout).where(ReservationLayout.reservation_id == r.id)).scalar_one_or_none()
+async def update_layout_by_token(token: str, payload: ReservationLayoutUpsert, request: Request, db: AsyncSession = Depends(get_async_db)):
+    r = await get_reservation_by_token_async(db, token_raw=token)
+    existing = (await db.execute(select(ReservationLayout).where(ReservationLayout.reservation_id == r.id))).scalar_one_or_none()
     if existing is None:
         existing = ReservationLayout(reservation_id=r.id, layout_json=payload.layout_json)
         db.add(existing)
     else:
         existing.layout_json = payload.layout_json
-    db.commit()
+    await db.commit()
 
-    write_audit_log(
+    await write_audit_log_async(
         db,
         actor_user_id=None,
         action_type='PUBLIC_RESERVATION_LAYOUT_UPSERT',
@@ -140,56 +161,120 @@ def update_layout_by_token(token: str, payload: ReservationLayoutUpsert, request
 async def availability(
     from_date: date,
     to_date: date,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    blocks = compute_public_availability(db, from_date=from_date, to_date=to_date)
+    blocks = await compute_public_availability_async(db, from_date=from_date, to_date=to_date)
     return AvailabilityResponse(blocks=[AvailabilityBlock(**b) for b in blocks])
 
 
-@router.post("/reservations", response_model=PublicReservationCreated)
-async def create_reservation(payload: PublicReservationCreate, request: Request, db: Session = Depends(get_db)):
-    # Optional CAPTCHA
-    ip = request.client.host if request.client else None
-    ok = await verify_captcha(payload.captcha_token, remote_ip=ip)
-    if not ok:
+@router.get("/availability/slots", response_model=AvailabilitySlotsResponse)
+async def availability_slots(
+    from_date: date,
+    to_date: date,
+    granularity: int = Query(default=30, ge=5, le=720, description="Minutes; must divide a day"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if (24 * 60) % granularity:
+        raise HTTPException(status_code=400, detail="granularity must divide 1440")
+    if (to_date - from_date).days + 1 > get_settings().availability_slots_max_days:
+        raise HTTPException(status_code=400, detail="Date range too long")
+    slots = await compute_slot_availability_async(db, from_date=from_date, to_date=to_date, granularity_minutes=granularity)
+    return AvailabilitySlotsResponse(granularity=granularity, slots=[AvailabilitySlot(**s) for s in slots])
+
+
+@router.get("/availability/search", response_model=FreeSlotSearchResponse)
+async def availability_search(
+    duration: int = Query(..., ge=15, le=24 * 60, description="Minutes"),
+    people: int = Query(default=1, ge=1, le=9999),
+    from_: datetime | None = Query(default=None, alias="from"),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # `people` is accepted for clients but not filtered on: venues carry no capacity yet.
+    from_at = from_ or datetime.now(tz=ZoneInfo("UTC"))
+    if from_at.tzinfo is None:
+        raise HTTPException(status_code=400, detail="from must include a timezone offset")
+    slots = await search_free_slots_async(db, duration_minutes=duration, from_at=from_at, limit=limit)
+    return FreeSlotSearchResponse(slots=[FreeSlot(**s) for s in slots])
+
+
+@router.post("/holds", response_model=SlotHoldCreated, dependencies=[Depends(rate_limit("hold", identity="phone"))])
+async def create_hold(payload: SlotHoldCreate, request: Request, db: AsyncSession = Depends(get_async_db)):
+    ip = request.client.host if request.client else ""
+    if not await verify_captcha(payload.captcha_token, remote_ip=ip or None):
         raise HTTPException(status_code=400, detail="CAPTCHA failed")
+    hold, token_raw = await create_hold_async(
+        db, venue_id=payload.venue_id, start_at=payload.start_at, end_at=payload.end_at, ip=ip, phone=payload.phone
+    )
+    return SlotHoldCreated(
+        hold_token=token_raw,
+        venue_id=hold.venue_id,
+        start_at=hold.start_at,
+        end_at=hold.end_at,
+        expires_at=hold.expires_at,
+    )
 
-    if not payload.consent_accepted:
-        raise HTTPException(status_code=400, detail="Consent required")
 
-    r = create_reservation_public(
-        db,
-        venue_id=payload.venue_id,
-        start_at=payload.start_at,
-        end_at=payload.end_at,
-        people_count=payload.people_count,
-        booking_type=payload.booking_type,
-        banquet_name=payload.banquet_name,
-        desired_time_text=payload.desired_time_text,
-        customer_name=payload.customer_name,
-        phone=payload.phone,
-        email=str(payload.email),
-        menu_selections=[s.dict() for s in payload.menu_selections],
-        consent_version=payload.consent_version,
-    )
+@router.delete("/holds/{token}")
+async def release_hold(token: str, db: AsyncSession = Depends(get_async_db)):
+    await release_hold_async(db, token_raw=token)
+    return {"ok": True}
 
-    write_audit_log(
-        db,
-        actor_user_id=None,
-        action_type="PUBLIC_RESERVATION_CREATE",
-        target_type="reservation",
-        target_id=r.public_id,
-        summary="Public reservation created",
-        diff_json={"public_id": r.public_id, "venue_id": r.venue_id},
-        request=request,
-    )
 
-    return PublicReservationCreated(public_id=r.public_id, message="仮予約を受け付けました。メールをご確認ください。")
+@router.post("/reservations", response_model=PublicReservationCreated, dependencies=[Depends(rate_limit("reservation_create", identity="phone"))])
+async def create_reservation(
+    payload: PublicReservationCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
+):
+    # Retries with the same key replay the first response (CAPTCHA tokens are single-use, so not fingerprinted)
+    idem = None
+    if idempotency_key is not None:
+        fingerprint = request_fingerprint(payload.model_dump(mode="json", exclude={"captcha_token"}))
+        state, idem = await begin_async(db, scope="public_reservation_create", key=idempotency_key, fingerprint=fingerprint)
+        if state == "done":
+            return PublicReservationCreated(public_id=idem.response_json["public_id"], message=RESERVATION_CREATED_MESSAGE)
+
+    try:
+        # Optional CAPTCHA
+        ip = request.client.host if request.client else None
+        ok = await verify_captcha(payload.captcha_token, remote_ip=ip)
+        if not ok:
+            raise HTTPException(status_code=400, detail="CAPTCHA failed")
+
+        if not payload.consent_accepted:
+            raise HTTPException(status_code=400, detail="Consent required")
+
+        r = await create_reservation_public_async(
+            db,
+            venue_id=payload.venue_id,
+            start_at=payload.start_at,
+            end_at=payload.end_at,
+            people_count=payload.people_count,
+            booking_type=payload.booking_type,
+            banquet_name=payload.banquet_name,
+            desired_time_text=payload.desired_time_text,
+            customer_name=payload.customer_name,
+            phone=payload.phone,
+            email=str(payload.email),
+            menu_selections=[s.dict() for s in payload.menu_selections],
+            consent_version=payload.consent_version,
+            hold_token=payload.hold_token,
+            idempotency_key=idem,
+            request=request,
+        )
+    except Exception:
+        if idem is not None:
+            await release_async(db, idem)
+        raise
+
+    return PublicReservationCreated(public_id=r.public_id, message=RESERVATION_CREATED_MESSAGE)
 
 
-@router.post("/reservations/lookup", response_model=ReservationOut)
-def lookup(payload: PublicReservationLookupRequest, db: Session = Depends(get_db)):
-    r = lookup_reservation_by_public_id_and_phone(db, public_id=payload.public_id, phone=payload.phone)
+@router.post("/reservations/lookup", response_model=ReservationOut, dependencies=[Depends(rate_limit("reservation_lookup", identity="public_id"))])
+async def lookup(payload: PublicReservationLookupRequest, db: AsyncSession = Depends(get_async_db)):
+    r = await lookup_reservation_by_public_id_and_phone_async(db, public_id=payload.public_id, phone=payload.phone)
     return ReservationOut(
         public_id=r.public_id,
         venue_id=r.venue_id,
@@ -204,12 +289,12 @@ def lookup(payload: PublicReservationLookupRequest, db: Session = Depends(get_db
     )
 
 
-@router.post("/reservations/{public_id}/cancel")
-def cancel_by_id(public_id: str, payload: PublicReservationCancelRequest, request: Request, db: Session = Depends(get_db)):
-    r = lookup_reservation_by_public_id_and_phone(db, public_id=public_id, phone=payload.phone)
-    cancel_reservation(db, reservation=r, reason=payload.reason)
+@router.post("/reservations/{public_id}/cancel", dependencies=[Depends(rate_limit("reservation_lookup", identity="public_id"))])
+async def cancel_by_id(public_id: str, payload: PublicReservationCancelRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    r = await lookup_reservation_by_public_id_and_phone_async(db, public_id=public_id, phone=payload.phone)
+    await cancel_reservation_async(db, reservation=r, reason=payload.reason)
 
-    write_audit_log(
+    await write_audit_log_async(
         db,
         actor_user_id=None,
         action_type="PUBLIC_RESERVATION_CANCEL",
@@ -223,9 +308,9 @@ def cancel_by_id(public_id: str, payload: PublicReservationCancelRequest, reques
     return {"ok": True}
 
 
-@router.get("/r/{token}", response_model=ReservationOut)
-def view_by_token(token: str, db: Session = Depends(get_db)):
-    r = get_reservation_by_token(db, token_raw=token)
+@router.get("/r/{token}", response_model=ReservationOut, dependencies=[Depends(rate_limit("token_view", identity="token"))])
+async def view_by_token(token: str, db: AsyncSession = Depends(get_async_db)):
+    r = await get_reservation_by_token_async(db, token_raw=token)
     return ReservationOut(
         public_id=r.public_id,
         venue_id=r.venue_id,
@@ -241,11 +326,11 @@ def view_by_token(token: str, db: Session = Depends(get_db)):
 
 
 @router.post("/r/{token}/cancel")
-def cancel_by_token(token: str, request: Request, reason: str = "", db: Session = Depends(get_db)):
-    r = get_reservation_by_token(db, token_raw=token)
-    cancel_reservation(db, reservation=r, reason=reason)
+async def cancel_by_token(token: str, request: Request, reason: str = "", db: AsyncSession = Depends(get_async_db)):
+    r = await get_reservation_by_token_async(db, token_raw=token)
+    await cancel_reservation_async(db, reservation=r, reason=reason)
 
-    write_audit_log(
+    await write_audit_log_async(
         db,
         actor_user_id=None,
         action_type="PUBLIC_RESERVATION_CANCEL_TOKEN",
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Callable
+
+from fastapi import HTTPException, Request
+from limits import RateLimitItem, parse_many
+from limits.aio.strategies import MovingWindowRateLimiter
+from limits.storage import storage_from_string
+
+from app.core.config import get_settings
+
+# Per-route request limits, built on the `limits` library (moving windows).
+# Each policy limits the client IP and, where the route has one, an identity
+# (login email, 2FA challenge, reservation phone, public_id, view token), so
+# neither many identities from one address nor one identity from many
+# addresses gets through. Checks run as route dependencies, before the handler opens a
+# session or hashes anything. Storage is per process by default
+# (rate_limit_storage_uri="memory://"); point it at e.g. "redis://host:6379"
+# to share counters between processes. The client IP is whatever uvicorn
+# puts in request.client, so behind a proxy it must trust X-Forwarded-For
+# from that proxy (--proxy-headers, FORWARDED_ALLOW_IPS).
+
+
+class RateLimiter:
+    def __init__(self, *, enabled: bool, storage_uri: str, policies: dict[str, tuple[str, str]]) -> None:
+        self.enabled = enabled
+        if not storage_uri.startswith("async+"):
+            storage_uri = "async+" + storage_uri
+        self._limiter = MovingWindowRateLimiter(storage_from_string(storage_uri))
+        # policy -> (per-IP limits, per-identity limits)
+        self._policies: dict[str, tuple[list[RateLimitItem], list[RateLimitItem]]] = {
+            name: (parse_many(ip_spec) if ip_spec else [], parse_many(identity_spec) if identity_spec else [])
+            for name, (ip_spec, identity_spec) in policies.items()
+        }
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected: dict[str, int] = {}
+
+    async def _hit(self, items: list[RateLimitItem], *identifiers: str) -> int | None:
+        """Count one request; on rejection return the seconds until a slot frees up."""
+        for item in items:
+            if not await self._limiter.hit(item, *identifiers):
+                stats = await self._limiter.get_window_stats(item, *identifiers)
+                return max(1, int(stats.reset_time - time.time()) + 1)
+        return None
+
+    async def check(self, policy: str, *, ip: str, identity: str = "") -> None:
+        if not self.enabled:
+            return
+        ip_items, identity_items = self._policies[policy]
+        retry_after = await self._hit(ip_items, policy, "ip", ip)
+        if retry_after is None and identity:
+            # Formatting stripped (phone numbers arrive with or without separators), then hashed:
+            # identities are emails and phone numbers, and may sit in a shared store
+            normalized = "".join(ch for ch in identity.lower() if ch.isalnum() or ch in "@._+")
+            key = hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+            retry_after = await self._hit(identity_items, policy, "id", key)
+        with self._lock:
+            if retry_after is None:
+                self.allowed += 1
+            else:
+                self.rejected[policy] = self.rejected.get(policy, 0) + 1
+        if retry_after is not None:
+            raise HTTPException(status_code=429, detail="Too many requests", headers={"Retry-After": str(retry_after)})
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"enabled": self.enabled, "allowed": self.allowed, "rejected": dict(self.rejected)}
+
+
+_settings = get_settings()
+rate_limiter = RateLimiter(
+    enabled=_settings.rate_limit_enabled,
+    storage_uri=_settings.rate_limit_storage_uri,
+    policies={
+        "login": (_settings.rate_limit_login_ip, _settings.rate_limit_login_identity),
+        "verify": (_settings.rate_limit_verify_ip, _settings.rate_limit_verify_identity),
+        "reservation_create": (_settings.rate_limit_reservation_create_ip, _settings.rate_limit_reservation_create_identity),
+        "reservation_lookup": (_settings.rate_limit_reservation_lookup_ip, _settings.rate_limit_reservation_lookup_identity),
+        "token_view": (_settings.rate_limit_token_view_ip, _settings.rate_limit_token_view_identity),
+        "hold": (_settings.rate_limit_hold_ip, _settings.rate_limit_hold_identity),
+    },
+)
+
+
+def rate_limit(policy: str, *, identity: str | None = None) -> Callable:
+    """Route dependency enforcing `policy`.
+
+    `identity` names a path parameter or a top-level JSON body field; the body
+    has already been read and validated by FastAPI when dependencies run.
+    """
+
+    async def dependency(request: Request) -> None:
+        if not rate_limiter.enabled:
+            return
+        value = ""
+        if identity is not None:
+            value = request.path_params.get(identity, "")
+            if not value and request.headers.get("content-type", "").startswith("application/json"):
+                body = await request.json()
+                if isinstance(body, dict):
+                    value = str(body.get(identity) or "")
+        ip = request.client.host if request.client else ""
+        await rate_limiter.check(policy, ip=ip, identity=value)
+
+    return dependency
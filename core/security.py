@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import hmac
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
@@ -19,6 +21,28 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def hash_otp(challenge_id: str, code: str) -> str:
+    """HMAC-SHA256 of a one-time code, bound to its challenge.
+
+    OTPs are short-lived and attempt-limited, so a keyed hash is enough; a
+    slow password hash would only make every login (and every guess) cost
+    a bcrypt round.
+    """
+    settings = get_settings()
+    msg = f"otp|{challenge_id}|{code}".encode("utf-8")
+    return "hmac$" + hmac.new(settings.secret_key.encode("utf-8"), msg, hashlib.sha256).hexdigest()
+
+
+def verify_otp(challenge_id: str, code: str, code_hash: str) -> bool:
+    if code_hash.startswith("hmac$"):
+        return hmac.compare_digest(hash_otp(challenge_id, code), code_hash)
+    # Challenges issued with otp_hash_mode=bcrypt: through the bounded pool like
+    # any other bcrypt call (imported here, password_hashing imports this module)
+    from app.services.password_hashing import password_hasher
+
+    return password_hasher.verify(code, code_hash)
+
+
 def create_access_token(subject: str, extra_claims: Optional[Dict[str, Any]] = None) -> str:
     """Create a JWT access token.
 
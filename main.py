@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.router import api_router
 from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.services.token_views import token_view_buffer
 
 settings = get_settings()
 
@@ -25,3 +29,20 @@ app.include_router(api_router, prefix=settings.api_prefix)
 @app.get("/")
 def health() -> dict:
     return {"status": "ok", "app": settings.app_name}
+
+
+@app.on_event("startup")
+async def start_token_view_flusher() -> None:
+    # Writes buffered token views even when no further views arrive
+    app.state.token_view_flusher = asyncio.create_task(token_view_buffer.run_periodic_flush(SessionLocal))
+
+
+@app.on_event("shutdown")
+async def flush_token_views() -> None:
+    app.state.token_view_flusher.cancel()
+    # Write-behind token views still buffered in this process
+    db = SessionLocal()
+    try:
+        token_view_buffer.flush(db)
+    finally:
+        db.close()
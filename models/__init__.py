@@ -13,6 +13,10 @@ from app.models.booking_rule import BookingRule
 from app.models.calendar_block import CalendarBlock
 from app.models.settings import AppSettings
 from app.models.reservation_token import ReservationAccessToken
+from app.models.venue_day_slot import VenueDaySlot
+from app.models.slot_hold import SlotHold
+from app.models.email_outbox import EmailOutbox
+from app.models.idempotency_key import IdempotencyKey
 
 __all__ = [
     "Permission",
@@ -34,6 +38,10 @@ __all__ = [
     "CalendarBlock",
     "AppSettings",
     "ReservationAccessToken",
+    "VenueDaySlot",
+    "SlotHold",
+    "EmailOutbox",
+    "IdempotencyKey",
 ]
 
 from app.models.layout import VenueLayoutTemplate, LayoutAsset, ReservationLayout
@@ -1,19 +1,19 @@
 from __future__ import annotations
 
-import uuid
 from datetime import datetime, timezone
 
 from sqlalchemy import DateTime, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
+from app.models._ids import UUIDKey, new_id
 
 
 class AuthEvent(Base):
     __tablename__ = "auth_events"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id: Mapped[str | None] = mapped_column(String(36), ForeignKey("users.id"), nullable=True)
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=new_id)
+    user_id: Mapped[str | None] = mapped_column(UUIDKey, ForeignKey("users.id"), nullable=True)
 
     event_type: Mapped[str] = mapped_column(String(32), nullable=False)
     ip_address: Mapped[str] = mapped_column(String(64), nullable=False, default="")
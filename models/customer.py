@@ -1,18 +1,41 @@
 from __future__ import annotations
 
-import uuid
-
-from sqlalchemy import String
+from sqlalchemy import Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
+from app.models._ids import UUIDKey, new_id
 from app.models._mixins import TimestampMixin
 
 
+# Identity keys for the upsert in reservation_service.get_or_create_customer:
+# phone when present, else email. Literal predicates so ON CONFLICT can infer
+# the partial indexes under server-side binds too.
+PHONE_KEY_WHERE = text("phone_hash <> ''")
+EMAIL_KEY_WHERE = text("phone_hash = '' AND email_hash <> ''")
+
+
 class Customer(Base, TimestampMixin):
     __tablename__ = "customers"
-
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Run scripts/dedup_customers.py before adding these to an existing database
+    __table_args__ = (
+        Index(
+            "uq_customers_phone_hash",
+            "phone_hash",
+            unique=True,
+            postgresql_where=PHONE_KEY_WHERE,
+            sqlite_where=PHONE_KEY_WHERE,
+        ),
+        Index(
+            "uq_customers_email_hash",
+            "email_hash",
+            unique=True,
+            postgresql_where=EMAIL_KEY_WHERE,
+            sqlite_where=EMAIL_KEY_WHERE,
+        ),
+    )
+
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=new_id)
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
 
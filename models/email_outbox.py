@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models._ids import UUIDKey, new_id
+from app.models._mixins import TimestampMixin
+
+# Placeholder for the secret in EmailOutbox.body
+SECRET_MARK = "{{secret}}"
+
+
+class EmailOutbox(Base, TimestampMixin):
+    """Outgoing email, written in the same transaction as the change that triggers it.
+
+    status: PENDING -> SENDING (claimed by a worker until next_attempt_at) -> SENT,
+    or back to PENDING with a later next_attempt_at, or FAILED after max attempts
+    or once expires_at has passed.
+
+    Secrets (login codes, reservation links) are not part of `body`: the body
+    holds SECRET_MARK and `secret_enc` the encrypted value, substituted at send
+    time. Both are cleared when the row is SENT or FAILED.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (Index("ix_email_outbox_status_next", "status", "next_attempt_at"),)
+
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=new_id)
+
+    to_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    secret_enc: Mapped[str] = mapped_column(Text, nullable=False, default="")
+
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="PENDING")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    last_error: Mapped[str] = mapped_column(String(500), nullable=False, default="")
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Not delivered after this (e.g. a login code's expiry)
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models._mixins import TimestampMixin
+
+
+class IdempotencyKey(Base, TimestampMixin):
+    """Client-supplied Idempotency-Key and the response of the request that first used it.
+
+    id is sha256(scope|key), so keys from different endpoints never collide.
+    status: IN_PROGRESS while the first attempt runs, then DONE with the response.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    scope: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    request_fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="IN_PROGRESS")
+    response_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
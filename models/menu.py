@@ -1,18 +1,17 @@
 from __future__ import annotations
 
-import uuid
-
 from sqlalchemy import Boolean, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.models._ids import UUIDKey, new_id
 from app.models._mixins import TimestampMixin
 
 
 class MenuCategory(Base, TimestampMixin):
     __tablename__ = "menu_categories"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=new_id)
     name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
     sort_order: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
@@ -23,8 +22,8 @@ class MenuCategory(Base, TimestampMixin):
 class MenuItem(Base, TimestampMixin):
     __tablename__ = "menu_items"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    category_id: Mapped[str] = mapped_column(String(36), ForeignKey("menu_categories.id"), nullable=False, index=True)
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=new_id)
+    category_id: Mapped[str] = mapped_column(UUIDKey, ForeignKey("menu_categories.id"), nullable=False, index=True)
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(String(2000), nullable=False, default="")
@@ -43,8 +42,8 @@ class MenuItem(Base, TimestampMixin):
 class MenuItemPhoto(Base, TimestampMixin):
     __tablename__ = "menu_item_photos"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    menu_item_id: Mapped[str] = mapped_column(String(36), ForeignKey("menu_items.id"), nullable=False, index=True)
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=new_id)
+    menu_item_id: Mapped[str] = mapped_column(UUIDKey, ForeignKey("menu_items.id"), nullable=False, index=True)
 
     image_url: Mapped[str] = mapped_column(String(2000), nullable=False)
     sort_order: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,23 +1,27 @@
 from __future__ import annotations
 
-import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Integer, Sequence, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.models._ids import UUIDKey, new_id
 from app.models._mixins import TimestampMixin
 
+# Block starts for services.public_id (each nextval reserves PUBLIC_ID_BLOCK counters)
+PUBLIC_ID_BLOCK = 32
+public_id_seq = Sequence("reservation_public_id_seq", increment=PUBLIC_ID_BLOCK, metadata=Base.metadata)
+
 
 class Reservation(Base, TimestampMixin):
     __tablename__ = "reservations"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=new_id)
     public_id: Mapped[str] = mapped_column(String(32), nullable=False, unique=True, index=True)
 
-    venue_id: Mapped[str] = mapped_column(String(36), ForeignKey("venues.id"), nullable=False, index=True)
-    customer_id: Mapped[str] = mapped_column(String(36), ForeignKey("customers.id"), nullable=False, index=True)
+    venue_id: Mapped[str] = mapped_column(UUIDKey, ForeignKey("venues.id"), nullable=False, index=True)
+    customer_id: Mapped[str] = mapped_column(UUIDKey, ForeignKey("customers.id"), nullable=False, index=True)
 
     start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -37,6 +41,9 @@ class Reservation(Base, TimestampMixin):
     cancelled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     cancel_reason: Mapped[str] = mapped_column(String(255), nullable=False, default="")
 
+    # Sum of unit_price × quantity over menu_selections, fixed at booking time
+    total_price: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
     menu_selections: Mapped[list["ReservationMenuSelection"]] = relationship(
         "ReservationMenuSelection", back_populates="reservation", cascade="all, delete-orphan"
     )
@@ -45,11 +52,15 @@ class Reservation(Base, TimestampMixin):
 class ReservationMenuSelection(Base):
     __tablename__ = "reservation_menu_selections"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    reservation_id: Mapped[str] = mapped_column(String(36), ForeignKey("reservations.id"), nullable=False, index=True)
-    menu_item_id: Mapped[str] = mapped_column(String(36), ForeignKey("menu_items.id"), nullable=False, index=True)
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=new_id)
+    reservation_id: Mapped[str] = mapped_column(UUIDKey, ForeignKey("reservations.id"), nullable=False, index=True)
+    menu_item_id: Mapped[str] = mapped_column(UUIDKey, ForeignKey("menu_items.id"), nullable=False, index=True)
 
     quantity: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
     notes: Mapped[str] = mapped_column(String(255), nullable=False, default="")
 
+    # Snapshot of the menu item when booked; later menu edits do not change it
+    name: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    unit_price: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
     reservation: Mapped[Reservation] = relationship("Reservation", back_populates="menu_selections")
@@ -1,21 +1,21 @@
 from __future__ import annotations
 
-import uuid
 from datetime import datetime
 
 from sqlalchemy import DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
+from app.models._ids import UUIDKey, new_id
 from app.models._mixins import TimestampMixin
 
 
 class ReservationAccessToken(Base, TimestampMixin):
     __tablename__ = "reservation_access_tokens"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=new_id)
 
-    reservation_id: Mapped[str] = mapped_column(String(36), ForeignKey("reservations.id"), nullable=False, index=True)
+    reservation_id: Mapped[str] = mapped_column(UUIDKey, ForeignKey("reservations.id"), nullable=False, index=True)
 
     token_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
 
@@ -27,3 +27,4 @@ class ReservationAccessToken(Base, TimestampMixin):
     view_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     last_accessed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
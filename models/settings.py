@@ -38,3 +38,9 @@ class AppSettings(Base):
     # Consent URL/version (for audit)
     cancel_policy_url: Mapped[str] = mapped_column(String(2000), nullable=False, default="")
     cancel_policy_version: Mapped[str] = mapped_column(String(64), nullable=False, default="v1")
+
+    # Bumped on every booking rule change; keys the compiled rule cache
+    rules_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # rules_version the venue_day_slots read model was last fully rebuilt for; while it lags,
+    # the read model is not served (scripts/venue_day_slots.py sync catches it up)
+    venue_day_slots_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
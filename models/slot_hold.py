@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models._ids import UUIDKey, new_id
+
+
+class SlotHold(Base):
+    """A (venue, start, end) kept for one customer while they fill in the booking form.
+
+    Rows are short-lived: consumed by the booking or deleted by the sweeper
+    once expired; until then they count as busy for everyone else.
+    """
+
+    __tablename__ = "slot_holds"
+    __table_args__ = (Index("ix_slot_holds_venue_start", "venue_id", "start_at"),)
+
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=new_id)
+
+    venue_id: Mapped[str] = mapped_column(UUIDKey, ForeignKey("venues.id"), nullable=False)
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    token_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    # Who asked (hash_pii of client IP / normalized phone), for the per-client cap
+    client_ip_hash: Mapped[str] = mapped_column(String(64), nullable=False, default="", index=True)
+    phone_hash: Mapped[str] = mapped_column(String(64), nullable=False, default="", index=True)
@@ -1,19 +1,19 @@
 from __future__ import annotations
 
-import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.models._ids import UUIDKey, new_id
 from app.models._mixins import TimestampMixin
 
 
 class User(Base, TimestampMixin):
     __tablename__ = "users"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(UUIDKey, primary_key=True, default=new_id)
     email: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -23,13 +23,16 @@ class User(Base, TimestampMixin):
 
     last_login_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    # Bumped whenever the user's effective permissions change (see services.permissions)
+    permissions_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
     roles: Mapped[list["UserRole"]] = relationship("UserRole", back_populates="user", cascade="all, delete-orphan")
 
 
 class UserRole(Base):
     __tablename__ = "user_roles"
 
-    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), primary_key=True)
-    role_id: Mapped[str] = mapped_column(String(36), ForeignKey("roles.id"), primary_key=True)
+    user_id: Mapped[str] = mapped_column(UUIDKey, ForeignKey("users.id"), primary_key=True)
+    role_id: Mapped[str] = mapped_column(UUIDKey, ForeignKey("roles.id"), primary_key=True)
 
     user: Mapped[User] = relationship("User", back_populates="roles")
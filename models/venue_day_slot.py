@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models._ids import UUIDKey
+
+
+class VenueDaySlot(Base):
+    """Denormalized public availability: one row per venue/local date/block.
+
+    Maintained by services.venue_day_slots from the reservation, calendar
+    block, rule and settings write paths.
+    """
+
+    __tablename__ = "venue_day_slots"
+    __table_args__ = (Index("ix_venue_day_slots_date_venue", "slot_date", "venue_id"),)
+
+    venue_id: Mapped[str] = mapped_column(UUIDKey, ForeignKey("venues.id"), primary_key=True)
+    slot_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    block: Mapped[str] = mapped_column(String(16), primary_key=True)  # DAY/NIGHT
+
+    status: Mapped[str] = mapped_column(String(1), nullable=False)  # O/X
+    reason: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
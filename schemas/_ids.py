@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import uuid
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+
+def _canonical_id(value: str) -> str:
+    try:
+        return str(uuid.UUID(value))
+    except ValueError:
+        raise ValueError("must be a UUID") from None
+
+
+# Primary/foreign key id in a path, query or body: malformed values are a 422
+# here rather than a NULL bind (and a confusing miss or constraint error) later.
+Id = Annotated[str, AfterValidator(_canonical_id)]
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from pydantic import BaseModel, EmailStr, Field
 
+from app.schemas._ids import Id
+
 
 class LoginRequest(BaseModel):
     email: EmailStr
@@ -14,7 +16,7 @@ class LoginChallengeResponse(BaseModel):
 
 
 class Verify2FARequest(BaseModel):
-    challenge_id: str
+    challenge_id: Id
     code: str = Field(min_length=4, max_length=12)
 
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
 
 from pydantic import BaseModel
 
@@ -15,3 +15,28 @@ class AvailabilityBlock(BaseModel):
 
 class AvailabilityResponse(BaseModel):
     blocks: list[AvailabilityBlock]
+
+
+class AvailabilitySlot(BaseModel):
+    venue_id: str
+    venue_name: str
+    date: date
+    start_at: datetime
+    end_at: datetime
+    status: str  # O/X
+
+
+class AvailabilitySlotsResponse(BaseModel):
+    granularity: int
+    slots: list[AvailabilitySlot]
+
+
+class FreeSlot(BaseModel):
+    venue_id: str
+    venue_name: str
+    start_at: datetime
+    end_at: datetime
+
+
+class FreeSlotSearchResponse(BaseModel):
+    slots: list[FreeSlot]
@@ -4,9 +4,11 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from app.schemas._ids import Id
+
 
 class CalendarBlockCreate(BaseModel):
-    venue_id: str
+    venue_id: Id
     start_at: datetime
     end_at: datetime
     reason: str = Field(default="", max_length=255)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.schemas._ids import Id
+
+
+class SlotHoldCreate(BaseModel):
+    venue_id: Id
+    start_at: datetime
+    end_at: datetime
+    # Optional; when given, active holds are also capped per phone
+    phone: str = Field(default="", max_length=32)
+
+    captcha_token: str | None = None
+
+
+class SlotHoldCreated(BaseModel):
+    hold_token: str
+    venue_id: str
+    start_at: datetime
+    end_at: datetime
+    expires_at: datetime
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field
 
+from app.schemas._ids import Id
+
 
 class VenueLayoutTemplateCreate(BaseModel):
-    venue_id: str
+    venue_id: Id
     background_image_url: str = Field(min_length=0, max_length=1000)
     canvas_width: int = Field(default=1200, ge=1, le=10000)
     canvas_height: int = Field(default=800, ge=1, le=10000)
@@ -31,7 +33,7 @@ class VenueLayoutTemplateOut(BaseModel):
 
 
 class LayoutAssetCreate(BaseModel):
-    venue_id: str | None = None
+    venue_id: Id | None = None
     asset_type: str = Field(default="TABLE", max_length=32)
     shape: str = Field(default="RECT", max_length=32)
     name: str = Field(default="", max_length=255)
@@ -43,7 +45,7 @@ class LayoutAssetCreate(BaseModel):
 
 
 class LayoutAssetUpdate(BaseModel):
-    venue_id: str | None = None
+    venue_id: Id | None = None
     asset_type: str | None = Field(default=None, max_length=32)
     shape: str | None = Field(default=None, max_length=32)
     name: str | None = Field(default=None, max_length=255)
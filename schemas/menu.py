@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field
 
+from app.schemas._ids import Id
+
 
 class MenuCategoryCreate(BaseModel):
     name: str = Field(min_length=1, max_length=200)
@@ -20,7 +22,7 @@ class MenuCategoryOut(BaseModel):
 
 
 class MenuItemCreate(BaseModel):
-    category_id: str
+    category_id: Id
     name: str = Field(min_length=1, max_length=200)
     description: str | None = ""
     price: int = Field(default=0, ge=0)
@@ -4,15 +4,17 @@ from datetime import datetime
 
 from pydantic import BaseModel, EmailStr, Field
 
+from app.schemas._ids import Id
+
 
 class MenuSelectionIn(BaseModel):
-    menu_item_id: str
+    menu_item_id: Id
     quantity: int = Field(default=1, ge=1, le=999)
     notes: str = Field(default="", max_length=255)
 
 
 class PublicReservationCreate(BaseModel):
-    venue_id: str
+    venue_id: Id
     start_at: datetime
     end_at: datetime
     people_count: int = Field(ge=1, le=9999)
@@ -31,6 +33,9 @@ class PublicReservationCreate(BaseModel):
     consent_accepted: bool = True
     consent_version: str = Field(default="", max_length=64)
 
+    # Token from POST /public/holds for this exact slot, if the client took one
+    hold_token: str | None = None
+
     # Optional CAPTCHA token
     captcha_token: str | None = None
 
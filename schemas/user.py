@@ -4,12 +4,14 @@ from datetime import datetime
 
 from pydantic import BaseModel, EmailStr, Field
 
+from app.schemas._ids import Id
+
 
 class UserCreate(BaseModel):
     email: EmailStr
     name: str = Field(min_length=1, max_length=255)
     password: str = Field(min_length=8, max_length=128)
-    role_ids: list[str] = Field(default_factory=list)
+    role_ids: list[Id] = Field(default_factory=list)
 
 
 class UserUpdate(BaseModel):
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from sqlalchemy import case, exists, func, select, update
+
+from app.db.session import SessionLocal
+from app.models.menu import MenuItem
+from app.models.reservation import Reservation, ReservationMenuSelection
+
+# One-off fill of the price snapshot for reservations booked before it was
+# recorded. Historical prices are not known, so current menu prices are
+# used; selections that already have a snapshot are left alone.
+
+
+def main() -> int:
+    db = SessionLocal()
+    try:
+        item = select(MenuItem).where(MenuItem.id == ReservationMenuSelection.menu_item_id)
+        pending = ReservationMenuSelection.name == ""
+        affected = select(ReservationMenuSelection.reservation_id).where(pending).distinct().scalar_subquery()
+
+        # Totals first, while the selections still identify which reservations need them
+        sel = ReservationMenuSelection.__table__.alias("s")
+        mi = MenuItem.__table__.alias("m")
+        total = (
+            select(func.coalesce(func.sum(case((sel.c.name == "", func.coalesce(mi.c.price, 0)), else_=sel.c.unit_price) * sel.c.quantity), 0))
+            .select_from(sel.outerjoin(mi, mi.c.id == sel.c.menu_item_id))
+            .where(sel.c.reservation_id == Reservation.id)
+            .scalar_subquery()
+        )
+        totals = db.execute(update(Reservation).where(Reservation.id.in_(affected)).values(total_price=total)).rowcount
+
+        selections = db.execute(
+            update(ReservationMenuSelection)
+            .where(pending, exists(item))
+            .values(
+                name=item.with_only_columns(MenuItem.name).scalar_subquery(),
+                unit_price=item.with_only_columns(MenuItem.price).scalar_subquery(),
+            )
+        ).rowcount
+        db.commit()
+        print(f"selections={selections} reservations={totals}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.services.interval_index import IntervalIndex
+
+
+def _make_rows(days: int, venues: int, per_day: int, seed: int) -> list[SimpleNamespace]:
+    rnd = random.Random(seed)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for d in range(days):
+        for v in range(venues):
+            for _ in range(per_day):
+                start_at = base + timedelta(days=d, minutes=rnd.randrange(0, 24 * 60, 30))
+                rows.append(SimpleNamespace(venue_id=f"v{v}", start_at=start_at, end_at=start_at + timedelta(minutes=rnd.choice([60, 120, 180]))))
+    return rows
+
+
+def _probes(days: int, venues: int) -> list[tuple[str, datetime, datetime]]:
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    out = []
+    for d in range(days):
+        for v in range(venues):
+            for start_h, end_h in ((2, 6), (8, 13)):
+                out.append((f"v{v}", base + timedelta(days=d, hours=start_h), base + timedelta(days=d, hours=end_h)))
+    return out
+
+
+def _linear_overlaps(items, venue_id: str, start_at: datetime, end_at: datetime) -> bool:
+    # Mirrors the previous nested overlaps() scan in compute_public_availability
+    for it in items:
+        if it.venue_id != venue_id:
+            continue
+        if it.start_at < end_at and it.end_at > start_at:
+            return True
+    return False
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Compare linear overlap scans against IntervalIndex probes")
+    p.add_argument("--days", type=int, default=90)
+    p.add_argument("--venues", type=int, default=20)
+    p.add_argument("--per-day", type=int, default=2, help="Busy intervals per venue per day")
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+
+    rows = _make_rows(args.days, args.venues, args.per_day, args.seed)
+    probes = _probes(args.days, args.venues)
+
+    t0 = time.perf_counter()
+    linear = [_linear_overlaps(rows, *probe) for probe in probes]
+    t_linear = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    index = IntervalIndex.from_rows(rows)
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    indexed = [index.overlaps(*probe) for probe in probes]
+    t_index = time.perf_counter() - t0
+
+    if linear != indexed:
+        print("MISMATCH between linear scan and index")
+        return 1
+
+    print(f"rows={len(rows)} probes={len(probes)}")
+    print(f"linear_scan_s={t_linear:.4f}")
+    print(f"index_build_s={t_build:.4f} index_probe_s={t_index:.4f}")
+    print(f"speedup={t_linear / max(t_build + t_index, 1e-9):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import argparse
+import time
+import uuid
+
+from sqlalchemy import text
+
+from app.db.session import engine
+from app.models._ids import uuid7
+
+# Insert throughput and primary-key index size for the old varchar uuid4
+# keys, native uuid4 and native uuid7. Each variant gets its own unlogged
+# scratch table shaped like audit_logs (key + ~200 bytes of payload), which
+# is dropped afterwards.
+
+_VARIANTS = {
+    "varchar_uuid4": ("varchar(36)", lambda: str(uuid.uuid4())),
+    "uuid_uuid4": ("uuid", lambda: str(uuid.uuid4())),
+    "uuid_uuid7": ("uuid", lambda: str(uuid7())),
+}
+
+
+def _run(conn, name: str, column_type: str, make_id, rows: int, batch: int, payload: str) -> dict:
+    table = f"bench_pk_{name}"
+    conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    conn.execute(text(f"CREATE UNLOGGED TABLE {table} (id {column_type} PRIMARY KEY, payload text NOT NULL)"))
+    conn.commit()
+
+    stmt = text(f"INSERT INTO {table} (id, payload) VALUES (:id, :payload)")
+    t0 = time.perf_counter()
+    for start in range(0, rows, batch):
+        conn.execute(stmt, [{"id": make_id(), "payload": payload} for _ in range(min(batch, rows - start))])
+        conn.commit()
+    elapsed = time.perf_counter() - t0
+
+    sizes = conn.execute(
+        text(f"SELECT pg_relation_size('{table}_pkey'), pg_relation_size('{table}')")
+    ).one()
+    conn.execute(text(f"DROP TABLE {table}"))
+    conn.commit()
+    return {"seconds": elapsed, "index_bytes": sizes[0], "table_bytes": sizes[1]}
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Benchmark uuid4 vs uuid7 primary keys (PostgreSQL)")
+    p.add_argument("--rows", type=int, default=200_000)
+    p.add_argument("--batch", type=int, default=1000, help="Rows per committed batch")
+    p.add_argument("--variants", default=",".join(_VARIANTS), help="Comma-separated subset of " + ", ".join(_VARIANTS))
+    args = p.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("this benchmark needs PostgreSQL (DATABASE_URL)")
+        return 2
+
+    payload = "x" * 200
+    print(f"rows={args.rows} batch={args.batch}")
+    with engine.connect() as conn:
+        for name in args.variants.split(","):
+            column_type, make_id = _VARIANTS[name]
+            r = _run(conn, name, column_type, make_id, args.rows, args.batch, payload)
+            print(
+                f"{name:14s} {r['seconds']:7.2f}s {args.rows / r['seconds']:9.0f} rows/s "
+                f"pkey={r['index_bytes'] / 1048576:7.1f} MiB table={r['table_bytes'] / 1048576:7.1f} MiB"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import argparse
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.audit_log import AuditLog
+from app.models.customer import Customer
+from app.models.email_outbox import EmailOutbox
+from app.models.reservation import Reservation
+from app.models.reservation_token import ReservationAccessToken
+from app.models.venue import Venue
+from app.services.reservation_service import create_reservation_public
+from app.services.settings_service import get_or_create_settings
+
+# Run against a scratch database: the benchmark creates a temporary venue and
+# books it from many threads at once, then deletes what it created.
+
+
+def _slots(db, days_ahead: int, count: int) -> list[tuple[datetime, datetime]]:
+    """`count` one-hour slots inside business hours on a single local date."""
+    settings_row = get_or_create_settings(db)
+    tz = ZoneInfo(get_settings().timezone)
+    day = datetime.now(tz=tz).date() + timedelta(days=days_ahead)
+    start = datetime.combine(day, settings_row.business_hours_start).replace(tzinfo=tz)
+    close = datetime.combine(day, settings_row.business_hours_end).replace(tzinfo=tz)
+    out = []
+    while len(out) < count and start + timedelta(hours=1) <= close:
+        out.append((start, start + timedelta(hours=1)))
+        start += timedelta(hours=1)
+    return out
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Concurrent public bookings against one venue-day")
+    p.add_argument("--threads", type=int, default=16)
+    p.add_argument("--attempts", type=int, default=400)
+    p.add_argument("--slots", type=int, default=8, help="Distinct slots competed for (same venue and date)")
+    p.add_argument("--days-ahead", type=int, default=60)
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+
+    db = SessionLocal()
+    venue = Venue(name=f"bench-{uuid.uuid4().hex[:8]}", active=True)
+    db.add(venue)
+    db.commit()
+    venue_id = venue.id
+    slots = _slots(db, args.days_ahead, args.slots)
+    db.close()
+    if not slots:
+        print("no slots fit in business hours")
+        return 1
+
+    rnd = random.Random(args.seed)
+    plan = [rnd.choice(slots) for _ in range(args.attempts)]
+    outcomes: Counter[str] = Counter()
+    lock = threading.Lock()
+
+    def attempt(i: int) -> None:
+        start_at, end_at = plan[i]
+        session = SessionLocal()
+        try:
+            create_reservation_public(
+                session,
+                venue_id=venue_id,
+                start_at=start_at,
+                end_at=end_at,
+                people_count=2,
+                booking_type="BENCH",
+                banquet_name="",
+                desired_time_text="",
+                customer_name="bench",
+                phone=f"090{i:08d}",
+                email=f"bench{i}@example.invalid",
+                menu_selections=[],
+                consent_version="bench",
+            )
+            key = "created"
+        except HTTPException as e:
+            key = f"{e.status_code} {e.detail}"
+        except Exception as e:
+            key = f"error {type(e).__name__}"
+        finally:
+            session.close()
+        with lock:
+            outcomes[key] += 1
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(attempt, range(args.attempts)))
+    elapsed = time.perf_counter() - t0
+
+    db = SessionLocal()
+    try:
+        created = db.execute(select(Reservation).where(Reservation.venue_id == venue_id, Reservation.status != "CANCELLED")).scalars().all()
+        # Overlaps that slipped through would show up as more than one booking per slot
+        per_slot = Counter((r.start_at, r.end_at) for r in created)
+        double_booked = sum(n - 1 for n in per_slot.values() if n > 1)
+
+        ids = [r.id for r in created]
+        public_ids = [r.public_id for r in created]
+        customer_ids = [r.customer_id for r in created]
+        if ids:
+            db.execute(delete(ReservationAccessToken).where(ReservationAccessToken.reservation_id.in_(ids)))
+            db.execute(delete(AuditLog).where(AuditLog.target_type == "reservation", AuditLog.target_id.in_(public_ids)))
+        db.execute(delete(Reservation).where(Reservation.venue_id == venue_id))
+        db.execute(delete(Venue).where(Venue.id == venue_id))
+        if customer_ids:
+            db.execute(delete(Customer).where(Customer.id.in_(customer_ids)))
+        # Confirmation emails queued for the bench addresses
+        db.execute(delete(EmailOutbox).where(EmailOutbox.to_email.like("bench%@example.invalid")))
+        db.commit()
+    finally:
+        db.close()
+
+    print(f"threads={args.threads} attempts={args.attempts} slots={len(slots)} elapsed={elapsed:.3f}s")
+    print(f"attempts_per_sec={args.attempts / elapsed:.1f} bookings_per_sec={outcomes['created'] / elapsed:.1f}")
+    for key, n in sorted(outcomes.items()):
+        print(f"  {key}: {n}")
+    print(f"double_booked={double_booked}")
+    return 1 if double_booked else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import get_settings
+from app.services.mailer import _message
+from app.services.smtp_pool import SmtpPool, connect_from_settings
+
+# Compares one-connection-per-message delivery (the old send_email) with
+# pooled sessions and send_many(). Without --relay, a local aiosmtpd
+# stand-in is started (pip install aiosmtpd); --latency-ms simulates a
+# remote relay by delaying the greeting of every new connection.
+
+
+class _Sink:
+    def __init__(self) -> None:
+        self.received = 0
+        self._lock = threading.Lock()
+
+    async def handle_DATA(self, server, session, envelope):
+        with self._lock:
+            self.received += 1
+        return "250 OK"
+
+
+def _start_standin(port: int, latency_ms: int):
+    try:
+        from aiosmtpd.controller import Controller
+        from aiosmtpd.smtp import SMTP
+    except ImportError:
+        raise SystemExit("aiosmtpd is not installed; pip install aiosmtpd or pass --relay")
+
+    sink = _Sink()
+
+    class _SlowGreeting(SMTP):
+        async def _handle_client(self):
+            if latency_ms:
+                import asyncio
+
+                await asyncio.sleep(latency_ms / 1000)
+            await super()._handle_client()
+
+    class _Controller(Controller):
+        def factory(self):
+            return _SlowGreeting(self.handler)
+
+    ctl = _Controller(sink, hostname="127.0.0.1", port=port)
+    ctl.start()
+    return ctl, sink
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="SMTP throughput: per-message connections vs pooled send_many")
+    p.add_argument("--messages", type=int, default=500)
+    p.add_argument("--threads", type=int, default=4)
+    p.add_argument("--batch", type=int, default=50, help="Messages per send_many call")
+    p.add_argument("--pool-size", type=int, default=4)
+    p.add_argument("--relay", action="store_true", help="Use the configured SMTP relay instead of a local stand-in")
+    p.add_argument("--port", type=int, default=10025)
+    p.add_argument("--latency-ms", type=int, default=20, help="Stand-in connection setup delay")
+    args = p.parse_args()
+
+    settings = get_settings()
+    ctl = sink = None
+    if not args.relay:
+        ctl, sink = _start_standin(args.port, args.latency_ms)
+        settings.smtp_host, settings.smtp_port = "127.0.0.1", args.port
+        settings.smtp_username, settings.smtp_use_tls = "", False
+
+    messages = [_message(f"bench{i}@example.invalid", "bench", "bench") for i in range(args.messages)]
+
+    def one_per_connection(msg) -> None:
+        server = connect_from_settings()
+        try:
+            server.send_message(msg)
+        finally:
+            server.quit()
+
+    try:
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as ex:
+            list(ex.map(one_per_connection, messages))
+        t_single = time.perf_counter() - t0
+
+        pool = SmtpPool(connect=connect_from_settings, max_size=args.pool_size, idle_seconds=60, health_check_seconds=15)
+        batches = [messages[i : i + args.batch] for i in range(0, len(messages), args.batch)]
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as ex:
+            results = [r for rs in ex.map(pool.send_many, batches) for r in rs]
+        t_pool = time.perf_counter() - t0
+        pool.close()
+    finally:
+        if ctl is not None:
+            ctl.stop()
+
+    failed = sum(1 for r in results if r is not None)
+    print(f"messages={args.messages} threads={args.threads} batch={args.batch} pool_size={args.pool_size}")
+    print(f"per_connection: {t_single:.3f}s ({args.messages / t_single:.0f} msg/s)")
+    print(f"pooled_send_many: {t_pool:.3f}s ({args.messages / t_pool:.0f} msg/s) connects={pool.connects} failed={failed}")
+    if sink is not None:
+        print(f"standin_received={sink.received} expected={2 * args.messages}")
+        return 0 if sink.received == 2 * args.messages and not failed else 1
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
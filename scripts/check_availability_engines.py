@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.venue import Venue
+from app.services import venue_day_slots
+from app.services.availability_service import _compute_statuses
+from app.services.rule_compiler import first_stable_date
+from app.services.settings_service import get_or_create_settings
+
+# Parity check between the availability engines, against the python engine as
+# the reference. Exits 1 on any mismatch, so it can run unattended (CI against
+# a seeded database, or cron against production). Every engine that is
+# checked must run: the sql engine needs PostgreSQL, and an engine that
+# cannot run (other database, query error) fails the check rather than being
+# skipped; leave it out with --engines instead. The read_model is compared
+# only on the dates it serves.
+
+ENGINES = ("sql", "read_model")
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Compare public availability from the python, sql and read_model engines")
+    p.add_argument("--from-date", type=date.fromisoformat, default=None, help="YYYY-MM-DD (default: today)")
+    p.add_argument("--days", type=int, default=90)
+    p.add_argument("--engines", default=None, help="Comma-separated engines to check against python (default: sql,read_model)")
+    p.add_argument("--limit", type=int, default=20, help="Mismatches to print per engine")
+    args = p.parse_args()
+
+    from_date = args.from_date or datetime.now(tz=ZoneInfo(get_settings().timezone)).date()
+    to_date = from_date + timedelta(days=args.days - 1)
+
+    db = SessionLocal()
+    try:
+        if args.engines:
+            engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+            unknown = [e for e in engines if e not in ENGINES]
+            if unknown:
+                p.error(f"unknown engines: {', '.join(unknown)}")
+        else:
+            engines = list(ENGINES)
+
+        settings_row = get_or_create_settings(db)
+        venue_ids = list(db.execute(select(Venue.id).where(Venue.active == True)).scalars().all())
+        python = _compute_statuses(db, settings_row, venue_ids, from_date, to_date, engine="python")
+
+        failed = False
+        for engine in engines:
+            if engine == "sql":
+                dialect = db.get_bind().dialect.name
+                if dialect != "postgresql":
+                    print(f"sql: FAILED: needs PostgreSQL, database is {dialect}")
+                    failed = True
+                    continue
+                expected = python
+                try:
+                    other = _compute_statuses(db, settings_row, venue_ids, from_date, to_date, engine="sql")
+                except SQLAlchemyError as e:
+                    db.rollback()
+                    print(f"sql: FAILED: {e.__class__.__name__}: {str(e).splitlines()[0]}")
+                    failed = True
+                    continue
+            else:
+                if not venue_day_slots.is_current(settings_row):
+                    print(f"read_model: stale (built for rules_version {settings_row.venue_day_slots_version}, current {settings_row.rules_version or 0})")
+                    failed = True
+                    continue
+                # Nearer dates are always computed live, later ones are not stored
+                first = max(from_date, first_stable_date(db, settings_row))
+                last = min(to_date, venue_day_slots.maintained_window()[1])
+                expected = {k: v for k, v in python.items() if first <= k[1] <= last}
+                other = venue_day_slots.load_statuses(db, venue_ids, first, last) if first <= last else {}
+
+            mismatches = sorted(k for k in expected if expected[k] != other.get(k))
+            for venue_id, d, block in mismatches[: args.limit]:
+                print(f"{engine}: {venue_id} {d} {block}: python={expected[(venue_id, d, block)]} {engine}={other.get((venue_id, d, block))}")
+            print(f"{engine}: slots={len(expected)} mismatches={len(mismatches)}")
+            failed = failed or bool(mismatches)
+        return 1 if failed else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
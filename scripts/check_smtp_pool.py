@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import smtplib
+import socket
+import threading
+import time
+from typing import Callable
+
+from app.services.mailer import _message
+from app.services.smtp_pool import SmtpPool
+
+# Self-checking run of SmtpPool against a local aiosmtpd stand-in on an
+# ephemeral port (pip install aiosmtpd): session reuse, LIFO order of idle
+# sessions, the NOOP health check, reconnect-once after the relay dropped
+# the session, the relay being down, the max_size bound and per-message
+# refusals. Needs no relay or settings; exits 1 if any check fails.
+
+
+class _Relay:
+    """aiosmtpd stand-in that can be stopped/restarted and made to misbehave."""
+
+    def __init__(self) -> None:
+        s = socket.socket()
+        s.bind(("127.0.0.1", 0))
+        self.port = s.getsockname()[1]
+        s.close()
+        self.received = 0
+        self.noop_status = "250 OK"
+        self._lock = threading.Lock()
+        self._controller = None
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("reject"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_NOOP(self, server, session, envelope, arg):
+        return self.noop_status
+
+    async def handle_DATA(self, server, session, envelope):
+        with self._lock:
+            self.received += 1
+        return "250 OK"
+
+    def start(self) -> None:
+        from aiosmtpd.controller import Controller
+
+        self._controller = Controller(self, hostname="127.0.0.1", port=self.port)
+        self._controller.start()
+
+    def stop(self) -> None:
+        # Drops every open session, like a relay restart
+        if self._controller is not None:
+            self._controller.stop()
+            self._controller = None
+
+    def connect(self) -> smtplib.SMTP:
+        return smtplib.SMTP("127.0.0.1", self.port, timeout=5)
+
+
+def _msg(to: str = "guest@example.invalid"):
+    return _message(to, "check", "check")
+
+
+def _pool(relay: _Relay, *, max_size: int = 2, idle_seconds: float = 60, health_check_seconds: float = 60) -> SmtpPool:
+    return SmtpPool(connect=relay.connect, max_size=max_size, idle_seconds=idle_seconds, health_check_seconds=health_check_seconds)
+
+
+def _expect(condition: bool, what: str) -> None:
+    if not condition:
+        raise AssertionError(what)
+
+
+def check_reuse(relay: _Relay) -> None:
+    pool = _pool(relay)
+    before = relay.received
+    for _ in range(3):
+        pool.send(_msg())
+    _expect(pool.connects == 1, f"connects={pool.connects}, want 1")
+    _expect(relay.received - before == 3, f"received {relay.received - before}, want 3")
+    pool.close()
+
+
+def check_lifo(relay: _Relay) -> None:
+    pool = _pool(relay, max_size=3)
+    cms = [pool.session() for _ in range(3)]
+    sessions = [cm.__enter__() for cm in cms]
+    for cm in cms:
+        cm.__exit__(None, None, None)
+    with pool.session() as sess:
+        _expect(sess is sessions[-1], "idle session handed out is not the most recently returned one")
+    _expect(pool.connects == 3, f"connects={pool.connects}, want 3")
+    pool.close()
+
+
+def check_health_check(relay: _Relay) -> None:
+    pool = _pool(relay, health_check_seconds=0)
+    pool.send(_msg())
+    relay.noop_status = "421 Service closing"
+    try:
+        pool.send(_msg())
+    finally:
+        relay.noop_status = "250 OK"
+    _expect(pool.health_check_failures == 1, f"health_check_failures={pool.health_check_failures}, want 1")
+    _expect(pool.connects == 2, f"connects={pool.connects}, want 2 (unhealthy session replaced)")
+    _expect(pool.reconnects == 0, f"reconnects={pool.reconnects}, want 0")
+    pool.close()
+
+
+def check_idle_expiry(relay: _Relay) -> None:
+    pool = _pool(relay, idle_seconds=0)
+    pool.send(_msg())
+    time.sleep(0.01)
+    pool.send(_msg())
+    _expect(pool.connects == 2, f"connects={pool.connects}, want 2 (idle session closed)")
+    pool.close()
+
+
+def check_reconnect(relay: _Relay) -> None:
+    pool = _pool(relay)
+    pool.send(_msg())
+    relay.stop()
+    relay.start()
+    before = relay.received
+    results = pool.send_many([_msg(), _msg()])
+    _expect(results == [None, None], f"results={results}")
+    _expect(pool.reconnects == 1, f"reconnects={pool.reconnects}, want 1")
+    _expect(relay.received - before == 2, f"received {relay.received - before}, want 2")
+    pool.close()
+
+
+def check_relay_down(relay: _Relay) -> None:
+    pool = _pool(relay)
+    pool.send(_msg())
+    relay.stop()
+    try:
+        t0 = time.perf_counter()
+        stale = pool.send_many([_msg(), _msg(), _msg()])
+        fresh = _pool(relay).send_many([_msg(), _msg()])
+        elapsed = time.perf_counter() - t0
+    finally:
+        relay.start()
+    _expect(len(stale) == 3 and all(isinstance(e, OSError) for e in stale), f"stale session results={stale}")
+    _expect(len(fresh) == 2 and all(isinstance(e, OSError) for e in fresh), f"new pool results={fresh}")
+    _expect(pool.reconnects == 0 and pool.failed == 3, f"reconnects={pool.reconnects} failed={pool.failed}")
+    _expect(elapsed < 2, f"took {elapsed:.1f}s, want fail fast")
+    # The pool recovers once the relay is back
+    _expect(pool.send_many([_msg()]) == [None], "no recovery after the relay came back")
+    pool.close()
+
+
+def check_max_size(relay: _Relay) -> None:
+    pool = _pool(relay, max_size=2)
+    held = [pool.session() for _ in range(2)]
+    for cm in held:
+        cm.__enter__()
+    waiter = threading.Thread(target=pool.send, args=(_msg(),))
+    waiter.start()
+    waiter.join(0.3)
+    _expect(waiter.is_alive(), "third sender did not wait for a free session")
+    _expect(pool.connects == 2, f"connects={pool.connects}, want 2 while full")
+    held[0].__exit__(None, None, None)
+    waiter.join(5)
+    _expect(not waiter.is_alive(), "waiting sender did not get the released session")
+    _expect(pool.connects == 2, f"connects={pool.connects}, want 2 (released session reused)")
+    held[1].__exit__(None, None, None)
+    pool.close()
+
+
+def check_message_refusal(relay: _Relay) -> None:
+    pool = _pool(relay)
+    results = pool.send_many([_msg(), _msg("reject@example.invalid"), _msg()])
+    _expect(results[0] is None and results[2] is None, f"results={results}")
+    _expect(isinstance(results[1], smtplib.SMTPRecipientsRefused), f"refused message result={results[1]!r}")
+    _expect(pool.connects == 1 and pool.reconnects == 0, f"connects={pool.connects} reconnects={pool.reconnects}, session should survive")
+    pool.close()
+
+
+CHECKS: list[tuple[str, Callable[[_Relay], None]]] = [
+    ("reuse", check_reuse),
+    ("lifo", check_lifo),
+    ("health_check", check_health_check),
+    ("idle_expiry", check_idle_expiry),
+    ("reconnect", check_reconnect),
+    ("relay_down", check_relay_down),
+    ("max_size", check_max_size),
+    ("message_refusal", check_message_refusal),
+]
+
+
+def main() -> int:
+    try:
+        import aiosmtpd  # noqa: F401
+    except ImportError:
+        raise SystemExit("aiosmtpd is not installed; pip install aiosmtpd")
+
+    relay = _Relay()
+    relay.start()
+    failed = 0
+    try:
+        for name, check in CHECKS:
+            try:
+                check(relay)
+                print(f"{name}: ok")
+            except Exception as e:
+                failed += 1
+                print(f"{name}: FAIL {e!r}")
+    finally:
+        relay.stop()
+    print(f"checks={len(CHECKS)} failed={failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
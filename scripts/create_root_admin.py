@@ -4,10 +4,10 @@ import argparse
 
 from sqlalchemy import select
 
-from app.core.security import hash_password
 from app.db.session import SessionLocal
 from app.models.user import User
 from app.services.auth_service import normalize_email
+from app.services.password_hashing import password_hasher
 
 
 def main() -> int:
@@ -24,14 +24,14 @@ def main() -> int:
     try:
         u = db.execute(select(User).where(User.email == email)).scalar_one_or_none()
         if u is None:
-            u = User(email=email, name=args.name, hashed_password=hash_password(args.password), is_active=True, is_root_admin=True)
+            u = User(email=email, name=args.name, hashed_password=password_hasher.hash(args.password), is_active=True, is_root_admin=True)
             db.add(u)
             db.commit()
             print(f"Created root admin: {u.email}")
             return 0
 
         u.name = args.name
-        u.hashed_password = hash_password(args.password)
+        u.hashed_password = password_hasher.hash(args.password)
         u.is_active = True
         u.is_root_admin = True
         db.commit()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import delete, func, select, update
+
+from app.db.session import SessionLocal
+from app.models.customer import EMAIL_KEY_WHERE, PHONE_KEY_WHERE, Customer
+from app.models.reservation import Reservation
+from app.services.audit_service import write_audit_log
+
+# One-off merge of customers that share an identity key (phone_hash, or
+# email_hash for customers without a phone), so the partial unique indexes
+# used by the customer upsert can be created. The oldest row of each group
+# keeps its id and takes the name/email of the most recently updated one;
+# reservations of the others are moved to it before they are deleted.
+
+
+def _duplicate_groups(db, key, key_where) -> list[list[Customer]]:
+    keys = db.execute(select(key).where(key_where).group_by(key).having(func.count() > 1)).scalars().all()
+    groups = []
+    for value in keys:
+        rows = db.execute(select(Customer).where(key == value, key_where).order_by(Customer.created_at, Customer.id)).scalars().all()
+        groups.append(list(rows))
+    return groups
+
+
+def _merge(db, rows: list[Customer]) -> int:
+    survivor, duplicates = rows[0], rows[1:]
+    latest = max(rows, key=lambda c: c.updated_at)
+    survivor.name = latest.name
+    if latest.email_hash:
+        survivor.email_normalized = latest.email_normalized
+        survivor.email_hash = latest.email_hash
+        survivor.email_masked = latest.email_masked
+
+    dup_ids = [c.id for c in duplicates]
+    moved = db.execute(update(Reservation).where(Reservation.customer_id.in_(dup_ids)).values(customer_id=survivor.id)).rowcount
+    db.execute(delete(Customer).where(Customer.id.in_(dup_ids)))
+    write_audit_log(
+        db,
+        actor_user_id=None,
+        action_type="CUSTOMER_MERGE",
+        target_type="customer",
+        target_id=survivor.id,
+        summary=f"Merged {len(dup_ids)} duplicate customers",
+        diff_json={"merged_ids": dup_ids, "reservations_moved": moved},
+        commit=False,
+    )
+    return len(dup_ids)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Merge duplicate customers sharing a phone (or, without a phone, email) hash")
+    p.add_argument("--dry-run", action="store_true", help="Report duplicate groups without changing anything")
+    args = p.parse_args()
+
+    db = SessionLocal()
+    try:
+        merged = groups = 0
+        for key, key_where in ((Customer.phone_hash, PHONE_KEY_WHERE), (Customer.email_hash, EMAIL_KEY_WHERE)):
+            for rows in _duplicate_groups(db, key, key_where):
+                groups += 1
+                if args.dry_run:
+                    merged += len(rows) - 1
+                    print(f"{key.key}: keep {rows[0].id}, merge {[c.id for c in rows[1:]]}")
+                    continue
+                merged += _merge(db, rows)
+                # One transaction per group keeps locks short on a live table
+                db.commit()
+        print(f"groups={groups} merged_customers={merged}{' (dry run)' if args.dry_run else ''}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
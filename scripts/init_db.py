@@ -3,6 +3,7 @@ from __future__ import annotations
 import sys
 
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 
 from app.db.base import Base
 from app.db.session import engine, SessionLocal
@@ -65,6 +66,44 @@ def main() -> int:
             # likely already exists
             pass
 
+    # Columns added after the initial release (create_all does not alter existing tables)
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE app_settings ADD COLUMN IF NOT EXISTS rules_version INTEGER NOT NULL DEFAULT 0"))
+        conn.execute(text("ALTER TABLE app_settings ADD COLUMN IF NOT EXISTS venue_day_slots_version INTEGER NOT NULL DEFAULT 0"))
+        # Price snapshot; fill existing rows with scripts/backfill_price_snapshot.py
+        conn.execute(text("ALTER TABLE reservations ADD COLUMN IF NOT EXISTS total_price INTEGER NOT NULL DEFAULT 0"))
+        conn.execute(text("ALTER TABLE reservation_menu_selections ADD COLUMN IF NOT EXISTS name VARCHAR(255) NOT NULL DEFAULT ''"))
+        conn.execute(text("ALTER TABLE reservation_menu_selections ADD COLUMN IF NOT EXISTS unit_price INTEGER NOT NULL DEFAULT 0"))
+        conn.execute(text("ALTER TABLE reservation_access_tokens ADD COLUMN IF NOT EXISTS revoked_at TIMESTAMPTZ"))
+        conn.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS permissions_version INTEGER NOT NULL DEFAULT 0"))
+        conn.execute(text("ALTER TABLE email_outbox ADD COLUMN IF NOT EXISTS secret_enc TEXT NOT NULL DEFAULT ''"))
+        conn.execute(text("ALTER TABLE email_outbox ADD COLUMN IF NOT EXISTS expires_at TIMESTAMPTZ"))
+        conn.execute(text("ALTER TABLE slot_holds ADD COLUMN IF NOT EXISTS client_ip_hash VARCHAR(64) NOT NULL DEFAULT ''"))
+        conn.execute(text("ALTER TABLE slot_holds ADD COLUMN IF NOT EXISTS phone_hash VARCHAR(64) NOT NULL DEFAULT ''"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_slot_holds_client_ip_hash ON slot_holds (client_ip_hash)"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_slot_holds_phone_hash ON slot_holds (phone_hash)"))
+
+    # Range index for the "sql" availability engine's overlap probes on calendar blocks
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_calendar_blocks_venue_range "
+                "ON calendar_blocks USING gist (venue_id, tstzrange(start_at, end_at, '[)'))"
+            )
+        )
+
+    # Customer identity keys for the upsert (create_all only adds them to new tables)
+    from app.models.customer import Customer
+
+    try:
+        with engine.begin() as conn:
+            for index in Customer.__table__.indexes:
+                if index.unique:
+                    index.create(bind=conn, checkfirst=True)
+    except IntegrityError:
+        print("Duplicate customers found: run scripts/dedup_customers.py, then init_db again", file=sys.stderr)
+        return 1
+
     # Seed permissions and default settings row
     from app.models.permission import Permission
     from app.models.settings import AppSettings
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+
+from sqlalchemy import text
+
+from app.db.base import Base
+from app.db.session import engine
+from app.models._ids import UUIDKey
+
+# Converts the varchar(36) id / foreign key columns of an existing database
+# to native uuid. Existing uuid4 values are kept as they are; rows inserted
+# afterwards get time-ordered uuid7 ids from the models. Runs in a single
+# transaction and takes ACCESS EXCLUSIVE locks while tables are rewritten,
+# so run it in a maintenance window.
+
+_FKS_SQL = text(
+    """
+    SELECT conrelid::regclass::text AS table_name, conname, pg_get_constraintdef(oid) AS definition
+    FROM pg_constraint
+    WHERE contype = 'f'
+      AND (conrelid::regclass::text = ANY(:tables) OR confrelid::regclass::text = ANY(:tables))
+    """
+)
+
+_VARCHAR_COLUMNS_SQL = text(
+    """
+    SELECT table_name, column_name
+    FROM information_schema.columns
+    WHERE table_schema = current_schema() AND data_type = 'character varying'
+    """
+)
+
+
+def _uuid_columns() -> dict[str, list[str]]:
+    columns: dict[str, list[str]] = defaultdict(list)
+    for table in Base.metadata.sorted_tables:
+        for col in table.columns:
+            if isinstance(col.type, UUIDKey):
+                columns[table.name].append(col.name)
+    return columns
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Convert varchar id columns to native uuid")
+    p.add_argument("--dry-run", action="store_true", help="Print the statements without running them")
+    args = p.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print(f"nothing to do on {engine.dialect.name}: only PostgreSQL has a native uuid type")
+        return 0
+
+    with engine.begin() as conn:
+        varchar = {tuple(r) for r in conn.execute(_VARCHAR_COLUMNS_SQL).all()}
+        pending = {
+            table: [c for c in cols if (table, c) in varchar]
+            for table, cols in _uuid_columns().items()
+        }
+        pending = {t: cols for t, cols in pending.items() if cols}
+        if not pending:
+            print("all id columns are already uuid")
+            return 0
+
+        # Foreign keys pin both sides to the same type; drop and re-create them around the change
+        fks = conn.execute(_FKS_SQL, {"tables": list(pending)}).all()
+        statements = [f'ALTER TABLE {fk.table_name} DROP CONSTRAINT "{fk.conname}"' for fk in fks]
+        for table, cols in pending.items():
+            # One ALTER per table so each table is rewritten once
+            alters = ", ".join(f"ALTER COLUMN {c} TYPE uuid USING {c}::uuid" for c in cols)
+            statements.append(f"ALTER TABLE {table} {alters}")
+        statements += [f'ALTER TABLE {fk.table_name} ADD CONSTRAINT "{fk.conname}" {fk.definition}' for fk in fks]
+
+        for stmt in statements:
+            print(stmt)
+            if not args.dry_run:
+                conn.execute(text(stmt))
+        if args.dry_run:
+            return 0
+
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+    print(f"converted {sum(len(c) for c in pending.values())} columns in {len(pending)} tables")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
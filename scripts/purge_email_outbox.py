@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from app.db.session import SessionLocal
+from app.services.email_outbox import purge_finished
+
+
+def main() -> int:
+    db = SessionLocal()
+    try:
+        n = purge_finished(db)
+        print(f"purged_email_outbox: {n}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from app.db.session import SessionLocal
+from app.services.idempotency import purge_expired
+
+
+def main() -> int:
+    db = SessionLocal()
+    try:
+        n = purge_expired(db)
+        print(f"purged_idempotency_keys: {n}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
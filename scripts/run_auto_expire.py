@@ -8,6 +8,7 @@ from sqlalchemy import select
 from app.db.session import SessionLocal
 from app.models.reservation import Reservation
 from app.services.audit_service import write_audit_log
+from app.services.availability_events import interval_changed
 from app.services.settings_service import get_or_create_settings
 
 
@@ -32,6 +33,7 @@ def main() -> int:
             r.cancel_reason = "AUTO_EXPIRE"
             r.cancelled_at = datetime.now(tz=ZoneInfo("UTC"))
             db.commit()
+            interval_changed(db, r.venue_id, r.start_at, r.end_at)
             write_audit_log(
                 db,
                 actor_user_id=None,
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import argparse
+import signal
+import threading
+
+from app.db.session import SessionLocal
+from app.services.email_outbox import deliver_batch, run_workers
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Deliver queued email from email_outbox")
+    p.add_argument("--workers", type=int, default=2)
+    p.add_argument("--poll-seconds", type=float, default=2.0)
+    p.add_argument("--once", action="store_true", help="Deliver one batch and exit (for cron)")
+    args = p.parse_args()
+
+    if args.once:
+        db = SessionLocal()
+        try:
+            print(f"delivered_batch: {deliver_batch(db)}")
+            return 0
+        finally:
+            db.close()
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    run_workers(SessionLocal, workers=args.workers, poll_seconds=args.poll_seconds, stop=stop)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from app.db.session import SessionLocal
+from app.services.hold_service import sweep_expired_holds
+
+
+def main() -> int:
+    db = SessionLocal()
+    try:
+        n = sweep_expired_holds(db)
+        print(f"expired_holds: {n}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
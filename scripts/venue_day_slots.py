@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import argparse
+from datetime import date
+
+from app.db.session import SessionLocal
+from app.services.venue_day_slots import check_consistency, rebuild, sync
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Maintain the venue_day_slots read model")
+    # sync: rebuild after rule/settings changes (run from cron); rebuild: unconditional, for a range
+    p.add_argument("command", choices=["sync", "rebuild", "check"])
+    p.add_argument("--from-date", type=date.fromisoformat, default=None, help="YYYY-MM-DD (default: start of maintained window)")
+    p.add_argument("--to-date", type=date.fromisoformat, default=None, help="YYYY-MM-DD (default: end of maintained window)")
+    p.add_argument("--limit", type=int, default=20, help="Mismatches to print for check")
+    args = p.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "sync":
+            n = sync(db)
+            if n is None:
+                print("sync already running elsewhere")
+                return 0
+            print(f"rebuilt_rows={n}")
+            return 0
+
+        if args.command == "rebuild":
+            n = rebuild(db, from_date=args.from_date, to_date=args.to_date)
+            print(f"rebuilt_rows={n}")
+            return 0
+
+        mismatches = check_consistency(db, from_date=args.from_date, to_date=args.to_date)
+        for m in mismatches[: args.limit]:
+            print(f"{m['venue_id']} {m['date']} {m['block']}: stored={m['stored']} expected={m['expected']} {m['reason']}")
+        print(f"mismatches={len(mismatches)}")
+        return 1 if mismatches else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Any, Mapping
 
 from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.audit_log import AuditLog
@@ -48,7 +49,9 @@ def write_audit_log(
     summary: str = "",
     diff_json: Mapping[str, Any] | None = None,
     request: Request | None = None,
+    commit: bool = True,
 ) -> None:
+    """Record an audit entry; pass commit=False to make it part of the caller's transaction."""
     ip = ""
     ua = ""
     if request is not None:
@@ -66,4 +69,9 @@ def write_audit_log(
         user_agent=ua,
     )
     db.add(log)
-    db.commit()
+    if commit:
+        db.commit()
+
+
+async def write_audit_log_async(db: AsyncSession, **kwargs: Any) -> None:
+    await db.run_sync(lambda session: write_audit_log(session, **kwargs))
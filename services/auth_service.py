@@ -1,21 +1,24 @@
 from __future__ import annotations
 
 import hashlib
-import random
+import secrets
 import string
 from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.core.security import hash_password, verify_password
+from app.core.security import hash_otp, verify_otp
+from app.models._ids import new_id
 from app.models.auth_event import AuthEvent
+from app.models.email_outbox import SECRET_MARK
 from app.models.login_challenge import LoginChallenge
 from app.models.role import RolePermission
 from app.models.user import User, UserRole
-from app.services.mailer import send_email
+from app.services.email_outbox import enqueue_email
+from app.services.password_hashing import password_hasher
 
 
 def normalize_phone(phone: str) -> str:
@@ -56,16 +59,8 @@ def hash_pii(value: str) -> str:
     return hashlib.sha256(salted).hexdigest()
 
 
-def generate_public_id() -> str:
-    # Example: R-20260116-8F3K2
-    now = datetime.now(timezone.utc)
-    date_part = now.strftime("%Y%m%d")
-    rand = "".join(random.choices(string.ascii_uppercase + string.digits, k=5))
-    return f"R-{date_part}-{rand}"
-
-
 def generate_otp_code(length: int = 6) -> str:
-    return "".join(random.choices(string.digits, k=length))
+    return "".join(secrets.choice(string.digits) for _ in range(length))
 
 
 def get_user_permissions(db: Session, user_id: str) -> list[str]:
@@ -89,32 +84,28 @@ def create_login_challenge(db: Session, *, email: str, password: str, ip: str =
         db.commit()
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    if not verify_password(password, user.hashed_password):
+    if not password_hasher.verify(password, user.hashed_password):
         db.add(AuthEvent(user_id=user.id, event_type="LOGIN_FAIL", ip_address=ip, user_agent=user_agent, failure_reason="bad_password"))
         db.commit()
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     # Password OK: issue 2FA challenge
     code = generate_otp_code(6)
-    code_hash = hash_password(code)
+    challenge_id = new_id()
+    code_hash = password_hasher.hash(code) if get_settings().otp_hash_mode == "bcrypt" else hash_otp(challenge_id, code)
 
     expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
 
-    challenge = LoginChallenge(user_id=user.id, code_hash=code_hash, expires_at=expires_at, attempts=0, max_attempts=5, is_used=False)
+    challenge = LoginChallenge(id=challenge_id, user_id=user.id, code_hash=code_hash, expires_at=expires_at, attempts=0, max_attempts=5, is_used=False)
     db.add(challenge)
     db.add(AuthEvent(user_id=user.id, event_type="LOGIN_2FA_SENT", ip_address=ip, user_agent=user_agent, failure_reason=""))
-    db.commit()
 
-    # Send email
+    # Queued with the challenge; delivered by the outbox worker
     subject = "Your login code"
-    body = f"Your one-time login code is: {code}\n\nThis code expires in 10 minutes."
-    try:
-        send_email(user.email, subject, body)
-    except Exception as e:
-        # If mail fails, invalidate the challenge
-        challenge.is_used = True
-        db.commit()
-        raise HTTPException(status_code=500, detail="Failed to send 2FA code") from e
+    body = f"Your one-time login code is: {SECRET_MARK}\n\nThis code expires in 10 minutes."
+    # Not worth delivering once the code has expired
+    enqueue_email(db, to_email=user.email, subject=subject, body=body, secret=code, expires_at=expires_at)
+    db.commit()
 
     return challenge.id
 
@@ -132,21 +123,50 @@ def verify_login_challenge(db: Session, *, challenge_id: str, code: str, ip: str
         db.commit()
         raise HTTPException(status_code=401, detail="Invalid or expired challenge")
 
-    if challenge.attempts >= challenge.max_attempts:
-        challenge.is_used = True
+    # Reserve the attempt before checking the code: concurrent guesses each
+    # take one of max_attempts, instead of all passing a stale count
+    reserved = db.execute(
+        update(LoginChallenge)
+        .where(
+            LoginChallenge.id == challenge_id,
+            LoginChallenge.attempts < LoginChallenge.max_attempts,
+            LoginChallenge.is_used.is_(False),
+        )
+        .values(attempts=LoginChallenge.attempts + 1)
+        .returning(LoginChallenge.user_id, LoginChallenge.code_hash)
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+    db.commit()
+    if reserved is None:
+        db.execute(
+            update(LoginChallenge)
+            .where(LoginChallenge.id == challenge_id)
+            .values(is_used=True)
+            .execution_options(synchronize_session=False)
+        )
         db.add(AuthEvent(user_id=challenge.user_id, event_type="LOGIN_FAIL", ip_address=ip, user_agent=user_agent, failure_reason="too_many_attempts"))
         db.commit()
         raise HTTPException(status_code=401, detail="Too many attempts")
+    user_id, code_hash = reserved
 
-    if not verify_password(code, challenge.code_hash):
-        challenge.attempts += 1
-        db.add(AuthEvent(user_id=challenge.user_id, event_type="LOGIN_FAIL", ip_address=ip, user_agent=user_agent, failure_reason="bad_2fa_code"))
+    if not verify_otp(challenge_id, code, code_hash):
+        db.add(AuthEvent(user_id=user_id, event_type="LOGIN_FAIL", ip_address=ip, user_agent=user_agent, failure_reason="bad_2fa_code"))
         db.commit()
         raise HTTPException(status_code=401, detail="Invalid code")
 
-    # Success
-    challenge.is_used = True
-    user = db.get(User, challenge.user_id)
+    # Success: only one request may consume the challenge
+    consumed = db.execute(
+        update(LoginChallenge)
+        .where(LoginChallenge.id == challenge_id, LoginChallenge.is_used.is_(False))
+        .values(is_used=True)
+        .returning(LoginChallenge.id)
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+    if consumed is None:
+        db.add(AuthEvent(user_id=user_id, event_type="LOGIN_FAIL", ip_address=ip, user_agent=user_agent, failure_reason="invalid_challenge"))
+        db.commit()
+        raise HTTPException(status_code=401, detail="Invalid or expired challenge")
+    user = db.get(User, user_id)
     if not user:
         db.add(AuthEvent(user_id=None, event_type="LOGIN_FAIL", ip_address=ip, user_agent=user_agent, failure_reason="user_missing"))
         db.commit()
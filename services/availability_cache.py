@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import threading
+import time as _time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from app.core.config import get_settings
+
+
+class AvailabilityCache:
+    """In-process LRU of public availability statuses keyed by (venue_id, local date, block).
+
+    Writers invalidate the venue-days they touch. Every invalidation bumps
+    `epoch`; a reader records the epoch before loading from the DB and
+    put_many() drops its results if a write happened in between, so a slow
+    reader can never re-insert data that a concurrent write made stale.
+    Entries also expire after `ttl_seconds` to bound staleness from writes
+    made by other processes.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.epoch = 0
+        self.rules_version: int | None = None
+        self._entries: OrderedDict[tuple[str, date, str], tuple[str, float]] = OrderedDict()
+        self._blocks_by_day: dict[tuple[str, date], set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, venue_id: str, day: date, block: str) -> str | None:
+        key = (venue_id, day, block)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or _time.monotonic() - entry[1] > self.ttl_seconds:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put_many(self, statuses: dict[tuple[str, date, str], str], epoch: int) -> None:
+        now = _time.monotonic()
+        with self._lock:
+            if epoch != self.epoch:
+                return
+            for key, status in statuses.items():
+                self._entries[key] = (status, now)
+                self._entries.move_to_end(key)
+                self._blocks_by_day.setdefault((key[0], key[1]), set()).add(key[2])
+            while len(self._entries) > self.max_entries:
+                key, _ = self._entries.popitem(last=False)
+                self._forget_block(key)
+                self.evictions += 1
+
+    def _forget_block(self, key: tuple[str, date, str]) -> None:
+        blocks = self._blocks_by_day.get((key[0], key[1]))
+        if blocks is not None:
+            blocks.discard(key[2])
+            if not blocks:
+                del self._blocks_by_day[(key[0], key[1])]
+
+    def _remove(self, key: tuple[str, date, str]) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._forget_block(key)
+
+    def invalidate_venue_days(self, venue_id: str, days) -> None:
+        with self._lock:
+            self.epoch += 1
+            self.invalidations += 1
+            for d in days:
+                for block in list(self._blocks_by_day.get((venue_id, d), ())):
+                    self._remove((venue_id, d, block))
+
+    def invalidate_venue(self, venue_id: str) -> None:
+        with self._lock:
+            self.epoch += 1
+            self.invalidations += 1
+            for key in [k for k in self._entries if k[0] == venue_id]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.epoch += 1
+            self.invalidations += 1
+            self._entries.clear()
+            self._blocks_by_day.clear()
+
+    def sync_rules_version(self, version: int) -> None:
+        """Drop everything when another worker changed booking rules."""
+        if self.rules_version != version:
+            self.clear()
+            self.rules_version = version
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_settings = get_settings()
+availability_cache = AvailabilityCache(
+    max_entries=_settings.availability_cache_max_entries,
+    ttl_seconds=_settings.availability_cache_ttl_seconds,
+)
+
+
+def local_dates_between(start_at: datetime, end_at: datetime) -> list[date]:
+    """Local dates whose blocks may overlap [start_at, end_at].
+
+    Includes the day before the start, since a block window may run past
+    midnight into the next calendar day.
+    """
+    tz = ZoneInfo(get_settings().timezone)
+    first = start_at.astimezone(tz).date() - timedelta(days=1)
+    last = end_at.astimezone(tz).date()
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def invalidate_interval(venue_id: str, start_at: datetime, end_at: datetime) -> None:
+    availability_cache.invalidate_venue_days(venue_id, local_dates_between(start_at, end_at))
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.services import venue_day_slots
+from app.services.availability_cache import availability_cache, invalidate_interval
+
+# Single notification point for writes that change public availability.
+# Keeps the in-process cache and the venue_day_slots read model in step.
+# Interval changes refresh their days inline; rule and settings changes only
+# bump rules_version, and the read model is rebuilt by a separate sync.
+
+
+def interval_changed(db: Session, venue_id: str, start_at: datetime, end_at: datetime) -> None:
+    """A reservation or calendar block for `venue_id` was added, moved or removed."""
+    invalidate_interval(venue_id, start_at, end_at)
+    if get_settings().venue_day_slots_enabled:
+        venue_day_slots.refresh_interval(db, venue_id, start_at, end_at)
+
+
+def venue_changed(db: Session, venue_id: str) -> None:
+    """Venue-scoped rules changed: every day of `venue_id` may differ.
+
+    The caller bumped rules_version, which marks the venue_day_slots read
+    model stale; it is rebuilt out of band (scripts/venue_day_slots.py sync),
+    not inside the admin request.
+    """
+    availability_cache.invalidate_venue(venue_id)
+
+
+def everything_changed(db: Session) -> None:
+    """Global rules or settings changed (read model: see venue_changed)."""
+    availability_cache.clear()
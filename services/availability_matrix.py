@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from app.services.interval_index import IntervalIndex
+from app.services.rule_compiler import (
+    ClosedDateRanges,
+    CompiledRules,
+    LeadTime,
+    SameDayCutoff,
+    TimeWindow,
+    WeeklyClosed,
+)
+
+# Evaluates settings constraints and compiled booking rules for a whole
+# (days x venues x blocks) grid with array operations instead of one
+# validate_reservation_time call per slot. Conversions to local time are
+# done once per (day, block); every rule is then a mask over those arrays.
+
+
+def _time_us(t: time) -> int:
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000 + t.microsecond
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=ZoneInfo("UTC"))
+_US = timedelta(microseconds=1)
+
+
+def _epoch_us(dt: datetime) -> int:
+    return (dt - _EPOCH) // _US
+
+
+class SlotGrid:
+    """Per (day, block) slot bounds in UTC epoch microseconds plus local-time features."""
+
+    def __init__(self, *, from_date: date, to_date: date, windows: list[tuple[time, time]], tz: ZoneInfo) -> None:
+        days = (to_date - from_date).days + 1
+        self.dates = [from_date + timedelta(days=i) for i in range(days)]
+        self.windows = windows
+
+        utc = ZoneInfo("UTC")
+        self.start_utc: list[list[datetime]] = []
+        self.end_utc: list[list[datetime]] = []
+        start_us, end_us, ls_ord, le_ord, ls_tod, le_tod = [], [], [], [], [], []
+        for d in self.dates:
+            row_start, row_end = [], []
+            for ws, we in windows:
+                s = datetime.combine(d, ws).replace(tzinfo=tz).astimezone(utc)
+                e = datetime.combine(d, we).replace(tzinfo=tz).astimezone(utc)
+                ls, le = s.astimezone(tz), e.astimezone(tz)
+                row_start.append(s)
+                row_end.append(e)
+                start_us.append(_epoch_us(s))
+                end_us.append(_epoch_us(e))
+                ls_ord.append(ls.toordinal())
+                le_ord.append(le.toordinal())
+                ls_tod.append(_time_us(ls.time()))
+                le_tod.append(_time_us(le.time()))
+            self.start_utc.append(row_start)
+            self.end_utc.append(row_end)
+
+        shape = (days, len(windows))
+        self.start_us = np.array(start_us, dtype=np.int64).reshape(shape)
+        self.end_us = np.array(end_us, dtype=np.int64).reshape(shape)
+        self.local_start_ord = np.array(ls_ord, dtype=np.int64).reshape(shape)
+        self.local_end_ord = np.array(le_ord, dtype=np.int64).reshape(shape)
+        self.local_start_tod = np.array(ls_tod, dtype=np.int64).reshape(shape)
+        self.local_end_tod = np.array(le_tod, dtype=np.int64).reshape(shape)
+        # date.toordinal() of any Monday is a multiple of 7 plus 1
+        self.local_weekday = (self.local_start_ord - 1) % 7
+
+
+def _within(grid: SlotGrid, start: time, end: time) -> np.ndarray:
+    lo, hi = _time_us(start), _time_us(end)
+    return (lo <= grid.local_start_tod) & (grid.local_start_tod <= hi) & (lo <= grid.local_end_tod) & (grid.local_end_tod <= hi)
+
+
+def _same_day_open(grid: SlotGrid, cutoff: time, local_now: datetime) -> np.ndarray:
+    if local_now.time() < cutoff:
+        return np.ones(grid.start_us.shape, dtype=bool)
+    return grid.local_start_ord != local_now.toordinal()
+
+
+def _lead_open(grid: SlotGrid, minutes: int, now: datetime) -> np.ndarray:
+    return grid.start_us - _epoch_us(now) >= minutes * 60_000_000
+
+
+def _predicate_open(pred, grid: SlotGrid, now: datetime, local_now: datetime) -> np.ndarray:
+    if isinstance(pred, WeeklyClosed):
+        return ~np.isin(grid.local_weekday, [int(w) for w in pred.weekdays if float(w).is_integer()])
+    if isinstance(pred, ClosedDateRanges):
+        starts = np.array([d.toordinal() for d in pred.starts], dtype=np.int64)
+        ends = np.array([d.toordinal() for d in pred.ends], dtype=np.int64)
+        i = np.searchsorted(starts, grid.local_start_ord, side="right") - 1
+        closed = (i >= 0) & (grid.local_start_ord <= ends[np.maximum(i, 0)])
+        return ~closed
+    if isinstance(pred, TimeWindow):
+        return _within(grid, pred.start, pred.end)
+    if isinstance(pred, SameDayCutoff):
+        return _same_day_open(grid, pred.cutoff, local_now)
+    if isinstance(pred, LeadTime):
+        return _lead_open(grid, pred.minutes, now)
+    raise TypeError(f"Unsupported predicate: {type(pred).__name__}")
+
+
+def settings_open_mask(grid: SlotGrid, settings_row, now: datetime, tz: ZoneInfo) -> np.ndarray:
+    """Vectorized equivalent of reservation_service._apply_settings_constraints."""
+    local_now = now.astimezone(tz)
+    return (
+        (grid.start_us < grid.end_us)
+        & (grid.start_us >= _epoch_us(now))
+        & (grid.local_start_ord == grid.local_end_ord)
+        & _within(grid, settings_row.business_hours_start, settings_row.business_hours_end)
+        & _same_day_open(grid, settings_row.same_day_cutoff, local_now)
+        & _lead_open(grid, settings_row.lead_time_minutes, now)
+    )
+
+
+def rules_open_matrix(
+    grid: SlotGrid,
+    *,
+    settings_row,
+    rules: CompiledRules,
+    venue_ids: list[str],
+    now: datetime,
+    tz: ZoneInfo,
+) -> np.ndarray:
+    """Boolean (days, venues, blocks) matrix; True where settings and rules allow booking."""
+    local_now = now.astimezone(tz)
+    base = settings_open_mask(grid, settings_row, now, tz)
+    for pred in rules.global_predicates:
+        base &= _predicate_open(pred, grid, now, local_now)
+
+    out = np.empty((len(grid.dates), len(venue_ids), len(grid.windows)), dtype=bool)
+    for vi, venue_id in enumerate(venue_ids):
+        mask = base
+        extra = rules.venue_predicates.get(venue_id, ())
+        if extra:
+            mask = base.copy()
+            for pred in extra:
+                mask &= _predicate_open(pred, grid, now, local_now)
+        out[:, vi, :] = mask
+    return out
+
+
+def busy_matrix(grid: SlotGrid, venue_ids: list[str], *indexes: IntervalIndex) -> np.ndarray:
+    """Boolean (days, venues, blocks) matrix; True where any index has an overlapping interval."""
+    out = np.zeros((len(grid.dates), len(venue_ids), len(grid.windows)), dtype=bool)
+    for index in indexes:
+        for vi, venue_id in enumerate(venue_ids):
+            starts, max_ends = index.bounds(venue_id)
+            if not starts:
+                continue
+            starts_us = np.array([_epoch_us(s) for s in starts], dtype=np.int64)
+            max_ends_us = np.array([_epoch_us(e) for e in max_ends], dtype=np.int64)
+            i = np.searchsorted(starts_us, grid.end_us, side="left")
+            out[:, vi, :] |= (i > 0) & (max_ends_us[np.maximum(i - 1, 0)] > grid.start_us)
+    return out
@@ -1,17 +1,26 @@
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from zoneinfo import ZoneInfo
 
+from fastapi import HTTPException
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.models.calendar_block import CalendarBlock
-from app.models.reservation import Reservation
+from app.models.settings import AppSettings
 from app.models.venue import Venue
-from app.services.reservation_service import validate_reservation_time
-from app.services.settings_service import get_or_create_settings
+from app.services.availability_cache import availability_cache
+from app.services.availability_matrix import SlotGrid, busy_matrix, rules_open_matrix
+from app.services.availability_sql import busy_grid_sql
+from app.services.reservation_service import SlotValidator
+from app.services.occupancy_bitmap import MINUTES_PER_DAY, OccupancyBitmap, minute_of_day
+from app.services.rule_compiler import ClosedDateRanges, CompiledRules, TimeWindow, WeeklyClosed, first_stable_date, get_compiled_rules
+from app.services.settings_service import get_or_create_settings, public_block_windows
+from app.services.venue_day_slots import is_current, load_statuses
+
+BLOCKS = ("DAY", "NIGHT")
 
 
 def _daterange(start: date, end: date):
@@ -21,76 +30,308 @@ def _daterange(start: date, end: date):
         cur = cur + timedelta(days=1)
 
 
+def _compute_statuses_sql(db: Session, settings_row: AppSettings, venue_ids: list[str], from_date: date, to_date: date) -> dict[tuple[str, date, str], str]:
+    """Like _compute_statuses, with the overlap probes done by one Postgres query."""
+    windows = [public_block_windows(settings_row)[block] for block in BLOCKS]
+    tz_name = get_settings().timezone
+    tz = ZoneInfo(tz_name)
+    grid = SlotGrid(from_date=from_date, to_date=to_date, windows=windows, tz=tz)
+
+    # Settings and rule checks need no data beyond the compiled rules
+    now = datetime.now(tz=ZoneInfo("UTC"))
+    open_ = rules_open_matrix(grid, settings_row=settings_row, rules=get_compiled_rules(db, settings_row), venue_ids=venue_ids, now=now, tz=tz)
+    busy = busy_grid_sql(db, venue_ids=venue_ids, from_date=from_date, to_date=to_date, tz=tz_name)
+
+    return {
+        (venue_id, d, block): "O" if open_[di, vi, bi] and not busy[(venue_id, d, block)] else "X"
+        for di, d in enumerate(grid.dates)
+        for vi, venue_id in enumerate(venue_ids)
+        for bi, block in enumerate(BLOCKS)
+    }
+
+
+def _compute_statuses(
+    db: Session,
+    settings_row: AppSettings,
+    venue_ids: list[str],
+    from_date: date,
+    to_date: date,
+    *,
+    engine: str | None = None,
+) -> dict[tuple[str, date, str], str]:
+    """Compute O/X for every (venue_id, date, block) in the range from the DB."""
+    if (engine or get_settings().availability_engine) == "sql":
+        return _compute_statuses_sql(db, settings_row, venue_ids, from_date, to_date)
+
+    windows = [public_block_windows(settings_row)[block] for block in BLOCKS]
+
+    # Local DAY/NIGHT windows for every day, converted to UTC once
+    tz = ZoneInfo(get_settings().timezone)
+    grid = SlotGrid(from_date=from_date, to_date=to_date, windows=windows, tz=tz)
+
+    # Preload settings, compiled rules, reservations and blocks for the range
+    validator = SlotValidator(
+        db,
+        venue_ids=venue_ids,
+        range_start=min(min(row) for row in grid.start_utc),
+        range_end=max(max(row) for row in grid.end_utc),
+    )
+
+    # (days, venues, blocks): open by settings/rules and not overlapped by anything busy
+    open_ = rules_open_matrix(grid, settings_row=validator.settings, rules=validator.rules, venue_ids=venue_ids, now=validator.now, tz=validator.tz)
+    open_ &= ~busy_matrix(grid, venue_ids, validator.blocks, validator.reservations, validator.holds)
+
+    return {
+        (venue_id, d, block): "O" if open_[di, vi, bi] else "X"
+        for di, d in enumerate(grid.dates)
+        for vi, venue_id in enumerate(venue_ids)
+        for bi, block in enumerate(BLOCKS)
+    }
+
+
 def compute_public_availability(db: Session, *, from_date: date, to_date: date) -> list[dict]:
-    app_settings = get_settings()
-    tz = ZoneInfo(app_settings.timezone)
     settings_row = get_or_create_settings(db)
 
     venues = db.execute(select(Venue).where(Venue.active == True).order_by(Venue.sort_order, Venue.name)).scalars().all()
+    if not venues or from_date > to_date:
+        return []
+    venue_ids = [v.id for v in venues]
 
-    blocks: list[dict] = []
+    days = list(_daterange(from_date, to_date))
+    statuses: dict[tuple[str, date, str], str] = {}
 
-    # Preload reservations and blocks in range to reduce queries
-    range_start_utc = datetime.combine(from_date, datetime.min.time()).replace(tzinfo=tz).astimezone(ZoneInfo("UTC"))
-    range_end_utc = datetime.combine(to_date + timedelta(days=1), datetime.min.time()).replace(tzinfo=tz).astimezone(ZoneInfo("UTC"))
+    # Dates before stable_from depend on the clock and are always computed live
+    app_settings = get_settings()
+    stable_from = first_stable_date(db, settings_row)
+    stable_days = [d for d in days if d >= stable_from]
 
-    reservations = db.execute(
-        select(Reservation).where(
-            Reservation.status != "CANCELLED",
-            Reservation.start_at < range_end_utc,
-            Reservation.end_at > range_start_utc,
-        )
-    ).scalars().all()
+    use_cache = app_settings.availability_engine in ("python", "sql") and app_settings.availability_cache_enabled
+    if app_settings.availability_engine == "read_model":
+        # Stale after a rule/settings change until the sync has rebuilt it: compute live meanwhile
+        if stable_days and is_current(settings_row):
+            statuses.update(load_statuses(db, venue_ids, stable_days[0], stable_days[-1]))
+    elif use_cache:
+        availability_cache.sync_rules_version(settings_row.rules_version or 0)
+        epoch = availability_cache.epoch
+        for d in stable_days:
+            day = {(vid, d, b): availability_cache.get(vid, d, b) for vid in venue_ids for b in BLOCKS}
+            if all(status is not None for status in day.values()):
+                statuses.update(day)
+
+    # Anything not served above (near dates, cache misses, rows not yet built)
+    missing = [d for d in days if any((vid, d, b) not in statuses for vid in venue_ids for b in BLOCKS)]
+    if missing:
+        computed = _compute_statuses(db, settings_row, venue_ids, missing[0], missing[-1])
+        for key, status in computed.items():
+            statuses.setdefault(key, status)
+        if use_cache:
+            availability_cache.put_many({k: v for k, v in computed.items() if k[1] >= stable_from}, epoch)
+
+    return [
+        {"venue_id": venue.id, "venue_name": venue.name, "date": d, "block": block, "status": statuses[(venue.id, d, block)]}
+        for d in days
+        for venue in venues
+        for block in BLOCKS
+    ]
+
+
+def _open_window(settings_row: AppSettings, rules: CompiledRules, venue_id: str) -> tuple[time, time] | None:
+    """Local time window a booking at `venue_id` must fit in: business hours ∩ TIME_WINDOW rules."""
+    start = settings_row.business_hours_start
+    end = settings_row.business_hours_end
+    for pred in rules.for_venue(venue_id):
+        if isinstance(pred, TimeWindow):
+            start = max(start, pred.start)
+            end = min(end, pred.end)
+    return (start, end) if start < end else None
+
+
+def _gaps(window_start: datetime, window_end: datetime, busy: list[tuple[datetime, datetime]]):
+    """Free sub-intervals of the window, given busy intervals sorted by start."""
+    cursor = window_start
+    for start_at, end_at in busy:
+        if start_at > cursor:
+            yield cursor, min(start_at, window_end)
+        cursor = max(cursor, end_at)
+        if cursor >= window_end:
+            return
+    if cursor < window_end:
+        yield cursor, window_end
+
+
+def iter_free_slots(
+    db: Session,
+    *,
+    duration_minutes: int,
+    from_at: datetime,
+    max_days: int,
+    step_minutes: int = 30,
+    chunk_days: int = 7,
+):
+    """Yield, day by day, the earliest bookable (venue, start, end) per free gap.
+
+    Busy intervals are preloaded per chunk of days; each venue-day is a
+    sweep over its sorted reservations/blocks, and candidate starts are
+    aligned to `step_minutes` and confirmed with the compiled rules.
+    Each yielded list is sorted by start time, then venue order.
+    """
+    tz = ZoneInfo(get_settings().timezone)
+    utc = ZoneInfo("UTC")
+    duration = timedelta(minutes=duration_minutes)
+    step = timedelta(minutes=step_minutes)
 
-    blocks_db = db.execute(
-        select(CalendarBlock).where(
-            CalendarBlock.start_at < range_end_utc,
-            CalendarBlock.end_at > range_start_utc,
+    venues = db.execute(select(Venue).where(Venue.active == True).order_by(Venue.sort_order, Venue.name)).scalars().all()
+    if not venues:
+        return
+    venue_ids = [v.id for v in venues]
+
+    first_day = from_at.astimezone(tz).date()
+    for offset in range(0, max_days, chunk_days):
+        days = [first_day + timedelta(days=offset + i) for i in range(min(chunk_days, max_days - offset))]
+        validator = SlotValidator(
+            db,
+            venue_ids=venue_ids,
+            range_start=datetime.combine(days[0], time(0)).replace(tzinfo=tz).astimezone(utc),
+            range_end=datetime.combine(days[-1] + timedelta(days=1), time(0)).replace(tzinfo=tz).astimezone(utc),
         )
-    ).scalars().all()
+        windows = {vid: _open_window(validator.settings, validator.rules, vid) for vid in venue_ids}
 
-    def overlaps(items, venue_id: str, start_at: datetime, end_at: datetime) -> bool:
-        for it in items:
-            if getattr(it, "venue_id") != venue_id:
-                continue
-            if it.start_at < end_at and it.end_at > start_at:
-                return True
-        return False
+        for d in days:
+            midnight = datetime.combine(d, time(0)).replace(tzinfo=tz)
+            found = []
+            for order, venue in enumerate(venues):
+                window = windows[venue.id]
+                if window is None:
+                    continue
+                window_start = datetime.combine(d, window[0]).replace(tzinfo=tz).astimezone(utc)
+                window_end = datetime.combine(d, window[1]).replace(tzinfo=tz).astimezone(utc)
+                busy = sorted(
+                    validator.blocks.busy_intervals(venue.id, window_start, window_end)
+                    + validator.reservations.busy_intervals(venue.id, window_start, window_end)
+                    + validator.holds.busy_intervals(venue.id, window_start, window_end)
+                )
+                for gap_start, gap_end in _gaps(window_start, window_end, busy):
+                    earliest = max(gap_start, from_at)
+                    # Align up to the step grid, counted from local midnight
+                    steps = -(-(earliest - midnight) // step)
+                    start_at = (midnight + steps * step).astimezone(utc)
+                    while start_at + duration <= gap_end:
+                        try:
+                            validator.check(venue.id, start_at, start_at + duration)
+                        except HTTPException:
+                            start_at += step
+                            continue
+                        found.append((start_at, order, {"venue_id": venue.id, "venue_name": venue.name, "start_at": start_at, "end_at": start_at + duration}))
+                        break
+            found.sort(key=lambda it: (it[0], it[1]))
+            yield [it[2] for it in found]
 
-    for d in _daterange(from_date, to_date):
-        # Build two blocks in local time
-        day_start_local = datetime.combine(d, settings_row.public_day_start).replace(tzinfo=tz)
-        day_end_local = datetime.combine(d, settings_row.public_day_end).replace(tzinfo=tz)
-        night_start_local = datetime.combine(d, settings_row.public_night_start).replace(tzinfo=tz)
-        night_end_local = datetime.combine(d, settings_row.public_night_end).replace(tzinfo=tz)
 
-        day_start = day_start_local.astimezone(ZoneInfo("UTC"))
-        day_end = day_end_local.astimezone(ZoneInfo("UTC"))
-        night_start = night_start_local.astimezone(ZoneInfo("UTC"))
-        night_end = night_end_local.astimezone(ZoneInfo("UTC"))
+def search_free_slots(
+    db: Session,
+    *,
+    duration_minutes: int,
+    from_at: datetime,
+    limit: int,
+) -> list[dict]:
+    """Earliest `limit` bookable slots; stops scanning as soon as enough are found."""
+    app_settings = get_settings()
+    results: list[dict] = []
+    for day_slots in iter_free_slots(
+        db,
+        duration_minutes=duration_minutes,
+        from_at=from_at,
+        max_days=app_settings.availability_search_max_days,
+        step_minutes=app_settings.availability_search_step_minutes,
+    ):
+        results.extend(day_slots)
+        if len(results) >= limit:
+            break
+    return results[:limit]
+
+
+def _closed_on(rules: CompiledRules, venue_id: str, d: date) -> bool:
+    for pred in rules.for_venue(venue_id):
+        if isinstance(pred, WeeklyClosed) and d.weekday() in pred.weekdays:
+            return True
+        if isinstance(pred, ClosedDateRanges) and pred.is_closed(d):
+            return True
+    return False
+
+
+def compute_slot_availability(db: Session, *, from_date: date, to_date: date, granularity_minutes: int) -> list[dict]:
+    """O/X for every `granularity_minutes` slot within business hours, per venue and day.
+
+    Busy time comes from a per-venue minute bitmap, so each slot is one AND.
+    Dates before first_stable_date also depend on the clock (past, cutoff,
+    lead time) and are checked slot by slot with the full validator.
+    """
+    venues = db.execute(select(Venue).where(Venue.active == True).order_by(Venue.sort_order, Venue.name)).scalars().all()
+    if not venues or from_date > to_date:
+        return []
+    venue_ids = [v.id for v in venues]
+
+    tz = ZoneInfo(get_settings().timezone)
+    utc = ZoneInfo("UTC")
+    range_start = datetime.combine(from_date, time(0)).replace(tzinfo=tz).astimezone(utc)
+    range_end = datetime.combine(to_date + timedelta(days=1), time(0)).replace(tzinfo=tz).astimezone(utc)
+
+    validator = SlotValidator(db, venue_ids=venue_ids, range_start=range_start, range_end=range_end)
+    bitmap = OccupancyBitmap.from_indexes(venue_ids, range_start, range_end, tz, validator.blocks, validator.reservations, validator.holds)
+    stable_from = first_stable_date(db, validator.settings, validator.now)
 
+    open_minute = minute_of_day(validator.settings.business_hours_start, round_up=True)
+    close_minute = minute_of_day(validator.settings.business_hours_end)
+    slots = [
+        (m, m + granularity_minutes)
+        for m in range(0, MINUTES_PER_DAY, granularity_minutes)
+        if m >= open_minute and m + granularity_minutes <= close_minute
+    ]
+
+    windows = {}
+    for vid in venue_ids:
+        window = _open_window(validator.settings, validator.rules, vid)
+        windows[vid] = (minute_of_day(window[0], round_up=True), minute_of_day(window[1])) if window else None
+
+    out = []
+    for d in _daterange(from_date, to_date):
+        midnight = datetime.combine(d, time(0)).replace(tzinfo=tz)
+        bounds = [(midnight + timedelta(minutes=s), midnight + timedelta(minutes=e)) for s, e in slots]
         for venue in venues:
-            # DAY
-            status = "O"
-            if overlaps(reservations, venue.id, day_start, day_end) or overlaps(blocks_db, venue.id, day_start, day_end):
-                status = "X"
+            window = windows[venue.id]
+            if d < stable_from:
+                ok = [validator.verdict(venue.id, start_at.astimezone(utc), end_at.astimezone(utc))["ok"] for start_at, end_at in bounds]
+            elif window is None or _closed_on(validator.rules, venue.id, d):
+                ok = [False] * len(slots)
             else:
-                # Also validate against rules/settings (e.g. closed day) using validate_reservation_time
-                try:
-                    validate_reservation_time(db, venue_id=venue.id, start_at=day_start, end_at=day_end)
-                except Exception:
-                    status = "X"
-            blocks.append({"venue_id": venue.id, "venue_name": venue.name, "date": d, "block": "DAY", "status": status})
-
-            # NIGHT
-            status = "O"
-            if overlaps(reservations, venue.id, night_start, night_end) or overlaps(blocks_db, venue.id, night_start, night_end):
-                status = "X"
-            else:
-                try:
-                    validate_reservation_time(db, venue_id=venue.id, start_at=night_start, end_at=night_end)
-                except Exception:
-                    status = "X"
-            blocks.append({"venue_id": venue.id, "venue_name": venue.name, "date": d, "block": "NIGHT", "status": status})
+                free = bitmap.free_slots(venue.id, d, slots)
+                ok = [f and window[0] <= s and e <= window[1] for f, (s, e) in zip(free, slots)]
+            for (start_at, end_at), slot_ok in zip(bounds, ok):
+                out.append(
+                    {
+                        "venue_id": venue.id,
+                        "venue_name": venue.name,
+                        "date": d,
+                        "start_at": start_at,
+                        "end_at": end_at,
+                        "status": "O" if slot_ok else "X",
+                    }
+                )
+    return out
+
+
+# AsyncSession variants for the public router (queries run through the async driver)
+
+
+async def compute_public_availability_async(db: AsyncSession, *, from_date: date, to_date: date) -> list[dict]:
+    return await db.run_sync(lambda session: compute_public_availability(session, from_date=from_date, to_date=to_date))
+
+
+async def compute_slot_availability_async(db: AsyncSession, *, from_date: date, to_date: date, granularity_minutes: int) -> list[dict]:
+    return await db.run_sync(
+        lambda session: compute_slot_availability(session, from_date=from_date, to_date=to_date, granularity_minutes=granularity_minutes)
+    )
+
 
-    return blocks
+async def search_free_slots_async(db: AsyncSession, *, duration_minutes: int, from_at: datetime, limit: int) -> list[dict]:
+    return await db.run_sync(lambda session: search_free_slots(session, duration_minutes=duration_minutes, from_at=from_at, limit=limit))
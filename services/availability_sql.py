@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+# One round trip for the whole (day × venue × block) grid. Windows come from
+# app_settings; overlap probes use tstzrange && so the btree_gist exclusion
+# index on reservations (and ix_calendar_blocks_venue_range) can serve them.
+# Windows are not wrapped past midnight, matching SlotGrid: an end before
+# the start is an invalid range and never reported busy (rules reject it).
+# venue_id is returned as text so keys match the ORM's str ids whatever the
+# driver does with native uuid columns.
+_BUSY_GRID_SQL = text(
+    """
+    WITH windows(block, ws, we) AS (
+        SELECT 'DAY', public_day_start, public_day_end FROM app_settings WHERE id = 1
+        UNION ALL
+        SELECT 'NIGHT', public_night_start, public_night_end FROM app_settings WHERE id = 1
+    ),
+    grid AS (
+        SELECT v.id AS venue_id,
+               d::date AS slot_date,
+               w.block,
+               (d::date + w.ws) AT TIME ZONE :tz AS start_at,
+               (d::date + w.we) AT TIME ZONE :tz AS end_at
+        FROM generate_series(CAST(:from_date AS date), CAST(:to_date AS date), interval '1 day') AS d
+        CROSS JOIN windows w
+        JOIN venues v ON v.id IN :venue_ids
+    )
+    SELECT CAST(g.venue_id AS text) AS venue_id,
+           g.slot_date,
+           g.block,
+           CASE WHEN g.start_at < g.end_at THEN
+               EXISTS (
+                   SELECT 1 FROM reservations r
+                   WHERE r.venue_id = g.venue_id
+                     AND r.status <> 'CANCELLED'
+                     AND tstzrange(r.start_at, r.end_at, '[)') && tstzrange(g.start_at, g.end_at, '[)')
+               )
+               OR EXISTS (
+                   SELECT 1 FROM calendar_blocks c
+                   WHERE c.venue_id = g.venue_id
+                     AND tstzrange(c.start_at, c.end_at, '[)') && tstzrange(g.start_at, g.end_at, '[)')
+               )
+               OR EXISTS (
+                   SELECT 1 FROM slot_holds h
+                   WHERE h.venue_id = g.venue_id
+                     AND h.expires_at > now()
+                     AND h.start_at < g.end_at
+                     AND h.end_at > g.start_at
+               )
+           ELSE false END AS busy
+    FROM grid g
+    """
+).bindparams(bindparam("venue_ids", expanding=True))
+
+
+def busy_grid_sql(db: Session, *, venue_ids: list[str], from_date: date, to_date: date, tz: str) -> dict[tuple[str, date, str], bool]:
+    """Busy flag for every (venue_id, date, block) in the range, computed in Postgres."""
+    if not venue_ids or from_date > to_date:
+        return {}
+    rows = db.execute(_BUSY_GRID_SQL, {"venue_ids": venue_ids, "from_date": from_date, "to_date": to_date, "tz": tz}).all()
+    return {(r.venue_id, r.slot_date, r.block): bool(r.busy) for r in rows}
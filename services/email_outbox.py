@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import random
+import threading
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from cryptography.fernet import Fernet
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.email_outbox import SECRET_MARK, EmailOutbox
+from app.services.mailer import send_batch
+
+
+def _fernet() -> Fernet:
+    key = hashlib.sha256(("email-outbox|" + get_settings().secret_key).encode("utf-8")).digest()
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+def enqueue_email(
+    db: Session,
+    *,
+    to_email: str,
+    subject: str,
+    body: str,
+    secret: str = "",
+    expires_at: datetime | None = None,
+) -> EmailOutbox:
+    """Queue an email; it is sent only if the caller's transaction commits.
+
+    A `secret` (login code, reservation link) is stored encrypted and put in
+    place of SECRET_MARK in `body` when the email is sent. Emails still
+    undelivered at `expires_at` are given up.
+    """
+    if secret and SECRET_MARK not in body:
+        raise ValueError("body has no SECRET_MARK for the secret")
+    row = EmailOutbox(
+        to_email=to_email,
+        subject=subject,
+        body=body,
+        secret_enc=_fernet().encrypt(secret.encode("utf-8")).decode("ascii") if secret else "",
+        expires_at=expires_at,
+        status="PENDING",
+    )
+    db.add(row)
+    return row
+
+
+def _render(row: EmailOutbox) -> str:
+    if not row.secret_enc:
+        return row.body
+    return row.body.replace(SECRET_MARK, _fernet().decrypt(row.secret_enc.encode("ascii")).decode("utf-8"))
+
+
+def _finish(row: EmailOutbox, status: str) -> None:
+    # Delivered or given up: nothing left to send, so drop the content
+    row.status = status
+    row.body = ""
+    row.secret_enc = ""
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    s = get_settings()
+    seconds = min(s.email_outbox_backoff_seconds * 2 ** (attempts - 1), s.email_outbox_backoff_max_seconds)
+    return timedelta(seconds=seconds * random.uniform(0.8, 1.2))
+
+
+def claim_batch(db: Session, *, limit: int) -> list[tuple[str, str, str, str]]:
+    """Lease up to `limit` due emails to this worker; returns (id, to, subject, body).
+
+    FOR UPDATE SKIP LOCKED lets workers claim disjoint batches concurrently.
+    A claim is a lease: SENDING rows whose lease ran out (worker died) are
+    due again.
+    """
+    s = get_settings()
+    now = datetime.now(tz=ZoneInfo("UTC"))
+    db.execute(
+        update(EmailOutbox)
+        .where(or_(EmailOutbox.status == "PENDING", EmailOutbox.status == "SENDING"))
+        .where(EmailOutbox.expires_at <= now)
+        .values(status="FAILED", last_error="expired", body="", secret_enc="")
+        .execution_options(synchronize_session=False)
+    )
+    rows = db.execute(
+        select(EmailOutbox)
+        .where(or_(EmailOutbox.status == "PENDING", EmailOutbox.status == "SENDING"))
+        .where(EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    claimed = []
+    for row in rows:
+        row.status = "SENDING"
+        row.next_attempt_at = now + timedelta(seconds=s.email_outbox_lease_seconds)
+        claimed.append((row.id, row.to_email, row.subject, _render(row)))
+    db.commit()
+    return claimed
+
+
+def deliver_batch(db: Session, *, limit: int | None = None) -> int:
+    """Claim, send over one SMTP session and record the outcome; returns emails claimed."""
+    s = get_settings()
+    claimed = claim_batch(db, limit=limit or s.email_outbox_batch_size)
+    if not claimed:
+        return 0
+
+    results = send_batch([(to, subject, body) for _, to, subject, body in claimed])
+
+    now = datetime.now(tz=ZoneInfo("UTC"))
+    for (row_id, *_), error in zip(claimed, results):
+        row = db.get(EmailOutbox, row_id)
+        if row is None:
+            continue
+        row.attempts += 1
+        if error is None:
+            _finish(row, "SENT")
+            row.sent_at = now
+            row.last_error = ""
+        elif row.attempts >= s.email_outbox_max_attempts:
+            _finish(row, "FAILED")
+            row.last_error = repr(error)[:500]
+        else:
+            row.status = "PENDING"
+            row.next_attempt_at = now + _retry_delay(row.attempts)
+            row.last_error = repr(error)[:500]
+    db.commit()
+    return len(claimed)
+
+
+def run_workers(session_factory, *, workers: int, poll_seconds: float, stop: threading.Event) -> None:
+    """Run `workers` delivery loops until `stop` is set."""
+
+    def loop() -> None:
+        db = session_factory()
+        try:
+            while not stop.is_set():
+                try:
+                    n = deliver_batch(db)
+                except Exception:
+                    db.rollback()
+                    n = 0
+                if n == 0:
+                    stop.wait(poll_seconds)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=loop, name=f"email-outbox-{i}", daemon=True) for i in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def outbox_stats(db: Session) -> dict:
+    counts = dict(db.execute(select(EmailOutbox.status, func.count()).group_by(EmailOutbox.status)).all())
+    return {status: counts.get(status, 0) for status in ("PENDING", "SENDING", "SENT", "FAILED")}
+
+
+def purge_finished(db: Session) -> int:
+    """Delete SENT/FAILED rows older than email_outbox_retention_days."""
+    cutoff = datetime.now(tz=ZoneInfo("UTC")) - timedelta(days=get_settings().email_outbox_retention_days)
+    result = db.execute(delete(EmailOutbox).where(EmailOutbox.status.in_(("SENT", "FAILED")), EmailOutbox.updated_at < cutoff))
+    db.commit()
+    return result.rowcount or 0
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import secrets
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, or_, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.slot_hold import SlotHold
+from app.models.venue import Venue
+from app.services.auth_service import hash_pii, normalize_phone
+from app.services.availability_events import interval_changed
+from app.services.reservation_service import _hash_token, _integrity_conflict, lock_venue_day, validate_reservation_time
+
+
+def _lock_clients(db: Session, client_hashes: list[str]) -> None:
+    """Serialize hold requests per client (IP / phone hash) until the transaction ends.
+
+    Without it, parallel requests for different slots (different venue-day
+    locks) would all pass the active-hold count before any of them inserts.
+    Postgres only, like lock_venue_day; sorted to avoid deadlocks.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for client_hash in sorted(client_hashes):
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": f"hold-client|{client_hash}"})
+
+
+def create_hold(
+    db: Session, *, venue_id: str, start_at: datetime, end_at: datetime, ip: str = "", phone: str = ""
+) -> tuple[SlotHold, str]:
+    """Hold a bookable slot for slot_hold_minutes; returns the hold and its raw token.
+
+    A client (IP, and phone if given) may have at most
+    slot_hold_max_active_per_client unexpired holds, so one script cannot
+    keep the calendar held. The count and the insert run under per-client
+    locks, so concurrent requests cannot overshoot the cap.
+    """
+    venue = db.get(Venue, venue_id)
+    if not venue or not venue.active:
+        raise HTTPException(status_code=404, detail="Venue not found")
+
+    now = datetime.now(tz=ZoneInfo("UTC"))
+    ip_hash = hash_pii(ip) if ip else ""
+    phone_norm = normalize_phone(phone)
+    phone_hash = hash_pii(phone_norm) if phone_norm else ""
+    client = []
+    if ip_hash:
+        client.append(SlotHold.client_ip_hash == ip_hash)
+    if phone_hash:
+        client.append(SlotHold.phone_hash == phone_hash)
+
+    token_raw = secrets.token_urlsafe(24)
+    try:
+        if client:
+            _lock_clients(db, [h for h in (ip_hash, phone_hash) if h])
+            active = db.execute(
+                select(func.count()).select_from(SlotHold).where(SlotHold.expires_at > now, or_(*client))
+            ).scalar_one()
+            if active >= get_settings().slot_hold_max_active_per_client:
+                raise HTTPException(status_code=429, detail="Too many active holds")
+
+        lock_venue_day(db, venue_id, start_at)
+        validate_reservation_time(db, venue_id=venue_id, start_at=start_at, end_at=end_at, now=now)
+        hold = SlotHold(
+            venue_id=venue_id,
+            start_at=start_at,
+            end_at=end_at,
+            token_hash=_hash_token(token_raw),
+            expires_at=now + timedelta(minutes=get_settings().slot_hold_minutes),
+            client_ip_hash=ip_hash,
+            phone_hash=phone_hash,
+        )
+        db.add(hold)
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise _integrity_conflict(e)
+    except Exception:
+        db.rollback()
+        raise
+
+    interval_changed(db, venue_id, start_at, end_at)
+    return hold, token_raw
+
+
+def release_hold(db: Session, *, token_raw: str) -> None:
+    hold = db.execute(select(SlotHold).where(SlotHold.token_hash == _hash_token(token_raw))).scalar_one_or_none()
+    if hold is None:
+        return
+    venue_id, start_at, end_at = hold.venue_id, hold.start_at, hold.end_at
+    db.delete(hold)
+    db.commit()
+    interval_changed(db, venue_id, start_at, end_at)
+
+
+def sweep_expired_holds(db: Session, *, now: datetime | None = None) -> int:
+    """Delete expired holds and refresh availability for the slots they covered."""
+    now = now or datetime.now(tz=ZoneInfo("UTC"))
+    expired = db.execute(
+        delete(SlotHold).where(SlotHold.expires_at <= now).returning(SlotHold.venue_id, SlotHold.start_at, SlotHold.end_at)
+    ).all()
+    db.commit()
+    for venue_id, start_at, end_at in expired:
+        interval_changed(db, venue_id, start_at, end_at)
+    return len(expired)
+
+
+async def create_hold_async(
+    db: AsyncSession, *, venue_id: str, start_at: datetime, end_at: datetime, ip: str = "", phone: str = ""
+) -> tuple[SlotHold, str]:
+    return await db.run_sync(
+        lambda session: create_hold(session, venue_id=venue_id, start_at=start_at, end_at=end_at, ip=ip, phone=phone)
+    )
+
+
+async def release_hold_async(db: AsyncSession, *, token_raw: str) -> None:
+    await db.run_sync(lambda session: release_hold(session, token_raw=token_raw))
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException
+from sqlalchemy import and_, delete, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.idempotency_key import IdempotencyKey
+
+
+def request_fingerprint(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _key_id(scope: str, key: str) -> str:
+    return hashlib.sha256(f"{scope}|{key}".encode("utf-8")).hexdigest()
+
+
+def try_begin(db: Session, *, scope: str, key: str, fingerprint: str) -> tuple[str, IdempotencyKey | None]:
+    """Claim `key` for this request.
+
+    Returns ("new", row) when the caller owns the key and must run the
+    request, ("done", row) when a stored response can be replayed, or
+    ("busy", None) while another attempt is in flight.
+    """
+    if not key or len(key) > 255:
+        raise HTTPException(status_code=400, detail="Invalid Idempotency-Key")
+
+    s = get_settings()
+    now = datetime.now(tz=ZoneInfo("UTC"))
+    key_id = _key_id(scope, key)
+
+    row = db.get(IdempotencyKey, key_id, populate_existing=True)
+    if row is not None:
+        # Expired, or left IN_PROGRESS by a crashed attempt: take it over. One
+        # conditional update, so of two retries seeing it abandoned only one wins
+        cutoff = now - timedelta(seconds=s.idempotency_in_progress_timeout_seconds)
+        if row.expires_at <= now or (row.status == "IN_PROGRESS" and row.updated_at < cutoff):
+            claimed = db.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.id == key_id,
+                    or_(
+                        IdempotencyKey.expires_at <= now,
+                        and_(IdempotencyKey.status == "IN_PROGRESS", IdempotencyKey.updated_at < cutoff),
+                    ),
+                )
+                .values(
+                    request_fingerprint=fingerprint,
+                    status="IN_PROGRESS",
+                    response_json=None,
+                    expires_at=now + timedelta(hours=s.idempotency_ttl_hours),
+                    updated_at=now,
+                )
+                .returning(IdempotencyKey.id)
+                .execution_options(synchronize_session=False)
+            ).one_or_none()
+            db.commit()
+            if claimed is None:
+                return "busy", None
+            return "new", db.get(IdempotencyKey, key_id, populate_existing=True)
+
+    if row is None:
+        row = IdempotencyKey(
+            id=key_id,
+            scope=scope,
+            request_fingerprint=fingerprint,
+            status="IN_PROGRESS",
+            expires_at=now + timedelta(hours=s.idempotency_ttl_hours),
+        )
+        db.add(row)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another attempt inserted it first
+            db.rollback()
+            return "busy", None
+        return "new", row
+
+    if row.request_fingerprint != fingerprint:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+    if row.status == "DONE":
+        return "done", row
+    return "busy", None
+
+
+def complete(db: Session, row: IdempotencyKey, response: dict, *, commit: bool = True) -> None:
+    """Store the response for replay.
+
+    With commit=False it joins the caller's transaction, so the key is DONE
+    exactly when the work it describes is committed. Conditional on the key
+    still being IN_PROGRESS: if an attempt that took the key over already
+    finished, this one fails with 409 (and its transaction is rolled back).
+    """
+    done = db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.id == row.id, IdempotencyKey.status == "IN_PROGRESS")
+        .values(status="DONE", response_json=response)
+        .returning(IdempotencyKey.id)
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+    if done is None:
+        raise HTTPException(status_code=409, detail="Conflict, please retry")
+    if commit:
+        db.commit()
+
+
+def release(db: Session, row: IdempotencyKey) -> None:
+    """Forget a key whose request failed, so a retry runs it again.
+
+    A key already DONE (committed with its reservation, or by an attempt that
+    took it over) is kept, so retries replay it.
+    """
+    db.rollback()
+    db.execute(delete(IdempotencyKey).where(IdempotencyKey.id == row.id, IdempotencyKey.status == "IN_PROGRESS"))
+    db.commit()
+
+
+def purge_expired(db: Session) -> int:
+    result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.now(tz=ZoneInfo("UTC"))))
+    db.commit()
+    return result.rowcount or 0
+
+
+async def begin_async(db: AsyncSession, *, scope: str, key: str, fingerprint: str) -> tuple[str, IdempotencyKey]:
+    """try_begin, waiting (without blocking the loop) for an in-flight duplicate to finish."""
+    s = get_settings()
+    deadline = time.monotonic() + s.idempotency_wait_seconds
+    while True:
+        state, row = await db.run_sync(lambda session: try_begin(session, scope=scope, key=key, fingerprint=fingerprint))
+        if state != "busy":
+            return state, row
+        if time.monotonic() >= deadline:
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+        await asyncio.sleep(s.idempotency_poll_seconds)
+
+
+async def release_async(db: AsyncSession, row: IdempotencyKey) -> None:
+    await db.run_sync(lambda session: release(session, row))
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Iterable
+
+
+class IntervalIndex:
+    """Per-venue index of half-open [start_at, end_at) intervals.
+
+    Built once from preloaded rows (reservations, calendar blocks, ...).
+    Each venue keeps its intervals sorted by start together with a running
+    maximum of end times, so an overlap probe is a single bisect: the
+    candidates are the intervals starting before `end_at`, and one of them
+    overlaps iff the largest end among them is after `start_at`.
+    """
+
+    def __init__(self) -> None:
+        self._intervals: dict[str, list[tuple[datetime, datetime]]] = {}
+        self._starts: dict[str, list[datetime]] = {}
+        self._max_ends: dict[str, list[datetime]] = {}
+
+    @classmethod
+    def from_rows(cls, *row_sets: Iterable[Any]) -> "IntervalIndex":
+        """Build an index from objects exposing venue_id/start_at/end_at."""
+        index = cls()
+        for rows in row_sets:
+            for row in rows:
+                index.add(row.venue_id, row.start_at, row.end_at)
+        index.build()
+        return index
+
+    def add(self, venue_id: str, start_at: datetime, end_at: datetime) -> None:
+        """Queue an interval; call build() before probing again."""
+        self._intervals.setdefault(venue_id, []).append((start_at, end_at))
+
+    def build(self) -> None:
+        for venue_id, intervals in self._intervals.items():
+            intervals.sort(key=lambda it: it[0])
+            max_ends: list[datetime] = []
+            for _, end_at in intervals:
+                max_ends.append(end_at if not max_ends or end_at > max_ends[-1] else max_ends[-1])
+            self._starts[venue_id] = [start_at for start_at, _ in intervals]
+            self._max_ends[venue_id] = max_ends
+
+    def bounds(self, venue_id: str) -> tuple[list[datetime], list[datetime]]:
+        """Sorted starts and running max ends for `venue_id` (for vectorized probes)."""
+        return self._starts.get(venue_id, []), self._max_ends.get(venue_id, [])
+
+    def overlaps(self, venue_id: str, start_at: datetime, end_at: datetime) -> bool:
+        starts = self._starts.get(venue_id)
+        if not starts:
+            return False
+        i = bisect_left(starts, end_at)
+        return i > 0 and self._max_ends[venue_id][i - 1] > start_at
+
+    def busy_intervals(self, venue_id: str, start_at: datetime, end_at: datetime) -> list[tuple[datetime, datetime]]:
+        """Intervals of `venue_id` overlapping [start_at, end_at), sorted by start."""
+        starts = self._starts.get(venue_id)
+        if not starts:
+            return []
+        intervals = self._intervals[venue_id]
+        hi = bisect_left(starts, end_at)
+        # max_ends is non-decreasing, so everything before `lo` ends by start_at
+        lo = bisect_right(self._max_ends[venue_id], start_at, hi=hi)
+        return [it for it in intervals[lo:hi] if it[1] > start_at]
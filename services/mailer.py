@@ -1,35 +1,32 @@
 from __future__ import annotations
 
-import smtplib
 from email.message import EmailMessage
 
 from app.core.config import get_settings
+from app.services.smtp_pool import smtp_pool
 
 
-def send_email(to_email: str, subject: str, body: str) -> None:
-    """Send an email via SMTP.
-
-    For development, you can use MailHog (docker-compose) on localhost:1025.
-    """
+def _message(to_email: str, subject: str, body: str) -> EmailMessage:
     settings = get_settings()
-
     msg = EmailMessage()
     msg["Subject"] = subject
     msg["From"] = settings.email_from
     msg["To"] = to_email
     msg.set_content(body)
+    return msg
+
+
+def send_email(to_email: str, subject: str, body: str) -> None:
+    """Send an email via SMTP over a pooled session.
+
+    For development, you can use MailHog (docker-compose) on localhost:1025.
+    """
+    smtp_pool.send(_message(to_email, subject, body))
 
-    if settings.smtp_use_tls:
-        server = smtplib.SMTP_SSL(settings.smtp_host, settings.smtp_port)
-    else:
-        server = smtplib.SMTP(settings.smtp_host, settings.smtp_port)
-
-    try:
-        if settings.smtp_username:
-            server.login(settings.smtp_username, settings.smtp_password)
-        server.send_message(msg)
-    finally:
-        try:
-            server.quit()
-        except Exception:
-            pass
+
+def send_batch(messages: list[tuple[str, str, str]]) -> list[Exception | None]:
+    """Send (to_email, subject, body) messages over one pooled SMTP session.
+
+    Returns one entry per message: None when sent, else the error.
+    """
+    return smtp_pool.send_many(_message(*m) for m in messages)
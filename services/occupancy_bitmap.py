@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+from app.services.interval_index import IntervalIndex
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def minute_of_day(t: time, *, round_up: bool = False) -> int:
+    """Wall-clock minute of `t`; partial minutes round down unless `round_up`."""
+    minute = t.hour * 60 + t.minute
+    if round_up and (t.second or t.microsecond):
+        minute += 1
+    return minute
+
+
+def minute_mask(start_minute: int, end_minute: int) -> int:
+    """Bits [start_minute, end_minute) set."""
+    if end_minute <= start_minute:
+        return 0
+    return ((1 << (end_minute - start_minute)) - 1) << start_minute
+
+
+class OccupancyBitmap:
+    """Per-venue, per-local-day busy minutes as Python int bitsets.
+
+    Bit m of a day is set when any interval covers part of local minute m
+    (partially covered minutes count as busy). Only days with something busy
+    are stored, so memory is bounded by venues × days × 1440 bits.
+    A slot is free iff `bits & minute_mask(start, end) == 0`.
+    """
+
+    def __init__(self, tz) -> None:
+        self.tz = tz
+        self._days: dict[str, dict[date, int]] = {}
+
+    @classmethod
+    def from_indexes(
+        cls,
+        venue_ids,
+        range_start: datetime,
+        range_end: datetime,
+        tz,
+        *indexes: IntervalIndex,
+    ) -> "OccupancyBitmap":
+        bitmap = cls(tz)
+        for venue_id in venue_ids:
+            for index in indexes:
+                for start_at, end_at in index.busy_intervals(venue_id, range_start, range_end):
+                    bitmap.add(venue_id, start_at, end_at)
+        return bitmap
+
+    def add(self, venue_id: str, start_at: datetime, end_at: datetime) -> None:
+        """Mark [start_at, end_at) busy, split across the local days it touches."""
+        local_start = start_at.astimezone(self.tz)
+        local_end = end_at.astimezone(self.tz)
+        days = self._days.setdefault(venue_id, {})
+        d = local_start.date()
+        last = local_end.date()
+        while d <= last:
+            first_minute = minute_of_day(local_start.time()) if d == local_start.date() else 0
+            end_minute = minute_of_day(local_end.time(), round_up=True) if d == last else MINUTES_PER_DAY
+            mask = minute_mask(first_minute, end_minute)
+            if mask:
+                days[d] = days.get(d, 0) | mask
+            d += timedelta(days=1)
+
+    def day_bits(self, venue_id: str, d: date) -> int:
+        return self._days.get(venue_id, {}).get(d, 0)
+
+    def is_free(self, venue_id: str, d: date, start_minute: int, end_minute: int) -> bool:
+        return not self.day_bits(venue_id, d) & minute_mask(start_minute, end_minute)
+
+    def free_slots(self, venue_id: str, d: date, slots: list[tuple[int, int]]) -> list[bool]:
+        """Free/busy for each (start_minute, end_minute) slot of the day."""
+        bits = self.day_bits(venue_id, d)
+        if not bits:
+            return [True] * len(slots)
+        return [not bits & minute_mask(s, e) for s, e in slots]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException
+
+from app.core.config import get_settings
+from app.core.security import hash_password, verify_password
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Bounded pool that runs bcrypt off the request threads.
+
+    At most `workers` hashes run at once (bcrypt releases the GIL, so threads
+    use separate cores) and at most `max_queue` more wait for a worker. Past
+    that, callers get an immediate 503 instead of queueing behind a login
+    burst, which leaves the remaining request threads and cores to the rest
+    of the API.
+    """
+
+    def __init__(self, *, workers: int, max_queue: int, latency_samples: int = 1024) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._latencies: deque[float] = deque(maxlen=latency_samples)
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.hash_seconds = 0.0
+        self.max_hash_seconds = 0.0
+
+    @staticmethod
+    def _timed(fn: Callable[..., T], args: tuple) -> tuple[float, T]:
+        started = time.perf_counter()
+        return started, fn(*args)
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
+        with self._lock:
+            self._in_flight += 1
+        submitted = time.perf_counter()
+        try:
+            started, result = self._executor.submit(self._timed, fn, args).result()
+        finally:
+            self._slots.release()
+            with self._lock:
+                self._in_flight -= 1
+        done = time.perf_counter()
+        with self._lock:
+            self.completed += 1
+            self.wait_seconds += started - submitted
+            self.hash_seconds += done - started
+            self.max_hash_seconds = max(self.max_hash_seconds, done - started)
+            self._latencies.append(done - submitted)
+        return result
+
+    def hash(self, password: str) -> str:
+        return self.run(hash_password, password)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self.run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            n = self.completed
+
+            def pct(p: float) -> float:
+                return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1) if latencies else 0.0
+
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "completed": n,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.wait_seconds / n * 1000, 1) if n else 0.0,
+                "avg_hash_ms": round(self.hash_seconds / n * 1000, 1) if n else 0.0,
+                "max_hash_ms": round(self.max_hash_seconds * 1000, 1),
+                # Queue wait + hash, over the most recent calls
+                "p50_ms": pct(0.50),
+                "p95_ms": pct(0.95),
+            }
+
+
+_settings = get_settings()
+password_hasher = PasswordHasher(workers=_settings.password_hash_workers, max_queue=_settings.password_hash_max_queue)
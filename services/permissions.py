@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, Mapping
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.user import User, UserRole
+from app.services.auth_service import get_user_permissions
+
+
+class PermissionCache:
+    """In-process LRU of permission snapshots, one per user.
+
+    A snapshot is the frozenset of a user's permission codes, stored with
+    the users.permissions_version it was compiled for. Role changes bump the
+    version in the same transaction, and the user row is loaded on every
+    request anyway, so a stale snapshot is never used, in any process.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[int, frozenset[str]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str, version: int) -> frozenset[str] | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id: str, version: int, perms: frozenset[str]) -> None:
+        with self._lock:
+            self._entries[user_id] = (version, perms)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+permission_cache = PermissionCache(max_entries=get_settings().permission_cache_max_entries)
+
+
+def get_permission_snapshot(db: Session, user: User) -> frozenset[str]:
+    perms = permission_cache.get(user.id, user.permissions_version)
+    if perms is None:
+        perms = frozenset(get_user_permissions(db, user.id))
+        permission_cache.put(user.id, user.permissions_version, perms)
+    return perms
+
+
+def resolve_permissions(db: Session, user: User, claims: Mapping[str, Any]) -> frozenset[str]:
+    """Permissions embedded in the access token if still current, else the cached snapshot."""
+    if "perms" in claims and claims.get("pv") == user.permissions_version:
+        return frozenset(claims["perms"])
+    return get_permission_snapshot(db, user)
+
+
+def permission_claims(db: Session, user: User) -> dict[str, Any]:
+    """JWT claims embedding the user's snapshot (jwt_embed_permissions)."""
+    if not get_settings().jwt_embed_permissions or user.is_root_admin:
+        return {}
+    return {"pv": user.permissions_version, "perms": sorted(get_permission_snapshot(db, user))}
+
+
+def bump_permissions_version(db: Session, *, user_ids: Iterable[str] = (), role_id: str | None = None) -> None:
+    """Invalidate snapshots of the given users and/or the holders of a role.
+
+    Does not commit; call it in the transaction that changes the roles.
+    """
+    conditions = []
+    user_ids = list(user_ids)
+    if user_ids:
+        conditions.append(User.id.in_(user_ids))
+    if role_id is not None:
+        conditions.append(User.id.in_(select(UserRole.user_id).where(UserRole.role_id == role_id)))
+    for cond in conditions:
+        db.execute(
+            update(User)
+            .where(cond)
+            .values(permissions_version=User.permissions_version + 1)
+            .execution_options(synchronize_session=False)
+        )
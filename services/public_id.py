@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.reservation import PUBLIC_ID_BLOCK, public_id_seq
+
+# Public ids look like R-20260116-8F3K2. The suffix is a unique counter
+# (hi/lo blocks from reservation_public_id_seq, so worker processes never
+# share a value) passed through a keyed permutation of the 25-bit space and
+# written as 5 Crockford base32 characters. Distinct counters give distinct
+# suffixes, so no existence check is needed; the permutation only hides the
+# booking volume. Changing secret_key changes the permutation, which could
+# collide with ids issued earlier that same day.
+
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"  # Crockford base32
+_CHARS = 5
+_BITS = 5 * _CHARS
+# Balanced Feistel network over 26 bits, cycle-walked down to 25
+_HALF_BITS = (_BITS + 1) // 2
+_HALF_MASK = (1 << _HALF_BITS) - 1
+_ROUNDS = 4
+
+
+def _round(key: bytes, tweak: bytes, i: int, half: int) -> int:
+    digest = hmac.new(key, tweak + bytes([i]) + half.to_bytes(2, "big"), hashlib.sha256).digest()
+    return int.from_bytes(digest[:4], "big") & _HALF_MASK
+
+
+def permute(n: int, *, key: bytes, tweak: bytes) -> int:
+    """Keyed bijection on [0, 2**25)."""
+    x = n
+    while True:
+        left, right = x >> _HALF_BITS, x & _HALF_MASK
+        for i in range(_ROUNDS):
+            left, right = right, left ^ _round(key, tweak, i, right)
+        x = left << _HALF_BITS | right
+        if x < 1 << _BITS:
+            return x
+
+
+def encode(x: int) -> str:
+    return "".join(_ALPHABET[(x >> shift) & 31] for shift in range(_BITS - 5, -1, -5))
+
+
+class PublicIdAllocator:
+    """Hands out reservation public ids without probing the reservations table.
+
+    One sequence round trip per PUBLIC_ID_BLOCK ids; unused counters of a
+    block are lost when the process exits. The sequence is fetched without
+    holding the lock: under AsyncSession.run_sync the query yields to the
+    event loop, and a second booking waiting on a held threading.Lock would
+    block that loop for good.
+
+    Databases without sequences (SQLite, for development) get random
+    counters instead; a same-day repeat then surfaces as the unique-index 409.
+    """
+
+    def __init__(self, *, key: bytes) -> None:
+        self._key = key
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+
+    def _take(self) -> int | None:
+        with self._lock:
+            if self._next >= self._end:
+                return None
+            n = self._next
+            self._next += 1
+            return n
+
+    def _next_counter(self, db: Session) -> int:
+        n = self._take()
+        if n is not None:
+            return n
+        if not db.get_bind().dialect.supports_sequences:
+            return secrets.randbelow(1 << _BITS)
+        start = db.execute(select(public_id_seq.next_value())).scalar_one()
+        with self._lock:
+            # Another booking may have refilled meanwhile; then the rest of this block is dropped
+            if self._next >= self._end:
+                self._next, self._end = start + 1, start + PUBLIC_ID_BLOCK
+        return start
+
+    def allocate(self, db: Session, *, now: datetime | None = None) -> str:
+        date_part = (now or datetime.now(timezone.utc)).strftime("%Y%m%d")
+        n = self._next_counter(db) % (1 << _BITS)
+        return f"R-{date_part}-{encode(permute(n, key=self._key, tweak=date_part.encode('ascii')))}"
+
+
+public_id_allocator = PublicIdAllocator(key=hashlib.sha256(("public_id|" + get_settings().secret_key).encode("utf-8")).digest())
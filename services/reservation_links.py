@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import threading
+import time
+import uuid
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.reservation_token import ReservationAccessToken
+
+# Signed reservation links: "<kid>.<b64(token id, expiry)>.<b64(mac)>".
+# The MAC is HMAC-SHA256 (truncated to 128 bits) under a key derived from
+# secret_key and the key id, so the signature and expiry are checked without
+# the database. The token id still names a ReservationAccessToken row, which
+# carries the view count and revocation. Random db-mode tokens never contain
+# a ".", so both kinds can be told apart and accepted side by side.
+
+_MAC_BYTES = 16
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _unb64(s: str) -> bytes:
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+
+def _key(kid: str) -> bytes:
+    return hmac.new(get_settings().secret_key.encode("utf-8"), b"reservation-link|" + kid.encode("utf-8"), hashlib.sha256).digest()
+
+
+def _mac(kid: str, payload: bytes) -> bytes:
+    return hmac.new(_key(kid), kid.encode("utf-8") + b"." + payload, hashlib.sha256).digest()[:_MAC_BYTES]
+
+
+def is_signed_link(token_raw: str) -> bool:
+    return "." in token_raw
+
+
+def sign_link(*, token_id: str, expires_at: datetime) -> str:
+    kid = get_settings().reservation_link_kid
+    payload = uuid.UUID(token_id).bytes + int(expires_at.timestamp()).to_bytes(5, "big")
+    return f"{kid}.{_b64(payload)}.{_b64(_mac(kid, payload))}"
+
+
+def verify_link(db: Session, token_raw: str, *, now: datetime) -> str:
+    """Check a signed link and return its ReservationAccessToken id.
+
+    Only a periodic refresh of the revocation set touches the database.
+    """
+    try:
+        kid, payload_b64, mac_b64 = token_raw.split(".")
+        payload, mac = _unb64(payload_b64), _unb64(mac_b64)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Invalid token")
+    accepted = {k.strip() for k in get_settings().reservation_link_accepted_kids.split(",")}
+    if kid not in accepted or len(payload) != 21 or not hmac.compare_digest(mac, _mac(kid, payload)):
+        raise HTTPException(status_code=404, detail="Invalid token")
+
+    if now.timestamp() > int.from_bytes(payload[16:], "big"):
+        raise HTTPException(status_code=410, detail="Token expired")
+
+    token_id = str(uuid.UUID(bytes=payload[:16]))
+    revoked_links.refresh_if_due(db, now)
+    if token_id in revoked_links:
+        raise HTTPException(status_code=410, detail="Token revoked")
+    return token_id
+
+
+class RevocationSet:
+    """Ids of revoked, unexpired view tokens, reloaded every `refresh_seconds`.
+
+    Revocations made in this process apply at once; other processes see them
+    after their next refresh. The view-counting UPDATE also checks
+    revoked_at, so a stale set cannot let a revoked link through there.
+    """
+
+    def __init__(self, *, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._ids: frozenset[str] = frozenset()
+        self._lock = threading.Lock()
+        self._loaded_at = float("-inf")
+        self.refreshes = 0
+
+    def __contains__(self, token_id: str) -> bool:
+        return token_id in self._ids
+
+    def add(self, token_ids) -> None:
+        with self._lock:
+            self._ids = self._ids | set(token_ids)
+
+    def refresh_if_due(self, db: Session, now: datetime) -> None:
+        if time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return
+        ids = db.execute(
+            select(ReservationAccessToken.id).where(
+                ReservationAccessToken.revoked_at.is_not(None),
+                ReservationAccessToken.expires_at >= now,
+            )
+        ).scalars().all()
+        with self._lock:
+            self._ids = frozenset(ids)
+            self._loaded_at = time.monotonic()
+            self.refreshes += 1
+
+    def stats(self) -> dict:
+        return {"revoked": len(self._ids), "refreshes": self.refreshes}
+
+
+def revoke_reservation_links(db: Session, *, reservation_id: str) -> int:
+    """Revoke every view link of a reservation; returns how many were revoked."""
+    now = datetime.now(tz=ZoneInfo("UTC"))
+    ids = db.execute(
+        update(ReservationAccessToken)
+        .where(ReservationAccessToken.reservation_id == reservation_id, ReservationAccessToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+        .returning(ReservationAccessToken.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+    revoked_links.add(ids)
+    return len(ids)
+
+
+revoked_links = RevocationSet(refresh_seconds=get_settings().reservation_link_revocation_refresh_seconds)
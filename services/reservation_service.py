@@ -2,30 +2,46 @@ from __future__ import annotations
 
 import hashlib
 import secrets
-from datetime import date, datetime, time, timedelta
+from datetime import datetime, time, timedelta
+from typing import Iterable
 from zoneinfo import ZoneInfo
 
-from fastapi import HTTPException
-from sqlalchemy import and_, or_, select
+from fastapi import HTTPException, Request
+from sqlalchemy import case, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.models._ids import new_id
 from app.models.calendar_block import CalendarBlock
-from app.models.booking_rule import BookingRule
-from app.models.customer import Customer
+from app.models.customer import EMAIL_KEY_WHERE, PHONE_KEY_WHERE, Customer
+from app.models.email_outbox import SECRET_MARK
+from app.models.idempotency_key import IdempotencyKey
+from app.models.menu import MenuItem
 from app.models.reservation import Reservation, ReservationMenuSelection
 from app.models.reservation_token import ReservationAccessToken
+from app.models.slot_hold import SlotHold
 from app.models.venue import Venue
+from app.services.audit_service import write_audit_log
+from app.services.availability_events import interval_changed
 from app.services.auth_service import (
-    generate_public_id,
     hash_pii,
     mask_email,
     mask_phone,
     normalize_email,
     normalize_phone,
 )
-from app.services.mailer import send_email
+from app.services.interval_index import IntervalIndex
+from app.services.email_outbox import enqueue_email
+from app.services.idempotency import complete as complete_idempotency_key
+from app.services.public_id import public_id_allocator
+from app.services.reservation_links import is_signed_link, sign_link, verify_link
+from app.services.rule_compiler import get_compiled_rules
 from app.services.settings_service import get_or_create_settings
+from app.services.token_views import token_view_buffer
 
 
 def _hash_token(raw: str) -> str:
@@ -81,6 +97,44 @@ def _has_overlapping_reservation(db: Session, venue_id: str, start_at: datetime,
     return db.execute(q).first() is not None
 
 
+def _has_active_hold(db: Session, venue_id: str, start_at: datetime, end_at: datetime, now: datetime, exclude_hold_id: str | None = None) -> bool:
+    q = (
+        select(SlotHold.id)
+        .where(SlotHold.venue_id == venue_id)
+        .where(SlotHold.expires_at > now)
+        .where(SlotHold.start_at < end_at)
+        .where(SlotHold.end_at > start_at)
+    )
+    if exclude_hold_id:
+        q = q.where(SlotHold.id != exclude_hold_id)
+    return db.execute(q.limit(1)).first() is not None
+
+
+def find_hold(db: Session, token_raw: str | None, *, venue_id: str, start_at: datetime, end_at: datetime, now: datetime) -> SlotHold | None:
+    """The unexpired hold behind `token_raw`, if it covers exactly this slot."""
+    if not token_raw:
+        return None
+    hold = db.execute(select(SlotHold).where(SlotHold.token_hash == _hash_token(token_raw))).scalar_one_or_none()
+    if hold is None or hold.expires_at <= now:
+        return None
+    if hold.venue_id != venue_id or hold.start_at != start_at or hold.end_at != end_at:
+        return None
+    return hold
+
+
+def _apply_settings_constraints(settings, start_at: datetime, end_at: datetime, now: datetime, tz: ZoneInfo) -> None:
+    if start_at >= end_at:
+        raise HTTPException(status_code=400, detail="Invalid time range")
+
+    if start_at < now:
+        raise HTTPException(status_code=400, detail="Start time is in the past")
+
+    _ensure_same_local_date(start_at, end_at, tz)
+    _ensure_within_business_hours(start_at, end_at, tz, settings.business_hours_start, settings.business_hours_end)
+    _apply_same_day_cutoff(start_at, now, tz, settings.same_day_cutoff)
+    _apply_lead_time(start_at, now, settings.lead_time_minutes)
+
+
 def validate_reservation_time(
     db: Session,
     *,
@@ -89,6 +143,7 @@ def validate_reservation_time(
     end_at: datetime,
     now: datetime | None = None,
     exclude_reservation_id: str | None = None,
+    exclude_hold_id: str | None = None,
 ) -> None:
     settings = get_or_create_settings(db)
     app_settings = get_settings()
@@ -97,105 +152,10 @@ def validate_reservation_time(
     if now is None:
         now = datetime.now(tz=ZoneInfo("UTC"))
 
-    if start_at >= end_at:
-        raise HTTPException(status_code=400, detail="Invalid time range")
+    _apply_settings_constraints(settings, start_at, end_at, now, tz)
 
-    if start_at < now:
-        raise HTTPException(status_code=400, detail="Start time is in the past")
-
-    _ensure_same_local_date(start_at, end_at, tz)
-    _ensure_within_business_hours(start_at, end_at, tz, settings.business_hours_start, settings.business_hours_end)
-    _apply_same_day_cutoff(start_at, now, tz, settings.same_day_cutoff)
-    _apply_lead_time(start_at, now, settings.lead_time_minutes)
-
-    # Evaluate additional booking rules (active)
-    rules_q = (
-        select(BookingRule)
-        .where(BookingRule.is_active == True)
-        .where(
-            or_(
-                BookingRule.scope_type == "ALL",
-                and_(BookingRule.scope_type == "VENUE", BookingRule.scope_id == venue_id),
-            )
-        )
-    )
-    rules = db.execute(rules_q).scalars().all()
-
-    local_start = start_at.astimezone(tz)
-    local_end = end_at.astimezone(tz)
-    local_now = now.astimezone(tz)
-
-    for rule in rules:
-        rt = (rule.rule_type or "").upper()
-        params = rule.params_json or {}
-
-        if rt == "WEEKLY_CLOSED":
-            weekdays = params.get("weekdays") if isinstance(params, dict) else None
-            if weekdays is None and isinstance(params, dict):
-                weekdays = params.get("weekday")
-            if isinstance(weekdays, int):
-                weekdays = [weekdays]
-            if isinstance(weekdays, list) and local_start.weekday() in weekdays:
-                raise HTTPException(status_code=400, detail="Closed day")
-
-        elif rt == "CLOSED_DATE_RANGE":
-            if not isinstance(params, dict):
-                continue
-            sd = params.get("start_date")
-            ed = params.get("end_date")
-            if sd and ed:
-                try:
-                    sd_d = date.fromisoformat(sd)
-                    ed_d = date.fromisoformat(ed)
-                except ValueError:
-                    continue
-                if sd_d <= local_start.date() <= ed_d:
-                    raise HTTPException(status_code=400, detail="Closed date")
-
-        elif rt == "TIME_WINDOW":
-            if not isinstance(params, dict):
-                continue
-            st = params.get("start")
-            en = params.get("end")
-            if st and en:
-                try:
-                    st_t = time.fromisoformat(st)
-                    en_t = time.fromisoformat(en)
-                except ValueError:
-                    continue
-                if not (st_t <= local_start.time() <= en_t and st_t <= local_end.time() <= en_t):
-                    raise HTTPException(status_code=400, detail="Outside allowed time")
-
-        elif rt == "SAME_DAY_CUTOFF":
-            if not isinstance(params, dict):
-                continue
-            ct = params.get("time")
-            if ct:
-                try:
-                    ct_t = time.fromisoformat(ct)
-                except ValueError:
-                    continue
-                if local_start.date() == local_now.date() and local_now.time() >= ct_t:
-                    raise HTTPException(status_code=400, detail="Same-day booking is closed")
-
-        elif rt == "LEAD_TIME":
-            if not isinstance(params, dict):
-                continue
-            minutes = params.get("minutes")
-            if minutes is None:
-                hours = params.get("hours")
-                if hours is not None:
-                    try:
-                        minutes = int(hours) * 60
-                    except Exception:
-                        minutes = None
-            if minutes is not None:
-                try:
-                    minutes_i = int(minutes)
-                except Exception:
-                    continue
-                if start_at - now < timedelta(minutes=minutes_i):
-                    raise HTTPException(status_code=400, detail="Too late to book")
+    # Evaluate additional booking rules (active, precompiled per rules_version)
+    get_compiled_rules(db, settings).check(venue_id, start_at, end_at, now, tz)
 
     if _has_calendar_block(db, venue_id, start_at, end_at):
         raise HTTPException(status_code=400, detail="Not available")
@@ -203,56 +163,191 @@ def validate_reservation_time(
     if _has_overlapping_reservation(db, venue_id, start_at, end_at, exclude_reservation_id=exclude_reservation_id):
         raise HTTPException(status_code=409, detail="Time slot already booked")
 
+    if _has_active_hold(db, venue_id, start_at, end_at, now, exclude_hold_id=exclude_hold_id):
+        raise HTTPException(status_code=409, detail="Time slot is on hold")
+
+
+class SlotValidator:
+    """Validates many slots against one preloaded snapshot.
+
+    Settings, compiled rules, calendar blocks, reservations and active holds covering
+    [range_start, range_end) for `venue_ids` are loaded once,
+    after which check() applies the same checks as validate_reservation_time
+    purely in memory.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        *,
+        venue_ids: Iterable[str],
+        range_start: datetime,
+        range_end: datetime,
+        now: datetime | None = None,
+        exclude_reservation_id: str | None = None,
+    ) -> None:
+        venue_ids = sorted(set(venue_ids))
+        self.settings = get_or_create_settings(db)
+        self.tz = ZoneInfo(get_settings().timezone)
+        self.now = now or datetime.now(tz=ZoneInfo("UTC"))
+
+        self.rules = get_compiled_rules(db, self.settings)
+
+        blocks_q = (
+            select(CalendarBlock)
+            .where(CalendarBlock.venue_id.in_(venue_ids))
+            .where(CalendarBlock.start_at < range_end)
+            .where(CalendarBlock.end_at > range_start)
+        )
+        reservations_q = (
+            select(Reservation)
+            .where(Reservation.venue_id.in_(venue_ids))
+            .where(Reservation.status != "CANCELLED")
+            .where(Reservation.start_at < range_end)
+            .where(Reservation.end_at > range_start)
+        )
+        if exclude_reservation_id:
+            reservations_q = reservations_q.where(Reservation.id != exclude_reservation_id)
+
+        self.blocks = IntervalIndex.from_rows(db.execute(blocks_q).scalars().all())
+        holds_q = (
+            select(SlotHold)
+            .where(SlotHold.venue_id.in_(venue_ids))
+            .where(SlotHold.expires_at > self.now)
+            .where(SlotHold.start_at < range_end)
+            .where(SlotHold.end_at > range_start)
+        )
+
+        self.reservations = IntervalIndex.from_rows(db.execute(reservations_q).scalars().all())
+        self.holds = IntervalIndex.from_rows(db.execute(holds_q).scalars().all())
+
+    def check(self, venue_id: str, start_at: datetime, end_at: datetime) -> None:
+        """Raise HTTPException exactly like validate_reservation_time would."""
+        _apply_settings_constraints(self.settings, start_at, end_at, self.now, self.tz)
+        self.rules.check(venue_id, start_at, end_at, self.now, self.tz)
+
+        if self.blocks.overlaps(venue_id, start_at, end_at):
+            raise HTTPException(status_code=400, detail="Not available")
+
+        if self.reservations.overlaps(venue_id, start_at, end_at):
+            raise HTTPException(status_code=409, detail="Time slot already booked")
+
+        if self.holds.overlaps(venue_id, start_at, end_at):
+            raise HTTPException(status_code=409, detail="Time slot is on hold")
+
+    def verdict(self, venue_id: str, start_at: datetime, end_at: datetime) -> dict:
+        try:
+            self.check(venue_id, start_at, end_at)
+        except HTTPException as e:
+            return {"venue_id": venue_id, "start_at": start_at, "end_at": end_at, "ok": False, "status_code": e.status_code, "reason": e.detail}
+        return {"venue_id": venue_id, "start_at": start_at, "end_at": end_at, "ok": True, "status_code": 200, "reason": ""}
 
-def get_or_create_customer(db: Session, *, name: str, phone: str, email: str) -> Customer:
+
+def validate_many(
+    db: Session,
+    slots: Iterable[tuple[str, datetime, datetime]],
+    *,
+    now: datetime | None = None,
+    exclude_reservation_id: str | None = None,
+) -> list[dict]:
+    """Validate (venue_id, start_at, end_at) slots with a fixed number of queries.
+
+    Returns one verdict per slot, in input order:
+    {"venue_id", "start_at", "end_at", "ok", "status_code", "reason"}.
+    """
+    slots = list(slots)
+    if not slots:
+        return []
+
+    validator = SlotValidator(
+        db,
+        venue_ids={venue_id for venue_id, _, _ in slots},
+        range_start=min(start_at for _, start_at, _ in slots),
+        range_end=max(end_at for _, _, end_at in slots),
+        now=now,
+        exclude_reservation_id=exclude_reservation_id,
+    )
+    return [validator.verdict(venue_id, start_at, end_at) for venue_id, start_at, end_at in slots]
+
+
+def get_or_create_customer(db: Session, *, name: str, phone: str, email: str, commit: bool = True) -> Customer:
+    """Insert or update the customer in one INSERT ... ON CONFLICT statement.
+
+    A customer is keyed by phone_hash when a phone is given, else by
+    email_hash (see the partial unique indexes on Customer). Concurrent
+    bookings by one person therefore converge on a single row.
+    """
     phone_norm = normalize_phone(phone)
     email_norm = normalize_email(email)
 
     phone_h = hash_pii(phone_norm) if phone_norm else ""
     email_h = hash_pii(email_norm) if email_norm else ""
 
-    customer = None
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(Customer).values(
+        name=name,
+        phone_normalized=phone_norm,
+        phone_hash=phone_h,
+        phone_masked=mask_phone(phone_norm),
+        email_normalized=email_norm,
+        email_hash=email_h,
+        email_masked=mask_email(email_norm),
+    )
     if phone_h:
-        customer = db.execute(select(Customer).where(Customer.phone_hash == phone_h)).scalar_one_or_none()
-    if customer is None and email_h:
-        customer = db.execute(select(Customer).where(Customer.email_hash == email_h)).scalar_one_or_none()
-
-    if customer is None:
-        customer = Customer(
-            name=name,
-            phone_normalized=phone_norm,
-            phone_hash=phone_h,
-            phone_masked=mask_phone(phone_norm),
-            email_normalized=email_norm,
-            email_hash=email_h,
-            email_masked=mask_email(email_norm),
+        key, key_where = Customer.phone_hash, PHONE_KEY_WHERE
+    elif email_h:
+        key, key_where = Customer.email_hash, EMAIL_KEY_WHERE
+    else:
+        key = None
+    if key is not None:
+        # update contact info if given
+        new = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key],
+            index_where=key_where,
+            set_={
+                "name": case((new.name != "", new.name), else_=Customer.name),
+                "email_normalized": case((new.email_hash != "", new.email_normalized), else_=Customer.email_normalized),
+                "email_hash": case((new.email_hash != "", new.email_hash), else_=Customer.email_hash),
+                "email_masked": case((new.email_hash != "", new.email_masked), else_=Customer.email_masked),
+                "updated_at": datetime.now(tz=ZoneInfo("UTC")),
+            },
         )
-        db.add(customer)
-        db.commit()
-        db.refresh(customer)
-        return customer
-
-    # update contact info if missing
-    updated = False
-    if name and customer.name != name:
-        customer.name = name
-        updated = True
-    if phone_norm and customer.phone_normalized != phone_norm:
-        customer.phone_normalized = phone_norm
-        customer.phone_hash = phone_h
-        customer.phone_masked = mask_phone(phone_norm)
-        updated = True
-    if email_norm and customer.email_normalized != email_norm:
-        customer.email_normalized = email_norm
-        customer.email_hash = email_h
-        customer.email_masked = mask_email(email_norm)
-        updated = True
-
-    if updated:
+
+    customer = db.scalars(stmt.returning(Customer), execution_options={"populate_existing": True}).one()
+    if commit:
         db.commit()
     return customer
 
 
+def venue_day_lock_key(venue_id: str, local_date) -> str:
+    return f"{venue_id}|{local_date.isoformat()}"
+
+
+def lock_venue_day(db: Session, venue_id: str, start_at: datetime) -> None:
+    """Serialize writers for one venue and local date until the transaction ends.
+
+    Uses a transaction-scoped Postgres advisory lock, so check-then-insert
+    cannot interleave with another booking for the same venue-day. Other
+    databases rely on the reservations exclusion constraint alone.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    local_date = start_at.astimezone(ZoneInfo(get_settings().timezone)).date()
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": venue_day_lock_key(venue_id, local_date)})
+
+
+def _integrity_conflict(e: IntegrityError) -> HTTPException:
+    # 23P01 = exclusion_violation (reservations_no_overlap), 23505 = unique_violation (a racing
+    # duplicate; retrying can succeed). Anything else (FK, NOT NULL, check) will fail again: 400.
+    code = getattr(e.orig, "pgcode", None) or getattr(e.orig, "sqlstate", None)
+    if code == "23P01":
+        return HTTPException(status_code=409, detail="Time slot already booked")
+    if code == "23505" or (code is None and "UNIQUE constraint failed" in str(e.orig)):
+        return HTTPException(status_code=409, detail="Conflict, please retry")
+    return HTTPException(status_code=400, detail="Invalid request data")
+
+
 def create_reservation_public(
     db: Session,
     *,
@@ -268,87 +363,136 @@ def create_reservation_public(
     email: str,
     menu_selections: list[dict],
     consent_version: str,
+    hold_token: str | None = None,
+    idempotency_key: IdempotencyKey | None = None,
+    request: Request | None = None,
 ) -> Reservation:
+    """Create a PENDING reservation with its customer, menu, access token, audit entry and confirmation email.
+
+    Everything is written in one transaction, taken under the venue-day
+    advisory lock so that validation and insert cannot race. A matching
+    `hold_token` exempts its hold from the busy check and consumes it, and
+    `idempotency_key` is marked DONE (with the public_id) in the same commit.
+    """
     # Validate venue exists
     venue = db.get(Venue, venue_id)
     if not venue or not venue.active:
         raise HTTPException(status_code=404, detail="Venue not found")
 
-    validate_reservation_time(db, venue_id=venue_id, start_at=start_at, end_at=end_at)
-
-    customer = get_or_create_customer(db, name=customer_name, phone=phone, email=email)
-
-    public_id = generate_public_id()
-    # Avoid collisions
-    for _ in range(5):
-        exists = db.execute(select(Reservation.id).where(Reservation.public_id == public_id)).first()
-        if not exists:
-            break
-        public_id = generate_public_id()
-
-    reservation = Reservation(
-        public_id=public_id,
-        venue_id=venue_id,
-        customer_id=customer.id,
-        start_at=start_at,
-        end_at=end_at,
-        people_count=people_count,
-        booking_type=booking_type,
-        banquet_name=banquet_name or "",
-        status="PENDING",
-        desired_time_text=desired_time_text or "",
-        consent_version=consent_version or "",
-        consent_at=datetime.now(tz=ZoneInfo("UTC")),
-    )
-    db.add(reservation)
-    db.commit()
-    db.refresh(reservation)
+    # May commit (first run only), so load it before the lock is taken
+    settings_row = get_or_create_settings(db)
 
-    # Menu selections
-    for sel in menu_selections or []:
-        db.add(
-            ReservationMenuSelection(
-                reservation_id=reservation.id,
-                menu_item_id=sel["menu_item_id"],
-                quantity=int(sel.get("quantity", 1)),
-                notes=str(sel.get("notes", ""))[:255],
+    try:
+        lock_venue_day(db, venue_id, start_at)
+        now = datetime.now(tz=ZoneInfo("UTC"))
+        hold = find_hold(db, hold_token, venue_id=venue_id, start_at=start_at, end_at=end_at, now=now)
+        validate_reservation_time(db, venue_id=venue_id, start_at=start_at, end_at=end_at, now=now, exclude_hold_id=hold.id if hold else None)
+        if hold is not None:
+            db.delete(hold)
+
+        customer = get_or_create_customer(db, name=customer_name, phone=phone, email=email, commit=False)
+
+        reservation = Reservation(
+            public_id=public_id_allocator.allocate(db),
+            venue_id=venue_id,
+            customer_id=customer.id,
+            start_at=start_at,
+            end_at=end_at,
+            people_count=people_count,
+            booking_type=booking_type,
+            banquet_name=banquet_name or "",
+            status="PENDING",
+            desired_time_text=desired_time_text or "",
+            consent_version=consent_version or "",
+            consent_at=datetime.now(tz=ZoneInfo("UTC")),
+        )
+        db.add(reservation)
+        db.flush()
+
+        # Menu selections, with name and price snapshotted from the current menu
+        menu_selections = menu_selections or []
+        item_ids = {sel["menu_item_id"] for sel in menu_selections}
+        items = {m.id: m for m in db.execute(select(MenuItem).where(MenuItem.id.in_(item_ids))).scalars().all()} if item_ids else {}
+        total = 0
+        for sel in menu_selections:
+            item = items.get(sel["menu_item_id"])
+            if item is None or not item.active:
+                raise HTTPException(status_code=400, detail="Menu item not available")
+            quantity = int(sel.get("quantity", 1))
+            total += int(item.price) * quantity
+            db.add(
+                ReservationMenuSelection(
+                    reservation_id=reservation.id,
+                    menu_item_id=item.id,
+                    quantity=quantity,
+                    notes=str(sel.get("notes", ""))[:255],
+                    name=item.name,
+                    unit_price=int(item.price),
+                )
             )
+        reservation.total_price = total
+
+        # Create access token
+        token_id = new_id()
+        token_expires_at = datetime.now(tz=ZoneInfo("UTC")) + timedelta(days=settings_row.reservation_token_ttl_days)
+        if get_settings().reservation_link_mode == "signed":
+            token_raw = sign_link(token_id=token_id, expires_at=token_expires_at)
+        else:
+            token_raw = secrets.token_urlsafe(24)
+        token_hash = _hash_token(token_raw)
+
+        token = ReservationAccessToken(
+            id=token_id,
+            reservation_id=reservation.id,
+            token_hash=token_hash,
+            purpose="VIEW",
+            expires_at=token_expires_at,
+            max_views=settings_row.reservation_token_max_views,
+            view_count=0,
+            last_accessed_at=None,
+        )
+        db.add(token)
+
+        write_audit_log(
+            db,
+            actor_user_id=None,
+            action_type="PUBLIC_RESERVATION_CREATE",
+            target_type="reservation",
+            target_id=reservation.public_id,
+            summary="Public reservation created",
+            diff_json={"public_id": reservation.public_id, "venue_id": reservation.venue_id},
+            request=request,
+            commit=False,
         )
-    db.commit()
-
-    # Create access token
-    token_raw = secrets.token_urlsafe(24)
-    token_hash = _hash_token(token_raw)
-
-    settings_row = get_or_create_settings(db)
 
-    token = ReservationAccessToken(
-        reservation_id=reservation.id,
-        token_hash=token_hash,
-        purpose="VIEW",
-        expires_at=datetime.now(tz=ZoneInfo("UTC")) + timedelta(days=settings_row.reservation_token_ttl_days),
-        max_views=settings_row.reservation_token_max_views,
-        view_count=0,
-        last_accessed_at=None,
-    )
-    db.add(token)
-    db.commit()
+        # Confirmation email, queued in the same transaction
+        app_settings = get_settings()
+        tz = ZoneInfo(app_settings.timezone)
+        link = f"{app_settings.public_base_url.rstrip('/')}/r/{token_raw}"
+        subject = "仮予約を受け付けました"
+        body = (
+            f"仮予約を受け付けました。\n\n"
+            f"予約ID: {reservation.public_id}\n"
+            f"会場: {venue.name}\n"
+            f"日時: {start_at.astimezone(tz).strftime('%Y-%m-%d %H:%M')} - "
+            f"{end_at.astimezone(tz).strftime('%H:%M')}\n"
+            f"人数: {people_count}\n\n"
+            f"予約内容の確認・キャンセル: {SECRET_MARK}\n\n"
+            f"※このリンクは一定期間・一定回数のみ有効です。\n"
+        )
+        enqueue_email(db, to_email=email, subject=subject, body=body, secret=link, expires_at=token_expires_at)
+        if idempotency_key is not None:
+            complete_idempotency_key(db, idempotency_key, {"public_id": reservation.public_id}, commit=False)
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise _integrity_conflict(e)
+    except Exception:
+        db.rollback()
+        raise
 
-    # Send confirmation email
-    app_settings = get_settings()
-    link = f"{app_settings.public_base_url.rstrip('/')}/r/{token_raw}"
-    subject = "仮予約を受け付けました"
-    body = (
-        f"仮予約を受け付けました。\n\n"
-        f"予約ID: {reservation.public_id}\n"
-        f"会場: {venue.name}\n"
-        f"日時: {reservation.start_at.astimezone(ZoneInfo(app_settings.timezone)).strftime('%Y-%m-%d %H:%M')} - "
-        f"{reservation.end_at.astimezone(ZoneInfo(app_settings.timezone)).strftime('%H:%M')}\n"
-        f"人数: {reservation.people_count}\n\n"
-        f"予約内容の確認・キャンセル: {link}\n\n"
-        f"※このリンクは一定期間・一定回数のみ有効です。\n"
-    )
-    send_email(email, subject, body)
+    db.refresh(reservation)
+    interval_changed(db, venue_id, start_at, end_at)
 
     return reservation
 
@@ -373,28 +517,62 @@ def lookup_reservation_by_public_id_and_phone(db: Session, *, public_id: str, ph
 
 
 def get_reservation_by_token(db: Session, *, token_raw: str) -> Reservation:
-    token_hash = _hash_token(token_raw)
-    token = db.execute(select(ReservationAccessToken).where(ReservationAccessToken.token_hash == token_hash)).scalar_one_or_none()
-    if not token:
-        raise HTTPException(status_code=404, detail="Invalid token")
+    """Resolve a view token and count the view against max_views.
 
+    Signed links are verified without the database and matched by token id;
+    random tokens are matched by hash. The count is taken with one
+    conditional UPDATE ... RETURNING, or buffered in token_view_buffer when
+    reservation_token_write_behind is enabled.
+    """
     now = datetime.now(tz=ZoneInfo("UTC"))
-    if now > token.expires_at:
-        raise HTTPException(status_code=410, detail="Token expired")
-
-    if token.view_count >= token.max_views:
-        raise HTTPException(status_code=410, detail="Token view limit reached")
-
-    token.view_count += 1
-    token.last_accessed_at = now
-    db.commit()
+    if is_signed_link(token_raw):
+        match = ReservationAccessToken.id == verify_link(db, token_raw, now=now)
+    else:
+        match = ReservationAccessToken.token_hash == _hash_token(token_raw)
+
+    if get_settings().reservation_token_write_behind:
+        token = db.execute(select(ReservationAccessToken).where(match)).scalar_one_or_none()
+        _check_token(token, now, pending_views=token_view_buffer.pending_views(token.id) if token else 0)
+        reservation_id = token.reservation_id
+        if token_view_buffer.record(token.id, now):
+            token_view_buffer.flush(db)
+    else:
+        reservation_id = db.execute(
+            update(ReservationAccessToken)
+            .where(
+                match,
+                ReservationAccessToken.expires_at >= now,
+                ReservationAccessToken.revoked_at.is_(None),
+                ReservationAccessToken.view_count < ReservationAccessToken.max_views,
+            )
+            .values(view_count=ReservationAccessToken.view_count + 1, last_accessed_at=now)
+            .returning(ReservationAccessToken.reservation_id)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        if reservation_id is None:
+            db.rollback()
+            # Only to pick the right error
+            token = db.execute(select(ReservationAccessToken).where(match)).scalar_one_or_none()
+            _check_token(token, now)
+        db.commit()
 
-    reservation = db.get(Reservation, token.reservation_id)
+    reservation = db.get(Reservation, reservation_id)
     if not reservation:
         raise HTTPException(status_code=404, detail="Not found")
     return reservation
 
 
+def _check_token(token: ReservationAccessToken | None, now: datetime, *, pending_views: int = 0) -> None:
+    if not token:
+        raise HTTPException(status_code=404, detail="Invalid token")
+    if token.revoked_at is not None:
+        raise HTTPException(status_code=410, detail="Token revoked")
+    if now > token.expires_at:
+        raise HTTPException(status_code=410, detail="Token expired")
+    if token.view_count + pending_views >= token.max_views:
+        raise HTTPException(status_code=410, detail="Token view limit reached")
+
+
 def cancel_reservation(db: Session, *, reservation: Reservation, reason: str = "") -> None:
     if reservation.status == "CANCELLED":
         return
@@ -402,3 +580,25 @@ def cancel_reservation(db: Session, *, reservation: Reservation, reason: str = "
     reservation.cancel_reason = reason[:255]
     reservation.cancelled_at = datetime.now(tz=ZoneInfo("UTC"))
     db.commit()
+    interval_changed(db, reservation.venue_id, reservation.start_at, reservation.end_at)
+
+
+# AsyncSession variants for the public router. The sync functions above run
+# inside run_sync(), so their queries go through the async driver without
+# blocking the event loop.
+
+
+async def create_reservation_public_async(db: AsyncSession, **fields) -> Reservation:
+    return await db.run_sync(lambda session: create_reservation_public(session, **fields))
+
+
+async def lookup_reservation_by_public_id_and_phone_async(db: AsyncSession, *, public_id: str, phone: str) -> Reservation:
+    return await db.run_sync(lambda session: lookup_reservation_by_public_id_and_phone(session, public_id=public_id, phone=phone))
+
+
+async def get_reservation_by_token_async(db: AsyncSession, *, token_raw: str) -> Reservation:
+    return await db.run_sync(lambda session: get_reservation_by_token(session, token_raw=token_raw))
+
+
+async def cancel_reservation_async(db: AsyncSession, *, reservation: Reservation, reason: str = "") -> None:
+    await db.run_sync(lambda session: cancel_reservation(session, reservation=reservation, reason=reason))
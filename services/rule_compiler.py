@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Iterable
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.booking_rule import BookingRule
+from app.models.settings import AppSettings
+from app.services.settings_service import get_or_create_settings
+
+
+# Predicates receive the slot both in UTC and in local time so that no
+# timezone conversion happens inside the per-rule checks.
+
+
+class WeeklyClosed:
+    __slots__ = ("weekdays",)
+
+    def __init__(self, weekdays: Iterable[int]) -> None:
+        self.weekdays = frozenset(weekdays)
+
+    def check(self, start_at: datetime, local_start: datetime, local_end: datetime, now: datetime, local_now: datetime) -> None:
+        if local_start.weekday() in self.weekdays:
+            raise HTTPException(status_code=400, detail="Closed day")
+
+
+class ClosedDateRanges:
+    """Closed [start_date, end_date] ranges, merged and sorted for bisect."""
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, ranges: Iterable[tuple[date, date]]) -> None:
+        merged: list[list[date]] = []
+        for sd, ed in sorted(r for r in ranges if r[0] <= r[1]):
+            if merged and sd <= merged[-1][1] + timedelta(days=1):
+                merged[-1][1] = max(merged[-1][1], ed)
+            else:
+                merged.append([sd, ed])
+        self.starts = [sd for sd, _ in merged]
+        self.ends = [ed for _, ed in merged]
+
+    def is_closed(self, d: date) -> bool:
+        i = bisect_right(self.starts, d)
+        return i > 0 and d <= self.ends[i - 1]
+
+    def check(self, start_at: datetime, local_start: datetime, local_end: datetime, now: datetime, local_now: datetime) -> None:
+        if self.is_closed(local_start.date()):
+            raise HTTPException(status_code=400, detail="Closed date")
+
+
+class TimeWindow:
+    __slots__ = ("start", "end")
+
+    def __init__(self, start: time, end: time) -> None:
+        self.start = start
+        self.end = end
+
+    def check(self, start_at: datetime, local_start: datetime, local_end: datetime, now: datetime, local_now: datetime) -> None:
+        if not (self.start <= local_start.time() <= self.end and self.start <= local_end.time() <= self.end):
+            raise HTTPException(status_code=400, detail="Outside allowed time")
+
+
+class SameDayCutoff:
+    __slots__ = ("cutoff",)
+
+    def __init__(self, cutoff: time) -> None:
+        self.cutoff = cutoff
+
+    def check(self, start_at: datetime, local_start: datetime, local_end: datetime, now: datetime, local_now: datetime) -> None:
+        if local_start.date() == local_now.date() and local_now.time() >= self.cutoff:
+            raise HTTPException(status_code=400, detail="Same-day booking is closed")
+
+
+class LeadTime:
+    __slots__ = ("minutes", "delta")
+
+    def __init__(self, minutes: int) -> None:
+        self.minutes = minutes
+        self.delta = timedelta(minutes=minutes)
+
+    def check(self, start_at: datetime, local_start: datetime, local_end: datetime, now: datetime, local_now: datetime) -> None:
+        if start_at - now < self.delta:
+            raise HTTPException(status_code=400, detail="Too late to book")
+
+
+def _parse_weekdays(params: dict) -> list[int]:
+    weekdays = params.get("weekdays")
+    if weekdays is None:
+        weekdays = params.get("weekday")
+    if isinstance(weekdays, int):
+        weekdays = [weekdays]
+    if not isinstance(weekdays, list):
+        return []
+    return [w for w in weekdays if isinstance(w, (int, float))]
+
+
+def _parse_date_range(params: dict) -> tuple[date, date] | None:
+    sd = params.get("start_date")
+    ed = params.get("end_date")
+    if not (isinstance(sd, str) and isinstance(ed, str)):
+        return None
+    try:
+        return date.fromisoformat(sd), date.fromisoformat(ed)
+    except ValueError:
+        return None
+
+
+def _parse_time(value) -> time | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _parse_lead_minutes(params: dict) -> int | None:
+    minutes = params.get("minutes")
+    if minutes is None:
+        hours = params.get("hours")
+        if hours is not None:
+            try:
+                minutes = int(hours) * 60
+            except Exception:
+                minutes = None
+    if minutes is None:
+        return None
+    try:
+        return int(minutes)
+    except Exception:
+        return None
+
+
+def _compile_scope(rules: Iterable[BookingRule]) -> tuple:
+    weekdays: set = set()
+    date_ranges: list[tuple[date, date]] = []
+    windows: list[TimeWindow] = []
+    cutoffs: list[SameDayCutoff] = []
+    leads: list[LeadTime] = []
+
+    for rule in rules:
+        rt = (rule.rule_type or "").upper()
+        params = rule.params_json
+        if not isinstance(params, dict):
+            continue
+
+        if rt == "WEEKLY_CLOSED":
+            weekdays.update(_parse_weekdays(params))
+        elif rt == "CLOSED_DATE_RANGE":
+            rng = _parse_date_range(params)
+            if rng:
+                date_ranges.append(rng)
+        elif rt == "TIME_WINDOW":
+            st = _parse_time(params.get("start"))
+            en = _parse_time(params.get("end"))
+            if st and en:
+                windows.append(TimeWindow(st, en))
+        elif rt == "SAME_DAY_CUTOFF":
+            ct = _parse_time(params.get("time"))
+            if ct:
+                cutoffs.append(SameDayCutoff(ct))
+        elif rt == "LEAD_TIME":
+            minutes = _parse_lead_minutes(params)
+            if minutes is not None:
+                leads.append(LeadTime(minutes))
+
+    predicates: list = []
+    if weekdays:
+        predicates.append(WeeklyClosed(weekdays))
+    if date_ranges:
+        predicates.append(ClosedDateRanges(date_ranges))
+    predicates.extend(windows)
+    if cutoffs:
+        # Only the earliest cutoff can ever be the deciding one
+        predicates.append(min(cutoffs, key=lambda c: c.cutoff))
+    if leads:
+        predicates.append(max(leads, key=lambda l: l.minutes))
+    return tuple(predicates)
+
+
+class CompiledRules:
+    """Active booking rules compiled into typed predicates, per scope."""
+
+    def __init__(self, rules: Iterable[BookingRule], version: int = 0) -> None:
+        rules = list(rules)
+        self.version = version
+        self.global_predicates = _compile_scope(r for r in rules if r.scope_type == "ALL")
+        by_venue: dict[str, list[BookingRule]] = {}
+        for r in rules:
+            if r.scope_type == "VENUE":
+                by_venue.setdefault(r.scope_id, []).append(r)
+        self.venue_predicates = {vid: _compile_scope(rs) for vid, rs in by_venue.items()}
+        self._combined: dict[str, tuple] = {}
+
+        all_preds = list(self.global_predicates)
+        for preds in self.venue_predicates.values():
+            all_preds.extend(preds)
+        self.max_lead_minutes = max((p.minutes for p in all_preds if isinstance(p, LeadTime)), default=0)
+
+    def for_venue(self, venue_id: str) -> tuple:
+        preds = self._combined.get(venue_id)
+        if preds is None:
+            preds = self.global_predicates + self.venue_predicates.get(venue_id, ())
+            self._combined[venue_id] = preds
+        return preds
+
+    def check(self, venue_id: str, start_at: datetime, end_at: datetime, now: datetime, tz) -> None:
+        preds = self.for_venue(venue_id)
+        if not preds:
+            return
+        local_start = start_at.astimezone(tz)
+        local_end = end_at.astimezone(tz)
+        local_now = now.astimezone(tz)
+        for pred in preds:
+            pred.check(start_at, local_start, local_end, now, local_now)
+
+
+_cache_lock = threading.Lock()
+_cached: CompiledRules | None = None
+
+
+def get_compiled_rules(db: Session, settings_row: AppSettings | None = None) -> CompiledRules:
+    """Return compiled active rules, recompiling only when rules_version changed."""
+    global _cached
+    settings_row = settings_row or get_or_create_settings(db)
+    version = settings_row.rules_version or 0
+
+    cached = _cached
+    if cached is not None and cached.version == version:
+        return cached
+
+    rules = db.execute(select(BookingRule).where(BookingRule.is_active == True)).scalars().all()
+    compiled = CompiledRules(rules, version=version)
+    with _cache_lock:
+        _cached = compiled
+    return compiled
+
+
+def first_stable_date(db: Session, settings_row: AppSettings, now: datetime | None = None) -> date:
+    """First local date whose availability no longer depends on the current time.
+
+    Past-time, same-day cutoff and lead-time checks only affect dates up to
+    the longest lead time ahead; anything later changes only through writes.
+    """
+    tz = ZoneInfo(get_settings().timezone)
+    now = now or datetime.now(tz=ZoneInfo("UTC"))
+    lead_minutes = max(settings_row.lead_time_minutes, get_compiled_rules(db, settings_row).max_lead_minutes)
+    return now.astimezone(tz).date() + timedelta(days=lead_minutes // (24 * 60) + 2)
+
+
+def bump_rules_version(db: Session) -> None:
+    """Invalidate compiled rules everywhere; call before committing a rule change."""
+    get_or_create_settings(db)
+    db.execute(update(AppSettings).where(AppSettings.id == 1).values(rules_version=AppSettings.rules_version + 1))
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from datetime import time
+
 from sqlalchemy.orm import Session
 
 from app.models.settings import AppSettings
@@ -13,3 +15,11 @@ def get_or_create_settings(db: Session) -> AppSettings:
         db.commit()
         db.refresh(s)
     return s
+
+
+def public_block_windows(s: AppSettings) -> dict[str, tuple[time, time]]:
+    """Local DAY/NIGHT windows shown on the public availability grid."""
+    return {
+        "DAY": (s.public_day_start, s.public_day_end),
+        "NIGHT": (s.public_night_start, s.public_night_end),
+    }
@@ -69,6 +69,7 @@ def export_reservations_to_sheet(
         "email",
         "created_at",
         "updated_at",
+        "total_price",
     ]
 
     rows = [header]
@@ -96,6 +97,7 @@ def export_reservations_to_sheet(
                 email,
                 r.created_at.astimezone(tz).strftime("%Y-%m-%d %H:%M"),
                 r.updated_at.astimezone(tz).strftime("%Y-%m-%d %H:%M"),
+                r.total_price,
             ]
         )
 
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.message import EmailMessage
+from typing import Callable, Iterable, Iterator
+
+from app.core.config import get_settings
+
+# Refusals that concern one message; the session itself is still usable
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+def connect_from_settings() -> smtplib.SMTP:
+    """Open and authenticate an SMTP session using the configured relay."""
+    settings = get_settings()
+    timeout = settings.smtp_timeout_seconds
+    if settings.smtp_use_tls:
+        server = smtplib.SMTP_SSL(settings.smtp_host, settings.smtp_port, timeout=timeout)
+    else:
+        server = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=timeout)
+    if settings.smtp_username:
+        server.login(settings.smtp_username, settings.smtp_password)
+    return server
+
+
+class _Session:
+    __slots__ = ("smtp", "last_used")
+
+    def __init__(self, smtp: smtplib.SMTP) -> None:
+        self.smtp: smtplib.SMTP | None = smtp
+        self.last_used = time.monotonic()
+
+
+class SmtpPool:
+    """Bounded pool of authenticated SMTP sessions shared by the threads of a process.
+
+    At most `max_size` sessions exist at once; callers block for a free one.
+    Idle sessions are reused (LIFO), probed with NOOP when they have been
+    idle longer than `health_check_seconds`, and closed after `idle_seconds`.
+    A session that fails mid-send is reconnected once before giving up.
+    """
+
+    def __init__(
+        self,
+        *,
+        connect: Callable[[], smtplib.SMTP],
+        max_size: int,
+        idle_seconds: float,
+        health_check_seconds: float,
+    ) -> None:
+        self._connect = connect
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self.health_check_seconds = health_check_seconds
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle: list[_Session] = []
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.reconnects = 0
+        self.health_check_failures = 0
+        self.sent = 0
+        self.failed = 0
+
+    def _open(self) -> _Session:
+        smtp = self._connect()
+        with self._lock:
+            self.connects += 1
+        return _Session(smtp)
+
+    @staticmethod
+    def _close(sess: _Session) -> None:
+        smtp, sess.smtp = sess.smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except Exception:
+            try:
+                smtp.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _healthy(sess: _Session) -> bool:
+        try:
+            return sess.smtp is not None and sess.smtp.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _checkout(self) -> _Session:
+        while True:
+            with self._lock:
+                sess = self._idle.pop() if self._idle else None
+            if sess is None:
+                return self._open()
+            idle_for = time.monotonic() - sess.last_used
+            if idle_for > self.idle_seconds:
+                self._close(sess)
+                continue
+            if idle_for > self.health_check_seconds and not self._healthy(sess):
+                with self._lock:
+                    self.health_check_failures += 1
+                self._close(sess)
+                continue
+            return sess
+
+    def _checkin(self, sess: _Session) -> None:
+        if sess.smtp is None:
+            return
+        sess.last_used = time.monotonic()
+        with self._lock:
+            self._idle.append(sess)
+
+    @contextmanager
+    def session(self) -> Iterator[_Session]:
+        self._slots.acquire()
+        sess: _Session | None = None
+        try:
+            sess = self._checkout()
+            yield sess
+        finally:
+            if sess is not None:
+                self._checkin(sess)
+            self._slots.release()
+
+    def _reconnect(self, sess: _Session) -> None:
+        self._close(sess)
+        sess.smtp = self._connect()
+        with self._lock:
+            self.reconnects += 1
+
+    def send_many(self, messages: Iterable[EmailMessage]) -> list[Exception | None]:
+        """Send messages back to back over one pooled session.
+
+        Returns one entry per message: None when sent, else the error. On a
+        connection-level failure the message is retried once on a fresh
+        connection; if that cannot be opened, the rest fail fast.
+        """
+        messages = list(messages)
+        results: list[Exception | None] = []
+        if messages:
+            try:
+                with self.session() as sess:
+                    self._send_on(sess, messages, results)
+            except OSError as e:
+                # No session could be opened
+                results.extend([e] * (len(messages) - len(results)))
+
+        with self._lock:
+            self.sent += sum(1 for r in results if r is None)
+            self.failed += sum(1 for r in results if r is not None)
+        return results
+
+    def _send_on(self, sess: _Session, messages: list[EmailMessage], results: list[Exception | None]) -> None:
+        for i, msg in enumerate(messages):
+            try:
+                sess.smtp.send_message(msg)
+                results.append(None)
+                continue
+            except MESSAGE_ERRORS as e:
+                results.append(e)
+                continue
+            except OSError:
+                # smtplib errors are OSErrors too; includes SMTPServerDisconnected
+                pass
+
+            try:
+                self._reconnect(sess)
+                sess.smtp.send_message(msg)
+                results.append(None)
+            except MESSAGE_ERRORS as e:
+                results.append(e)
+            except OSError as e:
+                self._close(sess)
+                results.extend([e] * (len(messages) - i))
+                return
+
+    def send(self, msg: EmailMessage) -> None:
+        error = self.send_many([msg])[0]
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Close idle sessions; sessions in use go back to the pool as usual."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for sess in idle:
+            self._close(sess)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "idle": len(self._idle),
+                "connects": self.connects,
+                "reconnects": self.reconnects,
+                "health_check_failures": self.health_check_failures,
+                "sent": self.sent,
+                "failed": self.failed,
+            }
+
+
+_settings = get_settings()
+smtp_pool = SmtpPool(
+    connect=connect_from_settings,
+    max_size=_settings.smtp_pool_size,
+    idle_seconds=_settings.smtp_pool_idle_seconds,
+    health_check_seconds=_settings.smtp_pool_health_check_seconds,
+)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import bindparam
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.reservation_token import ReservationAccessToken
+
+_t = ReservationAccessToken.__table__
+_FLUSH_SQL = (
+    _t.update()
+    .where(_t.c.id == bindparam("token_id"))
+    .values(view_count=_t.c.view_count + bindparam("views"), last_accessed_at=bindparam("last_at"))
+)
+
+
+class TokenViewBuffer:
+    """Per-process write-behind buffer for reservation token views.
+
+    Views are counted in memory and written in one batched UPDATE when
+    `max_pending` tokens are waiting or `flush_seconds` have passed since the
+    last flush (checked on the next view, and by run_periodic_flush, which
+    main.py starts so idle buffers are written too; it flushes on shutdown).
+    max_views is enforced against the stored count plus this process's
+    unflushed views, so with several processes it is approximate.
+    """
+
+    def __init__(self, *, max_pending: int, flush_seconds: float) -> None:
+        self.max_pending = max_pending
+        self.flush_seconds = flush_seconds
+        self._pending: dict[str, tuple[int, datetime]] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.flushes = 0
+        self.flushed_views = 0
+        self.flush_failures = 0
+
+    def pending_views(self, token_id: str) -> int:
+        with self._lock:
+            entry = self._pending.get(token_id)
+            return entry[0] if entry else 0
+
+    def record(self, token_id: str, now: datetime) -> bool:
+        """Count one view; returns True when a flush is due."""
+        with self._lock:
+            views, _ = self._pending.get(token_id, (0, now))
+            self._pending[token_id] = (views + 1, now)
+            return len(self._pending) >= self.max_pending or time.monotonic() - self._last_flush >= self.flush_seconds
+
+    def _restore(self, drained: dict[str, tuple[int, datetime]]) -> None:
+        with self._lock:
+            for token_id, (views, last_at) in drained.items():
+                newer_views, newer_at = self._pending.get(token_id, (0, last_at))
+                self._pending[token_id] = (views + newer_views, max(last_at, newer_at))
+
+    def flush(self, db: Session) -> int:
+        """Write buffered views in one transaction; on failure they stay buffered."""
+        with self._lock:
+            drained, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not drained:
+            return 0
+        rows = [{"token_id": tid, "views": views, "last_at": last_at} for tid, (views, last_at) in drained.items()]
+        try:
+            db.execute(_FLUSH_SQL, rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            self._restore(drained)
+            with self._lock:
+                self.flush_failures += 1
+            return 0
+        with self._lock:
+            self.flushes += 1
+            self.flushed_views += sum(r["views"] for r in rows)
+        return len(rows)
+
+    def _flush_new_session(self, session_factory) -> None:
+        db = session_factory()
+        try:
+            self.flush(db)
+        finally:
+            db.close()
+
+    async def run_periodic_flush(self, session_factory) -> None:
+        """Flush every flush_seconds while anything is pending, until cancelled."""
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            with self._lock:
+                due = bool(self._pending) and time.monotonic() - self._last_flush >= self.flush_seconds
+            if due:
+                await asyncio.to_thread(self._flush_new_session, session_factory)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending_tokens": len(self._pending),
+                "pending_views": sum(v for v, _ in self._pending.values()),
+                "flushes": self.flushes,
+                "flushed_views": self.flushed_views,
+                "flush_failures": self.flush_failures,
+            }
+
+
+_settings = get_settings()
+token_view_buffer = TokenViewBuffer(
+    max_pending=_settings.reservation_token_flush_max_pending,
+    flush_seconds=_settings.reservation_token_flush_seconds,
+)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.settings import AppSettings
+from app.models.venue import Venue
+from app.models.venue_day_slot import VenueDaySlot
+from app.services.availability_cache import local_dates_between
+from app.services.rule_compiler import first_stable_date
+from app.services.settings_service import get_or_create_settings, public_block_windows
+
+
+def maintained_window() -> tuple[date, date]:
+    """Local date range kept in venue_day_slots."""
+    app_settings = get_settings()
+    today = datetime.now(tz=ZoneInfo(app_settings.timezone)).date()
+    return today, today + timedelta(days=app_settings.venue_day_slots_days_ahead)
+
+
+def _active_venue_ids(db: Session) -> list[str]:
+    return list(db.execute(select(Venue.id).where(Venue.active == True)).scalars().all())
+
+
+def compute_slot_rows(db: Session, venue_ids: list[str], days: list[date]) -> list[dict]:
+    """Fresh status/reason rows for every (venue, day, block), from a full recompute."""
+    # Imported here: reservation_service notifies this module on writes
+    from app.services.reservation_service import SlotValidator
+
+    if not venue_ids or not days:
+        return []
+
+    tz = ZoneInfo(get_settings().timezone)
+    utc = ZoneInfo("UTC")
+    windows = public_block_windows(get_or_create_settings(db))
+
+    keys: list[tuple[str, date, str]] = []
+    bounds: list[tuple[datetime, datetime]] = []
+    for d in days:
+        for block, (ws, we) in windows.items():
+            start_at = datetime.combine(d, ws).replace(tzinfo=tz).astimezone(utc)
+            end_at = datetime.combine(d, we).replace(tzinfo=tz).astimezone(utc)
+            for venue_id in venue_ids:
+                keys.append((venue_id, d, block))
+                bounds.append((start_at, end_at))
+
+    validator = SlotValidator(
+        db,
+        venue_ids=venue_ids,
+        range_start=min(s for s, _ in bounds),
+        range_end=max(e for _, e in bounds),
+    )
+    now = datetime.now(tz=utc)
+    rows = []
+    for (venue_id, d, block), (start_at, end_at) in zip(keys, bounds):
+        v = validator.verdict(venue_id, start_at, end_at)
+        rows.append(
+            {
+                "venue_id": venue_id,
+                "slot_date": d,
+                "block": block,
+                "status": "O" if v["ok"] else "X",
+                "reason": str(v["reason"])[:255],
+                "updated_at": now,
+            }
+        )
+    return rows
+
+
+def _lock_days(db: Session, venue_ids: list[str], days: list[date]) -> None:
+    """Take the writers' per venue-day locks (lock_venue_day) until commit.
+
+    Held across recompute + replace, so a refresh cannot overwrite rows
+    computed after a newer booking, and sees every write committed before
+    it got the lock. Taken in key order to avoid deadlocks between chunks.
+    """
+    from app.services.reservation_service import venue_day_lock_key
+
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    keys = sorted(venue_day_lock_key(venue_id, d) for venue_id in venue_ids for d in days)
+    db.execute(
+        text("SELECT count(pg_advisory_xact_lock(hashtext(k))) FROM (SELECT k FROM unnest(CAST(:keys AS text[])) AS k ORDER BY k) s"),
+        {"keys": keys},
+    )
+
+
+def _replace_rows(db: Session, venue_ids: list[str], days: list[date]) -> int:
+    _lock_days(db, venue_ids, days)
+    rows = compute_slot_rows(db, venue_ids, days)
+    db.execute(delete(VenueDaySlot).where(VenueDaySlot.venue_id.in_(venue_ids), VenueDaySlot.slot_date.in_(days)))
+    if rows:
+        db.execute(insert(VenueDaySlot), rows)
+    db.commit()
+    return len(rows)
+
+
+def refresh_venue_days(db: Session, venue_id: str, days: list[date]) -> int:
+    first, last = maintained_window()
+    days = [d for d in days if first <= d <= last]
+    if not days:
+        return 0
+    return _replace_rows(db, [venue_id], days)
+
+
+def refresh_interval(db: Session, venue_id: str, start_at: datetime, end_at: datetime) -> int:
+    return refresh_venue_days(db, venue_id, local_dates_between(start_at, end_at))
+
+
+def rebuild(db: Session, *, from_date: date | None = None, to_date: date | None = None, venue_ids: list[str] | None = None, chunk_days: int = 31) -> int:
+    """Recompute venue_day_slots for a date range (default: the maintained window)."""
+    first, last = maintained_window()
+    from_date = from_date or first
+    to_date = to_date or last
+    venue_ids = venue_ids if venue_ids is not None else _active_venue_ids(db)
+    if not venue_ids:
+        return 0
+
+    written = 0
+    cur = from_date
+    while cur <= to_date:
+        chunk_end = min(cur + timedelta(days=chunk_days - 1), to_date)
+        days = [cur + timedelta(days=i) for i in range((chunk_end - cur).days + 1)]
+        written += _replace_rows(db, venue_ids, days)
+        cur = chunk_end + timedelta(days=1)
+
+    # Drop rows left behind by deactivated venues or a shrunk window
+    db.execute(delete(VenueDaySlot).where(VenueDaySlot.venue_id.not_in(venue_ids)))
+    db.execute(delete(VenueDaySlot).where(VenueDaySlot.slot_date < first))
+    db.commit()
+    return written
+
+
+def is_current(settings_row: AppSettings) -> bool:
+    """Whether the read model reflects the current rules and settings."""
+    return settings_row.venue_day_slots_version == (settings_row.rules_version or 0)
+
+
+def sync(db: Session, *, max_passes: int = 3) -> int | None:
+    """Rebuild the read model if rules_version moved past its last full rebuild.
+
+    One process at a time (Postgres session advisory lock); returns None when
+    another holds it. A rebuild is only recorded for the version it started
+    from, so if rules change while it runs, the model stays stale and the
+    next pass (or run) rebuilds again instead of serving mixed results.
+    """
+    bind = db.get_bind()
+    postgres = bind.dialect.name == "postgresql"
+    with bind.connect() as lock_conn:
+        if postgres and not lock_conn.execute(text("SELECT pg_try_advisory_lock(hashtext('venue_day_slots_sync'))")).scalar_one():
+            return None
+        try:
+            get_or_create_settings(db)
+            written = 0
+            for _ in range(max_passes):
+                built, version = db.execute(
+                    select(AppSettings.venue_day_slots_version, AppSettings.rules_version).where(AppSettings.id == 1)
+                ).one()
+                db.commit()
+                if built == version:
+                    break
+                written += rebuild(db)
+                db.execute(
+                    update(AppSettings)
+                    .where(AppSettings.id == 1, AppSettings.venue_day_slots_version < version)
+                    .values(venue_day_slots_version=version)
+                )
+                db.commit()
+            return written
+        finally:
+            if postgres:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(hashtext('venue_day_slots_sync'))"))
+                lock_conn.commit()
+
+
+def load_statuses(db: Session, venue_ids: list[str], from_date: date, to_date: date) -> dict[tuple[str, date, str], str]:
+    """Stored statuses for the range: one indexed range scan."""
+    rows = db.execute(
+        select(VenueDaySlot.venue_id, VenueDaySlot.slot_date, VenueDaySlot.block, VenueDaySlot.status)
+        .where(VenueDaySlot.slot_date >= from_date, VenueDaySlot.slot_date <= to_date)
+        .where(VenueDaySlot.venue_id.in_(venue_ids))
+    ).all()
+    return {(r.venue_id, r.slot_date, r.block): r.status for r in rows}
+
+
+def check_consistency(db: Session, *, from_date: date | None = None, to_date: date | None = None) -> list[dict]:
+    """Compare stored rows against a full recompute; returns the mismatches.
+
+    Defaults to the dates the read model actually serves: nearer dates
+    depend on the clock and are always computed live.
+    """
+    _, last = maintained_window()
+    from_date = from_date or first_stable_date(db, get_or_create_settings(db))
+    to_date = to_date or last
+    venue_ids = _active_venue_ids(db)
+    days = [from_date + timedelta(days=i) for i in range((to_date - from_date).days + 1)]
+
+    stored = load_statuses(db, venue_ids, from_date, to_date)
+    mismatches = []
+    for row in compute_slot_rows(db, venue_ids, days):
+        key = (row["venue_id"], row["slot_date"], row["block"])
+        have = stored.get(key)
+        if have != row["status"]:
+            mismatches.append({"venue_id": key[0], "date": key[1], "block": key[2], "stored": have, "expected": row["status"], "reason": row["reason"]})
+    return mismatches